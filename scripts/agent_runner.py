@@ -1,10 +1,11 @@
+import gzip
 import json
 import os
 import time
 import urllib.error
 import urllib.request
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # ---- Config (modifiable without touching code) ----
 MCP_URL = os.getenv("MCP_URL", "http://127.0.0.1:8765/rpc")
@@ -19,6 +20,28 @@ CV_FILE = os.getenv("CV_FILE", "")  # e.g. data/cv_samples/cv_fictif.txt
 CV_TEXT_FALLBACK = os.getenv("CV_TEXT", "Python SQL Docker Airflow Power BI")
 
 
+try:
+    import orjson  # optional: much faster on big responses (jobs_list, graph_build)
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(body: bytes) -> Any:
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _read_body(resp: Any) -> Any:
+    """Decoded JSON body of an RPC response (the server gzips large ones)."""
+    body = resp.read()
+    if (resp.headers.get("Content-Encoding") or "").lower() == "gzip":
+        body = gzip.decompress(body)
+    return _json_loads(body)
+
+
 class McpError(RuntimeError):
     pass
 
@@ -37,18 +60,26 @@ class McpClient:
         self.retries = retries
         self._id = 0
 
+    def _post(self, payload: Any) -> Any:
+        data = _json_dumps(payload)
+        req = urllib.request.Request(self.url, data=data, headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"})
+        with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
+            return _read_body(resp)
+
+    @staticmethod
+    def _sleep_before_retry(e: Exception, attempt: int) -> None:
+        # 503 = server saturated: honour its Retry-After hint
+        retry_after = float(e.headers.get("Retry-After") or 0) if isinstance(e, urllib.error.HTTPError) and e.code == 503 else 0.0
+        time.sleep(max(retry_after, 0.4 * attempt))
+
     def _rpc(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         self._id += 1
         payload = {"jsonrpc": "2.0", "id": self._id, "method": method, "params": params or {}}
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(self.url, data=data, headers={"Content-Type": "application/json"})
 
         last_err: Optional[Exception] = None
         for attempt in range(1, self.retries + 1):
             try:
-                with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
-                    body = resp.read().decode("utf-8")
-                out = json.loads(body)
+                out = self._post(payload)
 
                 if out.get("error"):
                     raise McpError(out["error"].get("message", "Unknown MCP error"))
@@ -60,12 +91,48 @@ class McpClient:
             except (urllib.error.URLError, TimeoutError, ConnectionResetError, McpError) as e:
                 last_err = e
                 if attempt < self.retries:
-                    time.sleep(0.4 * attempt)
+                    self._sleep_before_retry(e, attempt)
                 else:
                     raise McpError(f"MCP call failed after {self.retries} attempts: {e}") from e
 
         raise McpError(str(last_err))
 
+    def batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Several (method, params) calls in one JSON-RPC batch (one HTTP round-trip).
+        Results come back in call order; a failed entry is an McpError instance (not raised).
+        """
+        if not calls:
+            return []
+        ids = list(range(self._id + 1, self._id + 1 + len(calls)))
+        self._id += len(calls)
+        payload = [
+            {"jsonrpc": "2.0", "id": rid, "method": method, "params": params or {}}
+            for rid, (method, params) in zip(ids, calls)
+        ]
+
+        for attempt in range(1, self.retries + 1):
+            try:
+                out = self._post(payload)
+                break
+            except (urllib.error.URLError, TimeoutError, ConnectionResetError) as e:
+                if attempt < self.retries:
+                    self._sleep_before_retry(e, attempt)
+                else:
+                    raise McpError(f"MCP batch failed after {self.retries} attempts: {e}") from e
+
+        if isinstance(out, dict):
+            raise McpError((out.get("error") or {}).get("message", "Invalid batch response"))
+        by_id = {r.get("id"): r for r in out if isinstance(r, dict)}
+        results: List[Any] = []
+        for rid in ids:
+            r = by_id.get(rid) or {"error": {"message": "missing response"}}
+            if r.get("error"):
+                results.append(McpError(r["error"].get("message", "Unknown MCP error")))
+            else:
+                results.append(r.get("result"))
+        return results
+
     def initialize(self) -> Dict[str, Any]:
         return self._rpc("initialize", {})
 
@@ -75,6 +142,9 @@ class McpClient:
     def tool_call(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         return self._rpc("tools/call", {"name": name, "arguments": arguments or {}})
 
+    def tool_call_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        return self.batch([("tools/call", {"name": name, "arguments": args or {}}) for name, args in calls])
+
 
 def load_cv_text() -> str:
     # MVP: accept TXT content. For PDF, convert to text first.
@@ -109,150 +179,45 @@ def run_agent() -> None:
     limit = DEFAULT_LIMIT
     top_k = DEFAULT_TOP_K
 
-    # 1) Fetch jobs (interop)
-    trace.append(TraceCall("tools/call", "jobs_list", {"query": query, "location": location, "limit": limit, "sources": sources}))
-    jobs_res = client.tool_call("jobs_list", {"query": query, "location": location, "limit": limit, "sources": sources})
-    jobs = jobs_res.get("jobs", []) or []
-
-    print(f"\n[1] jobs_list -> total={jobs_res.get('count_total', len(jobs))} | by_source={jobs_res.get('count_by_source', {})} | errors={jobs_res.get('errors', {})}")
-
-    jobs = [j for j in jobs if j.get("description")]
-    if not jobs:
-        print("No jobs with description. Try QUERY=data or QUERY=python")
-        return
-
-    # 2) CV skills
-    trace.append(TraceCall("tools/call", "cv_extract_skills", {"text": "(cv_text)"}))
-    cv_sk = client.tool_call("cv_extract_skills", {"text": cv_text})
-    cv_skills = cv_sk.get("skills", []) or []
-    print(f"\n[2] CV skills ({len(cv_skills)}): {cv_skills}")
-
-    if not cv_skills:
-        print("No skills extracted from CV. Provide a CV with obvious keywords.")
-        return
-
-    # 3) Job skills
-    jobs_with_skills: List[Dict[str, Any]] = []
-    for j in jobs[:limit]:
-        # Enrich text to increase extraction robustness
-        enriched_text = "\n".join([
-            str(j.get("title") or ""),
-            str(j.get("company") or ""),
-            str(j.get("location") or ""),
-            str(j.get("description") or ""),
-        ])
-
-        trace.append(TraceCall("tools/call", "job_extract_skills", {"text": "(job.title+company+location+description)"}))
-        js = client.tool_call("job_extract_skills", {"text": enriched_text})
-
-        j2 = dict(j)
-        j2["skills"] = js.get("skills", []) or []
-        jobs_with_skills.append(j2)
-
-    print(f"\n[3] job_extract_skills -> processed {len(jobs_with_skills)} jobs")
-    non_empty = [jj for jj in jobs_with_skills if jj.get("skills")]
-    print(f"[3bis] jobs with non-empty skills: {len(non_empty)}/{len(jobs_with_skills)}")
-    if non_empty:
-        sample = non_empty[0]
-        print(f"[3bis] sample extracted skills for '{sample.get('title')}' -> {sample.get('skills')}")
-    
-
-    # 4) Build graph
-    def _build_graph_with_jobs(jobs_ws: List[Dict[str, Any]]):
-        trace.append(TraceCall("tools/call", "graph_build", {"cv_skills": cv_skills, "jobs": f"{len(jobs_ws)} jobs"}))
-        gb_local = client.tool_call("graph_build", {"cv_skills": cv_skills, "jobs": jobs_ws})
-        return gb_local
-
-    gb = _build_graph_with_jobs(jobs_with_skills)
-    graph = gb.get("graph")
-    summary = gb.get("summary", {})
-    print(f"\n[4] graph_build -> {summary}")
-
-    # Fallback strategy if no edges were created (common for very non-technical job descriptions)
-    if summary.get("edge_count", 0) == 0:
-        fallback_queries = []
-        if " " in query.strip():
-            fallback_queries.append("data")
-        fallback_queries.append("python")
-
-        for fq in fallback_queries:
-            print(f"\n[4bis] edge_count=0. Retrying with broader query='{fq}'...")
-            query = fq
-
-            trace.append(TraceCall("tools/call", "jobs_list", {"query": query, "location": location, "limit": limit, "sources": sources}))
-            jobs_res = client.tool_call("jobs_list", {"query": query, "location": location, "limit": limit, "sources": sources})
-            jobs = jobs_res.get("jobs", []) or []
-            print(f"[4bis] jobs_list -> total={jobs_res.get('count_total', len(jobs))} | by_source={jobs_res.get('count_by_source', {})} | errors={jobs_res.get('errors', {})}")
-
-            jobs = [j for j in jobs if j.get("description")]
-            jobs_with_skills = []
-            for j in jobs[:limit]:
-                enriched_text = "\n".join([
-                    str(j.get("title") or ""),
-                    str(j.get("company") or ""),
-                    str(j.get("location") or ""),
-                    str(j.get("description") or ""),
-                ])
-                trace.append(TraceCall("tools/call", "job_extract_skills", {"text": "(job.title+company+location+description)"}))
-                js = client.tool_call("job_extract_skills", {"text": enriched_text})
-                j2 = dict(j)
-                j2["skills"] = js.get("skills", []) or []
-                jobs_with_skills.append(j2)
-
-            non_empty = [jj for jj in jobs_with_skills if jj.get("skills")]
-            print(f"[4bis] jobs with non-empty skills: {len(non_empty)}/{len(jobs_with_skills)}")
-            if non_empty:
-                sample = non_empty[0]
-                print(f"[4bis] sample extracted skills for '{sample.get('title')}' -> {sample.get('skills')}")
-
-            gb = _build_graph_with_jobs(jobs_with_skills)
-            graph = gb.get("graph")
-            summary = gb.get("summary", {})
-            print(f"[4bis] graph_build -> {summary}")
-
-            # Check if graph produces any positive score for CV skills
-            tmp_rank = client.tool_call("graph_rank", {"graph": graph, "cv_skills": cv_skills, "top_k": 3})
-            best_score = 0.0
-            for rr in tmp_rank.get("ranking", []) or []:
-                best_score = max(best_score, float(rr.get("score", 0.0)))
-
-            if summary.get("edge_count", 0) > 0 and best_score > 0:
-                print(f"[4bis] Fallback successful with query='{fq}' (best_score={best_score}).")
-                break
-            elif summary.get("edge_count", 0) > 0 and best_score == 0:
-                print(f"[4bis] Graph has edges but none overlap CV skills (best_score=0). Trying next fallback...")
-
-    # Rebuild lookup dict after potential fallback
-    jobs_by_id = {j["id"]: j for j in jobs_with_skills if j.get("id")}
-
-    # 5) Rank jobs
-    trace.append(TraceCall("tools/call", "graph_rank", {"top_k": top_k}))
-    gr = client.tool_call("graph_rank", {"graph": graph, "cv_skills": cv_skills, "top_k": top_k})
-    ranking = gr.get("ranking", []) or []
-    print(f"\n[5] graph_rank -> ranking size={len(ranking)} | meta={gr.get('meta', {})}")
-
-    # 6) Explain top jobs
+    # Whole chain (fetch -> extract -> graph -> rank -> explain) runs server-side: one call per query.
+    # Broader queries are tried when the graph has no edge or no job overlaps the CV skills.
+    fallback_queries = (["data"] if " " in query.strip() else []) + ["python"]
+    res: Dict[str, Any] = {}
+    for i, q in enumerate([query] + fallback_queries):
+        args = {
+            "cv_text": cv_text,
+            "role": q,
+            "query": q,
+            "location": location,
+            "sources": sources,
+            "limit": limit,
+            "top_k": top_k,
+            "strict_filters": False,
+            "france_only": False,
+        }
+        trace.append(TraceCall("tools/call", "match_pipeline", {k: v for k, v in args.items() if k != "cv_text"}))
+        res = client.tool_call("match_pipeline", args)
+        meta = res.get("meta", {}) or {}
+        jl = meta.get("jobs_list_meta", {}) or {}
+        summary = meta.get("graph_summary", {}) or {}
+        best_score = max([float(r.get("score_base", 0.0)) for r in res.get("recommendations", []) or []] or [0.0])
+
+        print(f"\n[{'1' if i == 0 else '1bis'}] match_pipeline query='{q}' -> total={jl.get('count_total')} | by_source={jl.get('count_by_source', {})} | errors={jl.get('errors', {})}")
+        print(f"    CV skills ({len(meta.get('cv_skills', []))}): {meta.get('cv_skills', [])}")
+        print(f"    graph={meta.get('graph_id')} {summary} | timings_ms={meta.get('timings_ms')}")
+
+        if not meta.get("cv_skills"):
+            print("No skills extracted from CV. Provide a CV with obvious keywords.")
+            return
+        if summary.get("edge_count", 0) > 0 and best_score > 0:
+            break
+        print(f"    edge_count={summary.get('edge_count', 0)} best_score={best_score}: trying a broader query...")
 
     print("\n=== TOP RECOMMANDATIONS ===")
-    for i, r in enumerate(ranking, start=1):
-        job_id = r.get("job_id")
-        score = r.get("score", 0.0)
-        j = jobs_by_id.get(job_id)
-        if not j:
-            continue
-
-        trace.append(TraceCall("tools/call", "match_explain", {"job_id": job_id, "score": score}))
-        expl = client.tool_call(
-            "match_explain",
-            {
-                "cv_skills": cv_skills,
-                "job_skills": j.get("skills", []),
-                "job": {"title": j.get("title"), "company": j.get("company")},
-                "score": score,
-            },
-        )
-
-        print(f"\n#{i} — {j.get('title')} | {j.get('company')} | {j.get('location')} | score={score}")
+    for i, r in enumerate(res.get("recommendations", []) or [], start=1):
+        j = r.get("job", {}) or {}
+        expl = r.get("explain", {}) or {}
+        print(f"\n#{i} — {j.get('title')} | {j.get('company')} | {j.get('location')} | score={r.get('score', 0.0)}")
         print("Matched:", ", ".join(expl.get("matched_skills", [])[:12]) or "-")
         print("Missing:", ", ".join(expl.get("missing_skills", [])[:12]) or "-")
         print("Why:", expl.get("why_short"))
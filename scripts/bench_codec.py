@@ -0,0 +1,65 @@
+import glob
+import gzip
+import json
+import os
+import time
+
+import networkx as nx
+
+from server.canonical.normalize import normalize_adzuna, normalize_remotive
+from server.cv.extract_skills import extract_skills, job_text
+from server.graph.build_graph import build_graph
+from server.utils.codec import CODECS, MCP_GZIP_LEVEL
+
+# Benchmark: encode/decode time of every available JSON codec and bytes on the wire (plain / gzip)
+# on representative RPC payloads built from data/cache/*.json.
+RUNS = int(os.getenv("BENCH_CODEC_RUNS", "50"))
+NORMALIZE = {"adzuna": normalize_adzuna, "remotive": normalize_remotive}
+
+
+def payloads():
+    raw = {}
+    for path in sorted(glob.glob("data/cache/*_sample.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            raw[os.path.basename(path).split("_")[0]] = json.load(f)
+    out = {f"{s} upstream sample": jobs for s, jobs in raw.items()}
+
+    # jobs_list with 50 jobs: full descriptions + raw payloads (old response shape) and compact
+    full = [NORMALIZE[s](j) for s, jobs in raw.items() for j in jobs if s in NORMALIZE]
+    full = (full * (50 // max(1, len(full)) + 1))[:50]
+    out["jobs_list 50 (raw + full desc.)"] = {"count_total": len(full), "jobs": [j.to_dict(include_raw=True) for j in full]}
+    out["jobs_list 50 (compact)"] = {"count_total": len(full), "jobs": [
+        dict(j.to_dict(), description=(j.description or "")[:300]) for j in full
+    ]}
+
+    # graph_build return_graph=true on the same pool
+    jobs = [{"id": j.id, "skills": extract_skills(job_text(j.to_dict()))} for j in full]
+    G, summary = build_graph(cv_skills=["python", "sql", "power bi"], jobs=jobs)
+    out["graph_build node-link"] = {"graph_id": "bench", "summary": summary, "graph": nx.node_link_data(G)}
+    return out
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    for _ in range(RUNS):
+        fn()
+    return (time.perf_counter() - t0) / RUNS * 1e6
+
+
+if __name__ == "__main__":
+    print(f"codecs: {list(CODECS)} ; {RUNS} runs ; gzip level {MCP_GZIP_LEVEL}")
+    for name, obj in payloads().items():
+        plain = CODECS["json"][0](obj)
+        t0 = time.perf_counter()
+        packed = gzip.compress(plain, compresslevel=MCP_GZIP_LEVEL)
+        gz_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        gzip.decompress(packed)
+        gunz_ms = (time.perf_counter() - t0) * 1000
+        print(f"\n{name}: {len(plain) / 1024:.1f} KiB plain, {len(packed) / 1024:.1f} KiB gzip "
+              f"({len(packed) / len(plain):.0%}; gzip {gz_ms:.2f} ms, gunzip {gunz_ms:.2f} ms)")
+        for codec, (dumps, loads) in CODECS.items():
+            body = dumps(obj)
+            enc = timed(lambda: dumps(obj))
+            dec = timed(lambda: loads(body))
+            print(f"  {codec:8s} encode {enc:9.1f} us  decode {dec:9.1f} us  bytes {len(body):>8d}")
@@ -0,0 +1,70 @@
+import os
+import random
+import time
+
+from server.canonical.dedup import dedup_jobs
+
+# Benchmark: deduplication of a synthetic pool with known duplicates.
+# - exact duplicates: same offer reposted (gender marker / legal form / district variants)
+# - near duplicates: same description with a few edited words, posted by an aggregator
+UNIQUE = int(os.getenv("BENCH_DEDUP_UNIQUE", "20000"))
+EXACT = UNIQUE // 4
+NEAR = UNIQUE // 4
+
+WORDS = [f"w{i}" for i in range(20000)]
+TITLES = ["Data Analyst", "Data Scientist", "Data Engineer", "Business Analyst", "Développeur Python",
+          "Ingénieur DevOps", "Chef de projet data", "Product Owner", "Consultant BI", "Analyste financier"]
+CITIES = ["Paris", "Lyon", "Marseille", "Toulouse", "Lille", "Bordeaux", "Nantes", "Rennes"]
+
+
+def make_pool(rng: random.Random):
+    jobs, truth = [], []
+    for i in range(UNIQUE):
+        jobs.append({
+            "id": f"adzuna:{i}",
+            "source": "adzuna",
+            "title": f"{rng.choice(TITLES)} {rng.choice(['Junior', 'Senior', 'Confirmé', ''])} H/F".replace("  ", " "),
+            "company": f"Company {rng.randrange(UNIQUE)}",
+            "location": f"{rng.choice(CITIES)}, France",
+            "description": " ".join(rng.choices(WORDS, k=120)),
+        })
+        truth.append(i)
+    for k in range(EXACT):
+        i = rng.randrange(UNIQUE)
+        src = jobs[i]
+        jobs.append(dict(src, id=f"remotive:x{k}", source="remotive",
+                         title=src["title"].replace("H/F", "(F/H)"), company=src["company"] + " SAS",
+                         location=src["location"].split(",")[0] + " 8e, Ile-de-France",
+                         description=" ".join(rng.choices(WORDS, k=120))))
+        truth.append(i)
+    for k in range(NEAR):
+        i = rng.randrange(UNIQUE)
+        src = jobs[i]
+        words = src["description"].split()
+        for _ in range(2):
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+        jobs.append(dict(src, id=f"adzuna:n{k}", company=src["company"] + " via JobBoard", description=" ".join(words)))
+        truth.append(i)
+    order = list(range(len(jobs)))
+    rng.shuffle(order)
+    return [jobs[i] for i in order], [truth[i] for i in order]
+
+
+if __name__ == "__main__":
+    jobs, truth = make_pool(random.Random(7))
+    t0 = time.perf_counter()
+    out, meta = dedup_jobs(jobs)
+    elapsed = time.perf_counter() - t0
+
+    cluster_of = {j["id"]: t for j, t in zip(jobs, truth)}
+    merged_pairs = sum(len(j.get("duplicate_ids") or []) for j in out)
+    wrong = sum(1 for j in out for d in j.get("duplicate_ids") or [] if cluster_of[d] != cluster_of[j["id"]])
+    expected = len(jobs) - len(set(truth))
+    print(f"jobs={len(jobs)} unique={len(set(truth))} -> kept={len(out)} in {elapsed * 1000:.0f} ms "
+          f"({len(jobs) / elapsed:,.0f} jobs/s)")
+    print(f"meta={meta}")
+    print(f"recall={(merged_pairs - wrong) / expected:.3f} precision={(merged_pairs - wrong) / max(1, merged_pairs):.3f}")
+
+    t0 = time.perf_counter()
+    dedup_jobs(jobs, near_duplicates=False)
+    print(f"exact key only: {(time.perf_counter() - t0) * 1000:.0f} ms")
@@ -0,0 +1,58 @@
+import json
+import random
+import threading
+import time
+import urllib.request
+
+from server import mcp_server
+from server.cv.extract_skills import SKILL_KEYWORDS
+from server.graph.explain import explain_match, explain_matches
+
+# Benchmark: explanations of a top-k=50, per job (explain_match / one match_explain RPC each)
+# vs one batch (explain_matches / one match_explain_batch RPC).
+TOP_K = 50
+RUNS = 200
+PORT = 8797
+
+
+def rpc(name: str, arguments: dict) -> dict:
+    body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": name, "arguments": arguments}})
+    req = urllib.request.Request(f"http://127.0.0.1:{PORT}/rpc", data=body.encode("utf-8"), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read())["result"]
+
+
+if __name__ == "__main__":
+    rng = random.Random(5)
+    skills = sorted(set(SKILL_KEYWORDS))
+    cv = rng.sample(skills, 10)
+    items = [{"job_skills": rng.sample(skills, rng.randint(3, 12)), "job": {"title": f"Job {i}", "company": "ACME"},
+              "score": 1.0 - i / TOP_K} for i in range(TOP_K)]
+
+    assert explain_matches(cv, items) == [explain_match(cv, it["job_skills"], it["job"], it["score"]) for it in items]
+
+    t0 = time.perf_counter()
+    for _ in range(RUNS):
+        [explain_match(cv, it["job_skills"], it["job"], it["score"]) for it in items]
+    per_job = (time.perf_counter() - t0) / RUNS * 1000
+    t0 = time.perf_counter()
+    for _ in range(RUNS):
+        explain_matches(cv, items)
+    batch = (time.perf_counter() - t0) / RUNS * 1000
+    print(f"in-process top-{TOP_K}: per job {per_job:.3f} ms, batch {batch:.3f} ms")
+
+    server = mcp_server.make_server("127.0.0.1", PORT)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    mcp_server.Handler.log_message = lambda *a, **k: None
+
+    t0 = time.perf_counter()
+    for _ in range(10):
+        for it in items:
+            rpc("match_explain", {"cv_skills": cv, "job_skills": it["job_skills"], "job": it["job"], "score": it["score"]})
+    per_rpc = (time.perf_counter() - t0) / 10 * 1000
+    t0 = time.perf_counter()
+    for _ in range(10):
+        rpc("match_explain_batch", {"cv_skills": cv, "items": items})
+    batch_rpc = (time.perf_counter() - t0) / 10 * 1000
+    print(f"over RPC top-{TOP_K}: {TOP_K} match_explain calls {per_rpc:.1f} ms, one match_explain_batch {batch_rpc:.1f} ms")
+    server.shutdown()
@@ -0,0 +1,73 @@
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+# Benchmark: Skills<->Jobs graph construction, networkx (build_graph) vs compact CSR (build_csr_graph).
+# Each (builder, size) runs in a fresh process so RSS numbers are not polluted by the previous run.
+SIZES = [10_000, 100_000, 1_000_000]
+SKILLS = 2_000
+SKILLS_PER_JOB = 10
+NX_MAX_JOBS = int(os.getenv("BENCH_GRAPH_NX_MAX_JOBS", "100000"))  # networkx at 1M jobs needs several GB
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status", "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def synthetic_jobs(n: int):
+    rng = random.Random(1)
+    skills = [f"skill {i}" for i in range(SKILLS)]
+    weights = [1.0 / (i + 1) ** 0.8 for i in range(SKILLS)]
+    return [
+        {"id": f"adzuna:{i}", "title": "Data Analyst H/F", "source": "adzuna",
+         "skills": rng.choices(skills, weights=weights, k=SKILLS_PER_JOB)}
+        for i in range(n)
+    ]
+
+
+def run(builder: str, n: int) -> dict:
+    from server.graph.build_graph import build_graph
+    from server.graph.csr import build_csr_graph
+    from server.graph.rank import incidence_from_graph
+
+    jobs = synthetic_jobs(n)
+    base = rss_mb()
+    t0 = time.perf_counter()
+    G, summary = (build_graph if builder == "networkx" else build_csr_graph)(["skill 1", "skill 2"], jobs)
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    incidence_from_graph(G)  # what graph_rank needs
+    incidence_s = time.perf_counter() - t0
+    return {
+        "build_s": build_s,
+        "incidence_s": incidence_s,
+        "rss_mb": rss_mb() - base,
+        "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - base,
+        "edges": summary["edge_count"],
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        print(json.dumps(run(sys.argv[1], int(sys.argv[2]))))
+        sys.exit(0)
+
+    for n in SIZES:
+        for builder in ("networkx", "csr"):
+            if builder == "networkx" and n > NX_MAX_JOBS:
+                print(f"jobs={n:>9,} {builder:8s} skipped (BENCH_GRAPH_NX_MAX_JOBS={NX_MAX_JOBS})")
+                continue
+            out = subprocess.run([sys.executable, "-m", "scripts.bench_graph_build", builder, str(n)],
+                                 capture_output=True, text=True, check=True)
+            r = json.loads(out.stdout)
+            print(f"jobs={n:>9,} {builder:8s} build={r['build_s']:7.2f}s incidence={r['incidence_s']:6.2f}s "
+                  f"graph RSS=+{r['rss_mb']:7.0f} MB (peak +{r['peak_mb']:7.0f} MB) edges={r['edges']:,}")
+            sys.stdout.flush()
@@ -0,0 +1,85 @@
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from server.connectors.job_store import JobStore
+
+# Benchmark: local job store (SQLite FTS5) filled with synthetic jobs, then jobs_list-like queries.
+JOB_COUNT = int(os.getenv("BENCH_STORE_JOBS", "1000000"))
+BATCH = 10_000
+RUNS = 20
+
+TITLES = ["data analyst", "data scientist", "data engineer", "business analyst", "développeur python",
+          "ingénieur devops", "chef de projet", "product owner", "analyste financier", "consultant bi"]
+COMPANIES = [f"Company {i}" for i in range(5000)]
+CITIES = ["Paris", "Lyon", "Marseille", "Toulouse", "Lille", "Bordeaux", "Nantes", "Rennes", "Berlin", "London"]
+WORDS = ("python sql power bi tableau excel airflow spark dbt docker kubernetes aws azure gcp pandas "
+         "reporting dashboard machine learning équipe client projet mission télétravail cdi stage alternance "
+         "anglais agile scrum api etl pipeline modèle statistiques données qualité gouvernance").split()
+# Long tail of rarer words (Zipf-like draw below), as in real descriptions
+FILLER = [f"mot{i}" for i in range(5000)]
+FILLER_CUM_WEIGHTS = list(itertools.accumulate(1.0 / (i + 1) for i in range(len(FILLER))))
+QUERIES = [("data", ""), ("data analyst", ""), ("python", "Paris"), ("airflow spark", ""),
+           ("kubernetes", "Lyon"), ("gouvernance qualité", ""), ("product owner", "Berlin")]
+
+
+def synthetic_jobs(start: int, n: int, rng: random.Random):
+    for i in range(start, start + n):
+        source = "adzuna" if i % 3 else "remotive"
+        city = rng.choice(CITIES)
+        yield {
+            "id": f"{source}:{i}",
+            "source": source,
+            "title": f"{rng.choice(TITLES).title()} H/F",
+            "company": rng.choice(COMPANIES),
+            "location": city if source == "adzuna" else "Worldwide",
+            "description": " ".join(rng.choices(WORDS, k=8) + rng.choices(FILLER, cum_weights=FILLER_CUM_WEIGHTS, k=32)),
+            "url": f"https://example.org/jobs/{i}",
+            "posted_at": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T10:00:00Z",
+            "location_area": ["France", city] if source == "adzuna" else None,
+        }
+
+
+def timed(fn, runs: int = RUNS):
+    out = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        n = len(fn())
+        out.append((time.perf_counter() - t0) * 1000)
+    out.sort()
+    return n, statistics.median(out), out[int(0.95 * (len(out) - 1))]
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.mkdtemp(prefix="job_store_bench_"), "jobs.sqlite3")
+    store = JobStore(path)
+    rng = random.Random(1)
+
+    t0 = time.perf_counter()
+    for start in range(0, JOB_COUNT, BATCH):
+        store.upsert(synthetic_jobs(start, min(BATCH, JOB_COUNT - start), rng))
+    load_s = time.perf_counter() - t0
+    size_mb = store.stats()["size_bytes"] / 1e6
+    print(f"jobs={store.count()} load={load_s:.1f}s ({JOB_COUNT / load_s:,.0f} upserts/s) size={size_mb:.0f} MB")
+
+    # Re-seeing known jobs (last_seen bump, no re-index) vs changed content
+    t0 = time.perf_counter()
+    out = store.upsert(synthetic_jobs(0, BATCH, random.Random(1)))
+    print(f"re-upsert {BATCH}: {(time.perf_counter() - t0) * 1000:.0f} ms {out}")
+    sys.stdout.flush()
+
+    for order in ("relevance", "recent"):
+        print(f"\norder={order} (limit=50 per source, adzuna + remotive)")
+        for query, location in QUERIES:
+            def run():
+                return (store.search(query, "adzuna", location=location, limit=50, order=order)
+                        + store.search(query, "remotive", location=location, limit=50, order=order))
+            n, p50, p95 = timed(run)
+            print(f"  {query!r:24s} loc={location or '-':8s} n={n:3d} p50={p50:8.2f} ms p95={p95:8.2f} ms")
+        n, p50, p95 = timed(lambda: store.search("data", "adzuna", limit=50, posted_since="2024-12-01", order=order))
+        print(f"  {'data + posted_since':24s} {'':12s} n={n:3d} p50={p50:8.2f} ms p95={p95:8.2f} ms")
+        sys.stdout.flush()
@@ -0,0 +1,109 @@
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import server.mcp.tools as tools
+from server.canonical.normalize import normalize_jobs
+from server.mcp_server import Handler, make_server
+
+# Load test: mixed tool calls from concurrent clients (persistent connections), serial vs threaded server.
+# Upstream job APIs are replayed offline from data/cache/*_sample.json with a fixed latency,
+# so jobs_list behaves like a slow Adzuna call without network access.
+CLIENTS = int(os.getenv("BENCH_CLIENTS", "16"))
+REQUESTS_PER_CLIENT = int(os.getenv("BENCH_REQUESTS", "20"))
+UPSTREAM_MS = int(os.getenv("BENCH_UPSTREAM_MS", "300"))
+MIX = [("cv_extract_skills", 0.6), ("jobs_extract_skills", 0.2), ("jobs_list", 0.2)]
+
+
+def load_samples() -> dict:
+    out = {}
+    for name in ("adzuna", "remotive"):
+        with open(f"data/cache/{name}_sample.json", "r", encoding="utf-8") as f:
+            out[name] = json.load(f)
+    return out
+
+
+def replay_upstream(samples: dict):
+    def _fetch(source, query, location, limit, timeout=None, errors=None):
+        time.sleep(UPSTREAM_MS / 1000)
+        return samples[source][:limit]
+    return _fetch
+
+
+def make_calls(samples: dict) -> dict:
+    jobs = normalize_jobs("adzuna", samples["adzuna"]) + normalize_jobs("remotive", samples["remotive"])
+    cv = "Data analyst: Python, SQL, Power BI, Tableau, Docker, Airflow, dbt. Anglais courant."
+    return {
+        "cv_extract_skills": {"text": cv},
+        "jobs_extract_skills": {"jobs": jobs[:20]},
+        "jobs_list": {"query": "data", "limit": 10, "sources": ["adzuna"]},
+    }
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def run_clients(port: int, calls: dict) -> dict:
+    latencies = {name: [] for name, _ in MIX}
+    status = {}
+    lock = threading.Lock()
+    names = [n for n, _ in MIX]
+    weights = [w for _, w in MIX]
+
+    def client(idx: int):
+        rng = random.Random(idx)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        for i in range(REQUESTS_PER_CLIENT):
+            name = rng.choices(names, weights)[0]
+            body = json.dumps({"jsonrpc": "2.0", "id": i, "method": "tools/call",
+                               "params": {"name": name, "arguments": calls[name]}}).encode("utf-8")
+            t0 = time.perf_counter()
+            try:
+                conn.request("POST", "/rpc", body=body, headers={"Content-Type": "application/json"})
+                resp = conn.getresponse()
+                resp.read()
+                code = resp.status
+            except OSError:
+                conn.close()
+                code = "conn_error"
+            ms = (time.perf_counter() - t0) * 1000
+            with lock:
+                if code == 200:
+                    latencies[name].append(ms)
+                status[code] = status.get(code, 0) + 1
+        conn.close()
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(CLIENTS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {"wall_s": time.perf_counter() - t0, "latencies": latencies, "status": status}
+
+
+if __name__ == "__main__":
+    Handler.log_message = lambda *a, **k: None  # keep the output readable
+    samples = load_samples()
+    tools._fetch = replay_upstream(samples)
+    calls = make_calls(samples)
+    print(f"clients={CLIENTS} requests/client={REQUESTS_PER_CLIENT} upstream_ms={UPSTREAM_MS} mix={MIX}")
+
+    for threaded in (False, True):
+        server = make_server("127.0.0.1", 0, threaded=threaded)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        out = run_clients(server.server_address[1], calls)
+        server.shutdown()
+        server.server_close()
+
+        print(f"\n{'threaded' if threaded else 'serial'}: wall={out['wall_s']:.1f}s status={out['status']}")
+        for name, lat in out["latencies"].items():
+            if lat:
+                print(f"  {name:20s} n={len(lat):3d} p50={percentile(lat, 50):8.1f} ms p99={percentile(lat, 99):8.1f} ms")
+        sys.stdout.flush()
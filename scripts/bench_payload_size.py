@@ -0,0 +1,70 @@
+import json
+import sys
+import tracemalloc
+
+from server.canonical.normalize import normalize_adzuna, normalize_remotive
+from server.mcp.tools import project_jobs
+
+# Measurement: jobs_list response size and client-side memory, before (raw payload + full
+# description in every job) and after (compact jobs, clipped description, optional fields).
+SAMPLES = {"adzuna": normalize_adzuna, "remotive": normalize_remotive}
+
+
+def load_jobs():
+    jobs = []
+    for source, normalize in SAMPLES.items():
+        with open(f"data/cache/{source}_sample.json", "r", encoding="utf-8") as f:
+            jobs.extend(normalize(j) for j in json.load(f))
+    return jobs
+
+
+def client_load(body: str):
+    """Bytes allocated by json.loads of a response (what the client keeps in memory)."""
+    tracemalloc.start()
+    data = json.loads(body)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, size
+
+
+def deep_size(obj) -> int:
+    seen = set()
+
+    def size(o) -> int:
+        if id(o) in seen:
+            return 0
+        seen.add(id(o))
+        n = sys.getsizeof(o)
+        if isinstance(o, dict):
+            n += sum(size(k) + size(v) for k, v in o.items())
+        elif isinstance(o, (list, tuple)):
+            n += sum(size(v) for v in o)
+        return n
+
+    return size(obj)
+
+
+if __name__ == "__main__":
+    jobs = load_jobs()
+    variants = {
+        "before (raw + full description)": [j.to_dict(include_raw=True) for j in jobs],
+        "compact, full description": project_jobs([j.to_dict() for j in jobs], None, -1),
+        "compact, description 300 chars": project_jobs([j.to_dict() for j in jobs], None, 300),
+        "fields=title,company,location,url": project_jobs(
+            [j.to_dict() for j in jobs], ["title", "company", "location", "url"], 0
+        ),
+    }
+    print(f"jobs={len(jobs)}")
+    base = None
+    for name, payload in variants.items():
+        body = json.dumps({"jobs": payload}, ensure_ascii=False)
+        _, mem = client_load(body)
+        base = base or len(body.encode("utf-8"))
+        print(f"  {name:36s} body={len(body.encode('utf-8')) / 1024:8.1f} KiB ({len(body.encode('utf-8')) / base:6.1%}) "
+              f"client json.loads={mem / 1024:8.1f} KiB")
+
+    one = jobs[0]
+    as_dict = one.to_dict()
+    print(f"\nper job object (no raw): dataclass(slots)={sys.getsizeof(one)} B shell, dict={sys.getsizeof(as_dict)} B shell; "
+          f"hasattr __dict__: {hasattr(one, '__dict__')}")
+    print(f"deep size: compact dict={deep_size(as_dict)} B, dict with raw={deep_size(one.to_dict(include_raw=True))} B")
@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+
+from scripts.bench_graph_rank import CV_SKILLS, synthetic_incidence
+from server.graph.ppr_basis import PprBasis
+from server.graph.rank import rank_incidence
+
+# Benchmark: CV edits re-ranked from the cached per-skill PPR basis vs a full PPR walk each time.
+# Asserts the basis is never slower than a direct walk (it falls back to one walk on big graphs).
+SIZES = [(2_000, 500), (20_000, 2_000), (100_000, 5_000)]
+EDITS = 20
+SLACK = 1.15  # timing noise allowed on medians
+
+
+def ms(t0: float) -> float:
+    return (time.perf_counter() - t0) * 1000
+
+
+if __name__ == "__main__":
+    for n_jobs, n_skills in SIZES:
+        job_ids, skills, B = synthetic_incidence(n_jobs, n_skills, 10)
+        rng = np.random.default_rng(2)
+        cv = [skills[i] for i in rng.choice(n_skills // 10, size=CV_SKILLS, replace=False)]
+
+        basis = PprBasis(job_ids, skills, B)
+        t0 = time.perf_counter()
+        full = basis.precompute()
+        pre_ms = ms(t0)
+        t0 = time.perf_counter()
+        rank_incidence(job_ids, skills, B, cv, top_k=20)
+        first_walk_ms = ms(t0)
+        t0 = time.perf_counter()
+        first = basis.rank(cv, top_k=20)
+        first_ms = ms(t0)
+        assert first_ms <= first_walk_ms * SLACK + 1, (first_ms, first_walk_ms)
+
+        walk, cached, edited, walked = [], [], [], []
+        for _ in range(EDITS):
+            # Edit one CV skill: swap it for another (often already cached) skill
+            cv[rng.integers(len(cv))] = skills[int(rng.integers(n_skills // 5))]
+            t0 = time.perf_counter()
+            ref = rank_incidence(job_ids, skills, B, cv, top_k=20)
+            walk.append(ms(t0))
+            t0 = time.perf_counter()
+            out = basis.rank(cv, top_k=20)
+            engine = out["meta"]["engine"]
+            (walked if engine == "ppr_walk" else edited if out["meta"]["basis_computed"] else cached).append(ms(t0))
+            assert [r["job_id"] for r in out["ranking"][:5]] == [r["job_id"] for r in ref["ranking"][:5]]
+        basis_ms = cached + edited + walked
+        assert np.median(basis_ms) <= np.median(walk) * SLACK + 1, (np.median(basis_ms), np.median(walk))
+
+        print(f"jobs={n_jobs} skills={n_skills} edges={B.nnz}: precompute={'%.0f ms' % pre_ms if full else 'too big, lazy'} "
+              f"first CV={first_ms:.1f} ms (walk {first_walk_ms:.1f} ms, engine {first['meta']['engine']})")
+        print(f"  full PPR walk per edit  median {np.median(walk):9.3f} ms")
+        if cached:
+            print(f"  basis, cached skills    median {np.median(cached):9.3f} ms ({len(cached)} edits)")
+        if edited:
+            print(f"  basis, one new column   median {np.median(edited):9.3f} ms ({len(edited)} edits)")
+        if walked:
+            print(f"  basis, fallback walk    median {np.median(walked):9.3f} ms ({len(walked)} edits)")
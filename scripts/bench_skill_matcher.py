@@ -0,0 +1,53 @@
+import json
+import random
+import time
+
+from server.cv.extract_skills import SKILL_KEYWORDS
+from server.cv.matcher import SkillMatcher
+
+# Benchmark: single-pass matcher vs per-keyword scan, on a synthetic taxonomy of several thousand skills.
+TAXONOMY_SIZE = 5000
+SYLLABLES = ["da", "ta", "py", "on", "ku", "ber", "net", "es", "spa", "rk", "fl", "ow", "sno", "qu", "ery",
+             "lin", "ux", "ma", "tri", "x", "gra", "ph", "ops", "cl", "oud", "ai", "ml", "bi", "db", "io"]
+
+
+def synthetic_taxonomy(n: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    out = set(SKILL_KEYWORDS)
+    while len(out) < n:
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in range(rng.choice([1, 1, 1, 2, 3]))]
+        out.add(" ".join(words))
+    return sorted(out)
+
+
+def load_texts() -> list:
+    texts = []
+    for name in ("adzuna", "remotive"):
+        with open(f"data/cache/{name}_sample.json", "r", encoding="utf-8") as f:
+            texts += [f"{j.get('title') or ''}\n{j.get('description') or ''}" for j in json.load(f)]
+    return texts
+
+
+def bench(matcher: SkillMatcher, texts: list, fn_name: str, repeat: int = 1) -> float:
+    fn = getattr(matcher, fn_name)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for t in texts:
+            fn(t)
+    return (time.perf_counter() - t0) / (repeat * len(texts)) * 1000
+
+
+if __name__ == "__main__":
+    texts = load_texts()
+    chars = sum(len(t) for t in texts) // len(texts)
+    print(f"texts={len(texts)} avg_chars={chars}")
+
+    for size in (len(SKILL_KEYWORDS), 1000, TAXONOMY_SIZE):
+        taxonomy = synthetic_taxonomy(size)
+        t0 = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build_ms = (time.perf_counter() - t0) * 1000
+        single = bench(matcher, texts, "find", repeat=5)
+        scan = bench(matcher, texts, "find_scan")
+        print(f"keywords={len(taxonomy):5d} build={build_ms:7.1f}ms single_pass={single:7.3f}ms/text "
+              f"scan={scan:8.3f}ms/text speedup=x{scan / single:.1f}")
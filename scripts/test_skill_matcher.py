@@ -0,0 +1,61 @@
+import json
+import random
+
+from server.cv.extract_skills import SKILL_KEYWORDS, extract_skills, extract_skills_scan
+from server.cv.matcher import SkillMatcher
+
+# Equivalence check: single-pass matcher vs reference per-keyword scan.
+SEPARATORS = [" ", "  ", "-", "_", "/", " - ", "\n", "\t"]
+NOISE = ["data", "analyst", "R&D", "rest-api", "my_python", "ci/cd", "powerbi", "sqlserver", "postgre sql",
+         "İstanbul", "ſql", "Kubernetes", "(aws)", "gcp,", "scikit", "learn", "r.", "java-script", "é", "..."]
+
+
+def _variant(kw: str, rng: random.Random) -> str:
+    words = kw.split()
+    out = words[0]
+    for w in words[1:]:
+        out += rng.choice(SEPARATORS) + w
+    return "".join(c.upper() if rng.random() < 0.3 else c for c in out)
+
+
+def _random_text(keywords, rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 60)):
+        r = rng.random()
+        if r < 0.35:
+            parts.append(_variant(rng.choice(keywords), rng))
+        elif r < 0.6:
+            parts.append(rng.choice(NOISE))
+        else:
+            parts.append("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(1, 8))))
+        parts.append(rng.choice(SEPARATORS + [", ", ". ", "", ";"]))
+    return "".join(parts)
+
+
+def check(n_texts: int = 5000, seed: int = 7) -> None:
+    rng = random.Random(seed)
+
+    # 1) real samples
+    for name in ("adzuna", "remotive"):
+        with open(f"data/cache/{name}_sample.json", "r", encoding="utf-8") as f:
+            for job in json.load(f):
+                text = json.dumps(job, ensure_ascii=False)
+                assert extract_skills(text) == extract_skills_scan(text), job.get("id")
+
+    # 2) randomized texts over the production dictionary
+    for _ in range(n_texts):
+        text = _random_text(SKILL_KEYWORDS, rng)
+        assert extract_skills(text) == extract_skills_scan(text), text
+
+    # 3) randomized texts over a taxonomy with shared prefixes / multi-word terms
+    taxonomy = SKILL_KEYWORDS + ["sql", "sql server tools", "power", "power bi desktop", "c", "c/c++", "ci", "cd",
+                                 "data", "data lake", "node.js", "node", ".net", "r&d", "go", "google cloud"]
+    matcher = SkillMatcher(taxonomy)
+    for _ in range(n_texts):
+        text = _random_text(taxonomy, rng)
+        assert matcher.find(text) == matcher.find_scan(text), text
+
+
+if __name__ == "__main__":
+    check()
+    print("[OK] single-pass matcher == per-keyword scan")
@@ -0,0 +1,41 @@
+from server.cv.vocab import canonical, get_vocab, profile
+from server.graph.explain import explain_match, explain_matches
+
+# Checks of the skill vocabulary profiles and of the explanations built on them.
+
+
+def check() -> None:
+    vocab = get_vocab()
+    size = len(vocab)
+
+    # 1) canonical matching: aliases / separators of a dictionary skill are the same skill
+    assert canonical("Power-BI") == canonical("power bi") == "power bi"
+    assert canonical("sklearn") == canonical("scikit-learn")
+    ex = explain_match(["Power-BI", "sklearn", "Python"], ["power bi", "scikit-learn", "docker"])
+    assert ex["matched_skills"] == sorted([canonical("power bi"), canonical("scikit-learn")]), ex
+    assert ex["missing_skills"] == ["docker"], ex
+
+    # 2) cv_count = distinct canonical CV skills: duplicates under aliases count once
+    ex = explain_match(["Power BI", "power-bi", "SQL", "sql "], ["power bi"])
+    assert ex["coverage"] == 0.5, ex
+    assert "(1/2 compétences du CV matchées)" in ex["why_short"], ex["why_short"]
+    assert explain_match([], ["sql"])["coverage"] == 0.0
+
+    # 3) skills outside the dictionary still match, but are not interned in the vocabulary
+    for n in range(2000):
+        ex = explain_match([f"client-skill-{n}", "sql"], [f"Client Skill {n}", "SQL", "python"])
+        assert ex["matched_skills"] == sorted([canonical(f"client-skill-{n}"), "sql"]), ex
+        assert ex["coverage"] == 1.0, ex
+    assert len(get_vocab()) == size, (size, len(get_vocab()))
+    assert profile(["sql", "not-a-dictionary-skill"]).bits.bit_length() <= size
+
+    # 4) batch explanations == one explain_match per job
+    cv = ["Python", "SQL", "Power-BI", "dbt-core"]
+    jobs = [["python", "docker"], ["power bi", "sql", "airflow"], [], ["dbt-core", "python"]]
+    batch = explain_matches(cv, [{"job_skills": j, "score": 0.5} for j in jobs])
+    assert batch == [explain_match(cv, j, score=0.5) for j in jobs], batch
+
+
+if __name__ == "__main__":
+    check()
+    print("[OK] skill vocabulary: canonical matching, bounded vocabulary, batch == single explain")
@@ -0,0 +1,91 @@
+import ast
+import threading
+from typing import Any, Dict, List
+
+# Checks of the UI search strategy (ui/app.py run_pipeline / run_with_fallbacks) against a
+# fake MCP client. app.py is a Streamlit script: only its imports, constants, functions and
+# classes are loaded here, its page code (and streamlit itself) is not run.
+
+APP_PATH = "ui/app.py"
+
+
+def load_app_functions() -> Dict[str, Any]:
+    with open(APP_PATH, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), APP_PATH)
+    keep = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            if all(a.name.split(".")[0] != "streamlit" for a in node.names) and getattr(node, "module", None) != "streamlit":
+                keep.append(node)
+        elif isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            keep.append(node)
+        elif isinstance(node, ast.Try) and all(isinstance(n, (ast.Import, ast.ImportFrom)) for n in node.body):
+            keep.append(node)  # optional imports (orjson)
+        elif isinstance(node, ast.Assign) and all(isinstance(t, ast.Name) and t.id.isupper() for t in node.targets):
+            keep.append(node)
+    ns: Dict[str, Any] = {"__name__": "ui_app_functions"}
+    exec(compile(ast.Module(body=keep, type_ignores=[]), APP_PATH, "exec"), ns)
+    return ns
+
+
+class FakeClient:
+    """match_pipeline answers shaped like server/matching/pipeline.py, keyed by query."""
+
+    def __init__(self, responses: Dict[str, Dict[str, Any]]):
+        self.responses = responses
+        self.queries: List[str] = []
+        self._lock = threading.Lock()
+
+    def tool_call(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        assert name == "match_pipeline", name
+        with self._lock:
+            self.queries.append(arguments["query"])
+        return self.responses.get(arguments["query"]) or _response([], [])
+
+
+def _reco(job_id: str, score: float) -> Dict[str, Any]:
+    return {"job_id": job_id, "score": score, "title": job_id}
+
+
+def _response(recos: List[Dict[str, Any]], relaxed: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "recommendations": recos,
+        "meta": {"graph_summary": {"edge_count": 12}, "jobs_list_meta": {}},
+        "relaxed": {"recommendations": relaxed, "ranked_count": len(relaxed)},
+    }
+
+
+def check() -> None:
+    app = load_app_functions()
+    args = dict(cv_text="Python SQL", role="data analyst", contract="stage", location="Paris",
+                sources=["adzuna"], limit=10, top_k=5)
+    base = app["build_mcp_query"]("data analyst", "stage", "Paris")
+
+    # 1) relaxed scoring reaches the UI: meta["relaxed"] of one pipeline call
+    client = FakeClient({base: _response([], [_reco("r1", 0.4)])})
+    meta, recos = app["run_pipeline"](client, query=base, with_relaxed=True, **args)
+    assert recos == [] and meta["relaxed"]["recommendations"][0]["job_id"] == "r1", meta
+
+    # 2) every candidate empty when strict, relaxed non-empty: pass 2 returns the relaxed recos
+    meta, recos = app["run_with_fallbacks"](client, **args)
+    assert [r["job_id"] for r in recos] == ["r1"], recos
+    assert meta["strict_filters"] is False
+    assert [t["strict"] for t in meta["fallback_tried"]][-1] is False
+
+    # 3) the base query answers: no fallback candidate is started (each one costs upstream calls)
+    client = FakeClient({base: _response([_reco("b1", 0.9)], [])})
+    meta, recos = app["run_with_fallbacks"](client, **args)
+    assert [r["job_id"] for r in recos] == ["b1"] and client.queries == [base], client.queries
+
+    # 4) base query empty: fallbacks run at most FALLBACK_PARALLELISM ahead, earliest hit wins
+    candidates = list(dict.fromkeys([base] + app["ROLE_FALLBACK_QUERIES"].get("data analyst", []) + ["data analyst", "data"]))
+    assert len(candidates) > 2, candidates
+    client = FakeClient({q: _response([_reco(q, 0.5)], []) for q in candidates[1:]})
+    meta, recos = app["run_with_fallbacks"](client, **args)
+    assert recos[0]["job_id"] == candidates[1], recos
+    assert len(client.queries) <= 1 + max(1, app["FALLBACK_PARALLELISM"]), client.queries
+
+
+if __name__ == "__main__":
+    check()
+    print("[OK] UI fallbacks: relaxed results reach the UI, fallbacks only after an empty base query")
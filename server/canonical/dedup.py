@@ -0,0 +1,215 @@
+import html
+import re
+import unicodedata
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Job deduplication: exact key on normalized (title, company, city) + near-duplicate
+# descriptions via MinHash signatures and an LSH (banding) index, merged with union-find.
+# Linear in the number of jobs: every job is hashed once and only compared with the few
+# jobs sharing one of its LSH buckets.
+
+NUM_PERM = 64
+BANDS = 8  # 8 bands x 8 rows: pairs above ~0.77 Jaccard become candidates
+SHINGLE = 3  # word 3-grams
+NEAR_DUP_THRESHOLD = 0.8  # estimated Jaccard of descriptions
+TITLE_MIN_OVERLAP = 0.5  # near-duplicates must also share most title words
+MAX_BUCKET_COMPARISONS = 8  # per job and bucket (templated descriptions share big buckets)
+_CHUNK_SHINGLES = 100_000
+
+_rng = np.random.default_rng(20240501)
+_A = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)  # odd multipliers
+_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"\w+")
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+_GENDER_RE = re.compile(r"\(?\b(h|f|m|w|d)\s*/\s*(h|f|m|w|d)(\s*/\s*(h|f|m|w|d))?\b\)?")
+_LEGAL_FORMS = {"sa", "sas", "sasu", "sarl", "eurl", "inc", "ltd", "llc", "gmbh", "plc", "bv", "group", "groupe"}
+
+
+def _fold(text: str) -> str:
+    """Lowercase, accents removed."""
+    text = (text or "").lower()
+    if text.isascii():
+        return text
+    return _COMBINING_RE.sub("", unicodedata.normalize("NFKD", text))
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_hash(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def norm_title(title: str) -> str:
+    return " ".join(_TOKEN_RE.findall(_GENDER_RE.sub(" ", _fold(title))))
+
+
+def norm_company(company: str) -> str:
+    return " ".join(t for t in _TOKEN_RE.findall(_fold(company)) if t not in _LEGAL_FORMS)
+
+
+def norm_city(location: str) -> str:
+    # "Paris 15e, Ile-de-France" -> "paris" ; "La Défense, Hauts-de-Seine" -> "la defense"
+    first = _fold(location).split(",")[0]
+    return " ".join(t for t in _TOKEN_RE.findall(first) if not t.isdigit() and not re.fullmatch(r"\d+(e|er|eme)", t))
+
+
+# Placeholder of normalize_* for a missing company/location: never part of an exact key
+_UNKNOWN = {"", "unknown"}
+
+
+def exact_key(job: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+    """(title, company, city), or None when one of them is missing (left to near-duplicates)."""
+    title = norm_title(job.get("title") or "")
+    company = norm_company(job.get("company") or "")
+    city = norm_city(job.get("location") or "")
+    if not title or company in _UNKNOWN or city in _UNKNOWN:
+        return None
+    return title, company, city
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(_fold(html.unescape(_TAG_RE.sub(" ", text or ""))))
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """32-bit hashes of the word 3-grams of `text`."""
+    toks = _tokens(text)
+    if len(toks) < SHINGLE:
+        return np.empty(0, dtype=np.uint64)
+    h = np.fromiter(map(_token_hash, toks), dtype=np.uint64, count=len(toks))
+    acc = h[: len(h) - SHINGLE + 1].copy()
+    for k in range(1, SHINGLE):
+        acc = (acc * np.uint64(1000003)) ^ h[k: len(h) - SHINGLE + 1 + k]
+    return acc & np.uint64(0xFFFFFFFF)
+
+
+def minhash_signatures(shingles: List[np.ndarray]) -> np.ndarray:
+    """(n_docs, NUM_PERM) MinHash signatures; docs without shingles get an all-max row (never matched)."""
+    out = np.full((len(shingles), NUM_PERM), np.iinfo(np.uint64).max, dtype=np.uint64)
+    docs = [i for i, s in enumerate(shingles) if s.size]
+    start = 0
+    while start < len(docs):
+        # Chunk so that the (NUM_PERM x shingles) matrix stays ~50 MB
+        end, total = start, 0
+        while end < len(docs) and (total == 0 or total + shingles[docs[end]].size <= _CHUNK_SHINGLES):
+            total += shingles[docs[end]].size
+            end += 1
+        chunk = docs[start:end]
+        x = np.concatenate([shingles[i] for i in chunk])
+        offsets = np.cumsum([0] + [shingles[i].size for i in chunk[:-1]])
+        # Multiply-shift hashing (wraps mod 2**64, top 32 bits kept): no modulo, vectorized
+        hashed = (_A[:, None] * x[None, :] + _B[:, None]) >> np.uint64(32)
+        out[chunk] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = end
+    return out
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # Smallest index stays the root: the earliest job (source order) is the canonical one
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def _title_overlap(a: str, b: str) -> float:
+    ta, tb = set(a.split()), set(b.split())
+    return len(ta & tb) / max(1, min(len(ta), len(tb)))
+
+
+def _merge(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """First job of the group, completed by the others (longest description, every source/id/url)."""
+    out = dict(group[0])
+    for j in group[1:]:
+        for k, v in j.items():
+            if out.get(k) in (None, "", [], "Unknown") and v not in (None, "", []):
+                out[k] = v
+        if len(j.get("description") or "") > len(out.get("description") or ""):
+            out["description"] = j["description"]
+    out["sources"] = list(dict.fromkeys(j.get("source") for j in group if j.get("source")))
+    out["duplicate_ids"] = [j.get("id") for j in group[1:]]
+    out["urls"] = list(dict.fromkeys(j.get("url") for j in group if j.get("url")))
+    return out
+
+
+def _single(job: Dict[str, Any]) -> Dict[str, Any]:
+    """A job without duplicates, with the same extra fields as a merged one."""
+    return dict(
+        job,
+        sources=[job["source"]] if job.get("source") else [],
+        duplicate_ids=[],
+        urls=[job["url"]] if job.get("url") else [],
+    )
+
+
+def dedup_jobs(jobs: List[Dict[str, Any]], near_duplicates: bool = True) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Collapse duplicate jobs, keeping input order (first occurrence is the canonical job).
+
+    Same normalized (title, company, city) -> duplicates. Otherwise two jobs whose descriptions
+    have an estimated Jaccard >= NEAR_DUP_THRESHOLD (and whose titles mostly overlap) are
+    near-duplicates. Every output job carries `sources`, `duplicate_ids` and `urls`
+    (one source, no duplicate ids for a job that was not merged).
+    """
+    n = len(jobs)
+    uf = _UnionFind(n)
+    titles = [norm_title(j.get("title") or "") for j in jobs]
+
+    exact_pairs = 0
+    first_by_key: Dict[Tuple[str, str, str], int] = {}
+    for i, j in enumerate(jobs):
+        key = exact_key(j)
+        if key is None:
+            continue
+        if key in first_by_key:
+            uf.union(first_by_key[key], i)
+            exact_pairs += 1
+        else:
+            first_by_key[key] = i
+
+    near_pairs = 0
+    if near_duplicates and n > 1:
+        sigs = minhash_signatures([shingle_hashes(j.get("description") or "") for j in jobs])
+        valid = sigs[:, 0] != np.iinfo(np.uint64).max
+        rows = NUM_PERM // BANDS
+        for b in range(BANDS):
+            band = np.ascontiguousarray(sigs[:, b * rows:(b + 1) * rows])
+            buckets: Dict[bytes, List[int]] = {}
+            for i in np.flatnonzero(valid):
+                members = buckets.setdefault(band[i].tobytes(), [])
+                for other in members[-MAX_BUCKET_COMPARISONS:]:
+                    if uf.find(other) == uf.find(i):
+                        continue
+                    if _title_overlap(titles[other], titles[i]) < TITLE_MIN_OVERLAP:
+                        continue
+                    if float(np.mean(sigs[other] == sigs[i])) >= NEAR_DUP_THRESHOLD:
+                        uf.union(other, i)
+                        near_pairs += 1
+                members.append(int(i))
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(uf.find(i), []).append(i)
+    out = [_merge([jobs[i] for i in members]) if len(members) > 1 else _single(jobs[root]) for root, members in groups.items()]
+
+    return out, {
+        "count_in": n,
+        "count_out": len(out),
+        "duplicates_removed": n - len(out),
+        "exact_pairs": exact_pairs,
+        "near_pairs": near_pairs,
+    }
@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Optional, Dict, Any, List
 
-@dataclass
+@dataclass(slots=True)
 class JobCanonical:
     id: str
     source: str
@@ -14,4 +14,16 @@ class JobCanonical:
     employment_type: Optional[str] = None
     remote: Optional[bool] = None
     tags: Optional[List[str]] = None
-    raw: Optional[Dict[str, Any]] = None
\ No newline at end of file
+    location_area: Optional[List[str]] = None  # e.g. ["France", "Ile-de-France", "Paris"] (Adzuna)
+    # Upstream payload: server-side only (see server/canonical/raw_store.py), never in to_dict()
+    raw: Optional[Dict[str, Any]] = None
+
+    def to_dict(self, include_raw: bool = False) -> Dict[str, Any]:
+        out = {f.name: getattr(self, f.name) for f in JOB_FIELDS}
+        if include_raw:
+            out["raw"] = self.raw
+        return out
+
+
+JOB_FIELDS = tuple(f for f in fields(JobCanonical) if f.name != "raw")
+JOB_FIELD_NAMES = tuple(f.name for f in JOB_FIELDS)
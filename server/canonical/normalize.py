@@ -1,7 +1,6 @@
-from typing import Dict, Any
-from .job_model import JobCanonical
-from typing import Dict, Any
+from typing import Dict, Any, List
 from .job_model import JobCanonical
+from .raw_store import remember_raw
 
 def normalize_location(value: str) -> str:
     if not value:
@@ -17,6 +16,7 @@ def normalize_adzuna(job: Dict[str, Any]) -> JobCanonical:
     description = job.get("description") or ""
     url = job.get("redirect_url") or job.get("url") or ""
     posted_at = job.get("created") or job.get("created_at")
+    area = (job.get("location") or {}).get("area")
 
     return JobCanonical(
         id=f"adzuna:{jid}",
@@ -27,6 +27,7 @@ def normalize_adzuna(job: Dict[str, Any]) -> JobCanonical:
         description=description.strip(),
         url=url.strip(),
         posted_at=posted_at,
+        location_area=[str(a) for a in area if a] if isinstance(area, list) else None,
         raw=job,
     )
 
@@ -54,5 +55,18 @@ def normalize_remotive(job: Dict[str, Any]) -> JobCanonical:
         description=description.strip(),
         url=url.strip(),
         posted_at=posted_at,
+        tags=[str(t) for t in (job.get("tags") or [])],
         raw=job,
-    )
\ No newline at end of file
+    )
+
+
+def normalize_jobs(source: str, raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Raw upstream jobs of `source` -> compact JobCanonical dicts; payloads stay server-side (job_raw)."""
+    if source == "remotive":
+        jobs = [normalize_remotive(j) for j in raw]
+    elif source == "adzuna":
+        jobs = [normalize_adzuna(j) for j in raw]
+    else:
+        raise ValueError(f"Unknown source: {source}")
+    remember_raw(jobs)
+    return [j.to_dict() for j in jobs]
@@ -0,0 +1,34 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+from server.canonical.job_model import JobCanonical
+from server.config import RAW_STORE_MAX_ENTRIES, RAW_STORE_TTL_S
+from server.utils.cache import TTLCache
+
+# Upstream payloads of the normalized jobs, kept server-side: job id -> raw dict.
+# Responses carry the compact JobCanonical only; the job_raw tool returns these on demand.
+_RAW = TTLCache(max_entries=RAW_STORE_MAX_ENTRIES, ttl_s=RAW_STORE_TTL_S)
+
+
+def remember_raw(jobs: Iterable[JobCanonical]) -> None:
+    for j in jobs:
+        if j.id and j.raw is not None:
+            _RAW.set(j.id, j.raw)
+
+
+def get_raw(ids: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+    """(found {id: raw}, missing ids)."""
+    found: Dict[str, Any] = {}
+    missing: List[str] = []
+    for jid in ids:
+        raw = _RAW.get(jid)
+        if raw is None:
+            missing.append(jid)
+        else:
+            found[jid] = raw
+    return found, missing
+
+
+def raw_store_stats() -> Dict[str, Any]:
+    out = _RAW.stats()
+    out["ttl_s"] = RAW_STORE_TTL_S
+    return out
@@ -3,11 +3,125 @@ from dotenv import load_dotenv
 
 load_dotenv()  # reads .env if present
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID", "").strip()
 ADZUNA_APP_KEY = os.getenv("ADZUNA_APP_KEY", "").strip()
 
+# jobs_list fan-out: overall deadline for one request + per-source budgets (seconds).
+JOBS_LIST_DEADLINE_S = float(os.getenv("JOBS_LIST_DEADLINE_S", "30"))
+SOURCE_BUDGETS_S = {
+    "adzuna": float(os.getenv("ADZUNA_BUDGET_S", "25")),
+    "remotive": float(os.getenv("REMOTIVE_BUDGET_S", "20")),
+}
+FANOUT_MAX_WORKERS = int(os.getenv("FANOUT_MAX_WORKERS", "8"))
+
+# jobs_list: collapse duplicate / near-duplicate jobs across sources (server/canonical/dedup.py)
+JOBS_DEDUP = os.getenv("JOBS_DEDUP", "1").strip() not in ("0", "false", "no")
+
+# Compact job payloads: upstream raw dicts stay server-side (job_raw tool), descriptions clipped in jobs_list
+RAW_STORE_MAX_ENTRIES = int(os.getenv("RAW_STORE_MAX_ENTRIES", "5000"))
+RAW_STORE_TTL_S = float(os.getenv("RAW_STORE_TTL_S", "3600"))
+JOBS_LIST_DESCRIPTION_CHARS = int(os.getenv("JOBS_LIST_DESCRIPTION_CHARS", "300"))  # -1 = full description
+
+# Max jobs per source for jobs_list/jobs_fetch (Adzuna is paginated beyond 50)
+MAX_JOBS_LIMIT = int(os.getenv("MAX_JOBS_LIMIT", "1000"))
+ADZUNA_MAX_IN_FLIGHT = int(os.getenv("ADZUNA_MAX_IN_FLIGHT", "4"))  # concurrent page requests
+
+
+def _host_map(value: str) -> dict:
+    """Parse "host=value,host2=value2" into {host: float}."""
+    out = {}
+    for part in (value or "").split(","):
+        host, _, v = part.partition("=")
+        if host.strip() and v.strip():
+            out[host.strip().lower()] = float(v)
+    return out
+
+
+# Shared HTTP transport (server/utils/http.py)
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))  # keep-alive connections per host
+HTTP_POOL_SIZES = {h: int(n) for h, n in _host_map(os.getenv("HTTP_POOL_SIZES", "")).items()}
+HTTP_CONNECT_TIMEOUT_S = float(os.getenv("HTTP_CONNECT_TIMEOUT_S", "5"))
+HTTP_HOST_TIMEOUTS_S = _host_map(os.getenv("HTTP_HOST_TIMEOUTS", "api.adzuna.com=25,remotive.com=20"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_S = float(os.getenv("HTTP_BACKOFF_S", "0.5"))
+HTTP_RETRY_AFTER_MAX_S = float(os.getenv("HTTP_RETRY_AFTER_MAX_S", "10"))
+
+# Batch skill extraction: switch to a process pool from this batch size on
+EXTRACT_PROCESS_MIN_BATCH = int(os.getenv("EXTRACT_PROCESS_MIN_BATCH", "200"))
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", "0")) or (os.cpu_count() or 2)
+# Worker start method: never "fork" (the server is multi-threaded); forkserver where available
+EXTRACT_START_METHOD = os.getenv("EXTRACT_START_METHOD", "forkserver" if os.name == "posix" else "spawn")
+
+# Skill extraction memo (server/cv/skill_memo.py): text hash -> skills, job id -> skills
+SKILL_MEMO_MAX_ENTRIES = int(os.getenv("SKILL_MEMO_MAX_ENTRIES", "50000"))  # ~200 bytes per entry
+SKILL_MEMO_JOB_MAX_ENTRIES = int(os.getenv("SKILL_MEMO_JOB_MAX_ENTRIES", "50000"))
+SKILL_MEMO_JOB_TTL_S = float(os.getenv("SKILL_MEMO_JOB_TTL_S", "86400"))  # job ads get edited
+SKILL_MEMO_PATH = os.getenv("SKILL_MEMO_PATH", "").strip()  # e.g. data/cache/skill_memo.jsonl ; empty = memory only
+
+# Server-side graph store (graph_build -> graph_id handles)
+GRAPH_STORE_MAX_ENTRIES = int(os.getenv("GRAPH_STORE_MAX_ENTRIES", "64"))
+GRAPH_STORE_TTL_S = float(os.getenv("GRAPH_STORE_TTL_S", "1800"))
+PPR_BASIS_MAX_CELLS = int(os.getenv("PPR_BASIS_MAX_CELLS", "5000000"))  # cached PPR values per graph (jobs x skills)
+
+# Per-session job pools of match_pipeline (server/matching/pool_cache.py): fetched jobs + skills
+POOL_CACHE_MAX_ENTRIES = int(os.getenv("POOL_CACHE_MAX_ENTRIES", "128"))
+POOL_CACHE_TTL_S = float(os.getenv("POOL_CACHE_TTL_S", "900"))
+POOL_FETCH_MIN = int(os.getenv("POOL_FETCH_MIN", "100"))  # jobs per source fetched for a session pool
+
+# Multi-CV ranking (server/matching/batch_rank.py)
+BATCH_RANK_MAX_CVS = int(os.getenv("BATCH_RANK_MAX_CVS", "2000"))  # CVs per match_batch_rank call
+
+# Upstream response cache (server/connectors/cache.py)
+CACHE_ENABLED = os.getenv("JOBS_CACHE", "1").strip() not in ("0", "false", "no")
+CACHE_MAX_ENTRIES = int(os.getenv("JOBS_CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL_S = {
+    "adzuna": float(os.getenv("JOBS_CACHE_TTL_ADZUNA_S", "600")),
+    "remotive": float(os.getenv("JOBS_CACHE_TTL_REMOTIVE_S", "900")),
+}
+CACHE_STALE_S = float(os.getenv("JOBS_CACHE_STALE_S", "3600"))  # serve stale while refreshing
+CACHE_DIR = os.getenv("JOBS_CACHE_DIR", "").strip()  # e.g. data/cache/responses ; empty = memory only
+CACHE_DISK_MAX_ENTRIES = int(os.getenv("JOBS_CACHE_DISK_MAX_ENTRIES", "2000"))
+
+# Remotive snapshot mode: full feed fetched once per interval, queries answered locally
+REMOTIVE_SNAPSHOT = os.getenv("REMOTIVE_SNAPSHOT", "1").strip() not in ("0", "false", "no")
+REMOTIVE_SNAPSHOT_REFRESH_S = float(os.getenv("REMOTIVE_SNAPSHOT_REFRESH_S", "3600"))
+REMOTIVE_SNAPSHOT_PATH = os.getenv(
+    "REMOTIVE_SNAPSHOT_PATH", os.path.join(PROJECT_ROOT, "data", "cache", "remotive_snapshot.json")
+)
+
+# Local job store (server/connectors/job_store.py): SQLite + FTS5, every listed job is upserted
+JOB_STORE_ENABLED = os.getenv("JOB_STORE", "1").strip() not in ("0", "false", "no")
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", os.path.join(PROJECT_ROOT, "data", "cache", "jobs.sqlite3"))
+JOB_STORE_FRESH_S = float(os.getenv("JOB_STORE_FRESH_S", "1800"))  # re-query upstream after that (in background)
+JOB_STORE_REFRESH_LIMIT = int(os.getenv("JOB_STORE_REFRESH_LIMIT", "100"))  # jobs per source fetched by a refresh
+JOB_STORE_RANK_WINDOW = int(os.getenv("JOB_STORE_RANK_WINDOW", "2000"))  # recent matches ranked by relevance
+JOB_STORE_MAX_PENDING_WRITES = int(os.getenv("JOB_STORE_MAX_PENDING_WRITES", "64"))  # live listings queued for the writer
+
+# Background crawler (server/crawler.py): refreshes a grid of (query, location, source) searches
+CRAWLER_IN_SERVER = os.getenv("CRAWLER_IN_SERVER", "0").strip() in ("1", "true", "yes")  # thread of the MCP server
+CRAWLER_GRID_PATH = os.getenv("CRAWLER_GRID_PATH", "").strip()  # JSON grid; empty = the lists below
+CRAWLER_QUERIES = os.getenv("CRAWLER_QUERIES", "data analyst,data scientist,data engineer,business analyst,data")
+CRAWLER_LOCATIONS = os.getenv("CRAWLER_LOCATIONS", "Paris,Lyon")
+CRAWLER_SOURCES = os.getenv("CRAWLER_SOURCES", "adzuna,remotive")
+CRAWLER_INTERVAL_S = float(os.getenv("CRAWLER_INTERVAL_S", "3600"))  # every cell refreshed once per interval
+CRAWLER_LIMIT = int(os.getenv("CRAWLER_LIMIT", str(POOL_FETCH_MIN)))  # jobs per cell (= session pool fetch size)
+CRAWLER_RATES_PER_MIN = _host_map(os.getenv("CRAWLER_RATES_PER_MIN", "adzuna=10,remotive=2"))  # upstream requests/min
+
+# JSON-RPC server (server/mcp_server.py)
+MCP_THREADED = os.getenv("MCP_THREADED", "1").strip() not in ("0", "false", "no")
+MCP_MAX_CONCURRENCY = int(os.getenv("MCP_MAX_CONCURRENCY", "16"))  # requests executed at the same time
+MCP_QUEUE_WAIT_S = float(os.getenv("MCP_QUEUE_WAIT_S", "2"))  # wait for a free slot before answering 503
+MCP_RETRY_AFTER_S = int(os.getenv("MCP_RETRY_AFTER_S", "1"))
+MCP_KEEPALIVE_TIMEOUT_S = float(os.getenv("MCP_KEEPALIVE_TIMEOUT_S", "30"))  # idle keep-alive connections
+MCP_BATCH_WORKERS = int(os.getenv("MCP_BATCH_WORKERS", "8"))  # entries of one JSON-RPC batch run concurrently
+MCP_JSON_CODEC = os.getenv("MCP_JSON_CODEC", "auto").strip().lower()  # auto | orjson | msgspec | json
+MCP_GZIP_MIN_BYTES = int(os.getenv("MCP_GZIP_MIN_BYTES", "1024"))  # gzip responses from this size (-1 = never)
+MCP_GZIP_LEVEL = int(os.getenv("MCP_GZIP_LEVEL", "5"))
+
 def require_adzuna_keys():
     if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
         raise RuntimeError(
             "Clés Adzuna manquantes. Ajoute ADZUNA_APP_ID et ADZUNA_APP_KEY dans le fichier .env à la racine du projet."
-        )
\ No newline at end of file
+        )
@@ -1,13 +1,20 @@
+import math
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Dict, Iterator, List, Optional
+
 from server.utils.http import get_json
-from server.config import ADZUNA_APP_ID, ADZUNA_APP_KEY, require_adzuna_keys
+from server.config import ADZUNA_APP_ID, ADZUNA_APP_KEY, ADZUNA_MAX_IN_FLIGHT, require_adzuna_keys
 
-# Adzuna endpoint (France). Page=1
-ADZUNA_URL = "https://api.adzuna.com/v1/api/jobs/fr/search/1"
+# Adzuna endpoint (France), paginated: /search/<page>
+ADZUNA_SEARCH_URL = "https://api.adzuna.com/v1/api/jobs/fr/search/{page}"
+ADZUNA_PAGE_SIZE = 50  # max results_per_page accepted by Adzuna
 
-def fetch_adzuna_jobs(query: str, location: str = "Paris", limit: int = 10) -> list[dict]:
-    """
-    Fetch raw jobs from Adzuna.
-    """
+_PAGE_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, ADZUNA_MAX_IN_FLIGHT), thread_name_prefix="adzuna-pages")
+
+
+def fetch_adzuna_page(query: str, location: str, page: int, per_page: int = ADZUNA_PAGE_SIZE, timeout: float = 25) -> dict:
+    """Fetch one raw Adzuna result page ({"count": total, "results": [...]})."""
     require_adzuna_keys()
 
     params = {
@@ -15,10 +22,90 @@ def fetch_adzuna_jobs(query: str, location: str = "Paris", limit: int = 10) -> l
         "app_key": ADZUNA_APP_KEY,
         "what": query,
         "where": location,
-        "results_per_page": limit,
+        "results_per_page": per_page,
         "content-type": "application/json",
     }
+    return get_json(ADZUNA_SEARCH_URL.format(page=page), params=params, timeout=timeout)
+
+
+def iter_adzuna_pages(
+    query: str,
+    location: str = "Paris",
+    max_results: int = ADZUNA_PAGE_SIZE,
+    per_page: int = ADZUNA_PAGE_SIZE,
+    max_in_flight: int = ADZUNA_MAX_IN_FLIGHT,
+    deadline_s: Optional[float] = None,
+    errors: Optional[List[str]] = None,
+) -> Iterator[list[dict]]:
+    """
+    Lazily yield Adzuna result pages, in page order.
+
+    Page 1 is fetched first (it tells how many results exist); the following pages are
+    fetched concurrently, at most `max_in_flight` ahead of the consumer. Iteration stops
+    once `max_results` jobs were yielded, a short page is returned, or `deadline_s`
+    (overall, seconds) is exhausted. Closing the generator cancels pages not started yet.
+
+    Page 1 failing raises; a later page failing ends the iteration (the pages already
+    yielded stay valid) and the error is appended to `errors`.
+    """
+    per_page = max(1, min(ADZUNA_PAGE_SIZE, int(per_page)))
+    t0 = time.monotonic()
+
+    def remaining() -> float:
+        return (deadline_s - (time.monotonic() - t0)) if deadline_s else 25.0
+
+    first = fetch_adzuna_page(query, location, 1, per_page, timeout=remaining())
+    results = first.get("results", [])
+    yielded = len(results)
+    yield results
+    if len(results) < per_page or yielded >= max_results:
+        return
+
+    total = min(int(first.get("count") or 0) or max_results, max_results)
+    last_page = math.ceil(total / per_page)
+    pending: Dict[int, Future] = {}
+    next_page = 2
+    try:
+        for page in range(2, last_page + 1):
+            while next_page <= last_page and len(pending) < max(1, max_in_flight):
+                pending[next_page] = _PAGE_EXECUTOR.submit(
+                    fetch_adzuna_page, query, location, next_page, per_page, remaining()
+                )
+                next_page += 1
+
+            left = remaining()
+            if left <= 0:
+                return
+            try:
+                results = pending.pop(page).result(timeout=left).get("results", [])
+            except FuturesTimeout:
+                return  # deadline reached: keep what was already yielded
+            except Exception as e:
+                if errors is not None:
+                    errors.append(f"page {page}: {e}")
+                return
+            yielded += len(results)
+            yield results
+            if len(results) < per_page or yielded >= max_results:
+                return
+    finally:
+        for fut in pending.values():
+            fut.cancel()
+
+
+def fetch_adzuna_jobs(
+    query: str, location: str = "Paris", limit: int = 10, timeout: float = 25, errors: Optional[List[str]] = None
+) -> list[dict]:
+    """
+    Fetch raw jobs from Adzuna (paginated when `limit` exceeds one page).
+    `timeout` is the overall budget for all pages; failed later pages are reported in `errors`.
+    """
+    if limit <= ADZUNA_PAGE_SIZE:
+        data = fetch_adzuna_page(query, location, 1, per_page=limit, timeout=timeout)
+        # Adzuna returns {"results": [...]}
+        return data.get("results", [])[:limit]
 
-    data = get_json(ADZUNA_URL, params=params, timeout=25)
-    # Adzuna returns {"results": [...]}
-    return data.get("results", [])[:limit]
\ No newline at end of file
+    jobs: list[dict] = []
+    for page in iter_adzuna_pages(query, location, max_results=limit, deadline_s=timeout, errors=errors):
+        jobs.extend(page)
+    return jobs[:limit]
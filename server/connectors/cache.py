@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+from server.config import (
+    CACHE_DIR,
+    CACHE_DISK_MAX_ENTRIES,
+    CACHE_ENABLED,
+    CACHE_MAX_ENTRIES,
+    CACHE_STALE_S,
+    CACHE_TTL_S,
+)
+from server.utils.cache import FRESH, STALE, TTLCache
+
+DEFAULT_TTL_S = 600.0
+
+_MEMORY = TTLCache(max_entries=CACHE_MAX_ENTRIES, ttl_s=DEFAULT_TTL_S, stale_s=CACHE_STALE_S)
+_REFRESHER = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+_refreshing: Set[str] = set()
+_lock = threading.Lock()
+_counters: Dict[str, int] = {"disk_hits": 0, "disk_writes": 0, "disk_evictions": 0, "refreshes": 0, "refresh_errors": 0}
+
+
+def _norm(v: Any) -> str:
+    return re.sub(r"\s+", " ", str(v or "").strip().lower())
+
+
+def cache_key(source: str, **params: Any) -> str:
+    """Stable key on normalized request parameters (case/whitespace-insensitive)."""
+    parts = [f"{k}={_norm(params[k])}" for k in sorted(params)]
+    return f"{_norm(source)}|" + "|".join(parts)
+
+
+def _ttl(source: str) -> float:
+    return float(CACHE_TTL_S.get(source, DEFAULT_TTL_S))
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _lock:
+        _counters[key] += n
+
+
+# ---- Disk tier (optional) ----
+
+def _disk_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+
+def _disk_read(key: str) -> Optional[Dict[str, Any]]:
+    if not CACHE_DIR:
+        return None
+    try:
+        with open(_disk_path(key), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("key") == key else None
+
+
+def _disk_write(key: str, value: Any) -> None:
+    if not CACHE_DIR:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = _disk_path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "stored_at": time.time(), "value": value}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        _count("disk_writes")
+        _disk_evict()
+    except OSError:
+        pass
+
+
+def _disk_evict() -> None:
+    """Keep the disk tier bounded: drop the oldest files beyond CACHE_DISK_MAX_ENTRIES."""
+    try:
+        files = [os.path.join(CACHE_DIR, n) for n in os.listdir(CACHE_DIR) if n.endswith(".json")]
+    except OSError:
+        return
+    if len(files) <= CACHE_DISK_MAX_ENTRIES:
+        return
+    files.sort(key=lambda p: os.path.getmtime(p))
+    for p in files[: len(files) - CACHE_DISK_MAX_ENTRIES]:
+        try:
+            os.remove(p)
+            _count("disk_evictions")
+        except OSError:
+            pass
+
+
+# ---- Stale-while-revalidate ----
+
+def _store(source: str, key: str, value: Any) -> None:
+    _MEMORY.set(key, value, ttl_s=_ttl(source))
+    _disk_write(key, value)
+
+
+def _refresh_in_background(source: str, key: str, loader: Callable[[], Any]) -> None:
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run() -> None:
+        try:
+            _store(source, key, loader())
+            _count("refreshes")
+        except Exception:
+            _count("refresh_errors")
+        finally:
+            with _lock:
+                _refreshing.discard(key)
+
+    _REFRESHER.submit(run)
+
+
+def cached_fetch(source: str, key: str, loader: Callable[[], Any], refresher: Optional[Callable[[], Any]] = None) -> Any:
+    """
+    Return the cached upstream response for `key`, calling `loader()` on a miss.
+
+    Lookup order: memory LRU -> disk tier -> upstream. A stale entry (expired but within
+    JOBS_CACHE_STALE_S) is returned immediately while a background refresh runs with
+    `refresher` (default: `loader`), which is not bound to the caller's deadline.
+    """
+    if not CACHE_ENABLED:
+        return loader()
+
+    value, state = _MEMORY.lookup(key)
+    if state == FRESH:
+        return value
+    refresher = refresher or loader
+    if state == STALE:
+        _refresh_in_background(source, key, refresher)
+        return value
+
+    entry = _disk_read(key)
+    if entry is not None:
+        age = time.time() - float(entry.get("stored_at") or 0)
+        ttl = _ttl(source)
+        if age < ttl + CACHE_STALE_S:
+            _count("disk_hits")
+            _MEMORY.set(key, entry["value"], ttl_s=ttl - age)
+            if age >= ttl:
+                _refresh_in_background(source, key, refresher)
+            return entry["value"]
+
+    value = loader()
+    _store(source, key, value)
+    return value
+
+
+def cache_put(source: str, key: str, value: Any) -> None:
+    """Store a response fetched elsewhere (e.g. by the crawler) as fresh."""
+    if CACHE_ENABLED:
+        _store(source, key, value)
+
+
+def cache_drop(key: str) -> None:
+    """Forget a response (e.g. a partial one that must not be served until the TTL ends)."""
+    _MEMORY.pop(key)
+    if CACHE_DIR:
+        try:
+            os.remove(_disk_path(key))
+        except OSError:
+            pass
+
+
+def cache_stats() -> Dict[str, Any]:
+    out = _MEMORY.stats()
+    with _lock:
+        out.update(_counters)
+        out["refreshing"] = len(_refreshing)
+    out["enabled"] = CACHE_ENABLED
+    out["disk_dir"] = CACHE_DIR or None
+    out["ttl_s"] = dict(CACHE_TTL_S)
+    return out
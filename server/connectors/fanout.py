@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from server.config import FANOUT_MAX_WORKERS
+
+# Shared pool: a source that misses its budget keeps running in the background
+# (its own HTTP timeout bounds it) but never blocks the response.
+_EXECUTOR = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="fanout")
+
+
+@dataclass
+class FanoutResult:
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    elapsed_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def fan_out(
+    tasks: Dict[str, Callable[[float], Any]],
+    deadline_s: float,
+    budgets: Optional[Dict[str, float]] = None,
+) -> FanoutResult:
+    """
+    Run one task per source concurrently and collect what finishes in time.
+
+    Each task receives its effective budget in seconds (min of the source budget and
+    the overall deadline) so it can align its own network timeout with it.
+    A source that misses its budget is reported in `timed_out` / `errors`; results
+    of the other sources are returned anyway (partial results).
+    """
+    budgets = budgets or {}
+    out = FanoutResult()
+    t0 = time.monotonic()
+
+    limits: Dict[str, float] = {}
+    pending: Dict[Future, str] = {}
+    for name, task in tasks.items():
+        budget = min(float(budgets.get(name, deadline_s)), float(deadline_s))
+        limits[name] = t0 + budget
+        pending[_EXECUTOR.submit(task, budget)] = name
+
+    while pending:
+        now = time.monotonic()
+        # Drop sources whose budget is exhausted
+        for fut, name in list(pending.items()):
+            if now >= limits[name] and not fut.done():
+                fut.cancel()
+                out.timed_out.append(name)
+                out.errors[name] = TimeoutError(f"{name}: no response within {limits[name] - t0:.1f}s")
+                out.elapsed_ms[name] = round((now - t0) * 1000, 1)
+                del pending[fut]
+        if not pending:
+            break
+
+        next_limit = min(limits[n] for n in pending.values())
+        done, _ = wait(list(pending), timeout=max(0.0, next_limit - now), return_when=FIRST_COMPLETED)
+        for fut in done:
+            name = pending.pop(fut)
+            out.elapsed_ms[name] = round((time.monotonic() - t0) * 1000, 1)
+            try:
+                out.results[name] = fut.result()
+            except Exception as e:
+                out.errors[name] = e
+
+    return out
@@ -0,0 +1,336 @@
+import hashlib
+import html
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from server.config import JOB_STORE_MAX_PENDING_WRITES, JOB_STORE_PATH, JOB_STORE_RANK_WINDOW
+
+# Sources whose upstream search honours `location` (Remotive is remote-only and ignores it)
+LOCATION_SOURCES = {"adzuna"}
+ORDERS = ("relevance", "recent")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"\w+")
+_UPSERT_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    pk INTEGER PRIMARY KEY,          -- stable rowid, referenced by the FTS index
+    id TEXT NOT NULL UNIQUE,         -- "<source>:<upstream id>"
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT NOT NULL,
+    location_text TEXT NOT NULL,     -- location + Adzuna area (country, region...), for filtering
+    description TEXT NOT NULL,       -- plain text (HTML stripped), indexed
+    posted_at TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL               -- normalized job as returned by jobs_list (JSON)
+);
+CREATE INDEX IF NOT EXISTS jobs_source_pk ON jobs(source, pk);
+CREATE INDEX IF NOT EXISTS jobs_posted_at ON jobs(posted_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, description,
+    content='jobs', content_rowid='pk',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, description) VALUES (new.pk, new.title, new.company, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description) VALUES ('delete', old.pk, old.title, old.company, old.description);
+END;
+-- Re-index only when the content changed (a re-seen job just bumps last_seen)
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF content_hash ON jobs WHEN old.content_hash IS NOT new.content_hash BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description) VALUES ('delete', old.pk, old.title, old.company, old.description);
+    INSERT INTO jobs_fts(rowid, title, company, description) VALUES (new.pk, new.title, new.company, new.description);
+END;
+
+CREATE TABLE IF NOT EXISTS refreshes (
+    key TEXT PRIMARY KEY,            -- source|query|location of an upstream search
+    refreshed_at REAL NOT NULL,
+    count INTEGER NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO jobs (id, source, title, company, location, location_text, description, posted_at,
+                  first_seen, last_seen, content_hash, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    source = excluded.source, title = excluded.title, company = excluded.company,
+    location = excluded.location, location_text = excluded.location_text,
+    description = excluded.description, posted_at = excluded.posted_at,
+    last_seen = excluded.last_seen, content_hash = excluded.content_hash, data = excluded.data
+"""
+
+
+def plain_text(text: str) -> str:
+    return re.sub(r"\s+", " ", html.unescape(_TAG_RE.sub(" ", text or ""))).strip()
+
+
+def fts_query(query: str) -> str:
+    """Free text -> FTS5 expression: every word must match (quoted, so no FTS syntax leaks in)."""
+    return " ".join(f'"{t}"' for t in dict.fromkeys(_TOKEN_RE.findall((query or "").lower())))
+
+
+def location_text(job: Dict[str, Any]) -> str:
+    loc = str(job.get("location") or "")
+    area = job.get("location_area")
+    if isinstance(area, list) and area:
+        loc = " ".join(str(a) for a in area if a) + " " + loc
+    return loc.strip()
+
+
+def refresh_key(source: str, query: str, location: str) -> str:
+    loc = location if source in LOCATION_SOURCES else ""
+    return "|".join([source, " ".join(_TOKEN_RE.findall((query or "").lower())), (loc or "").strip().lower()])
+
+
+def _content_hash(job: Dict[str, Any]) -> str:
+    parts = [str(job.get(k) or "") for k in ("title", "company", "location", "description", "url", "posted_at")]
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class JobStore:
+    """
+    Every normalized job seen by jobs_list, in SQLite (WAL) with an FTS5 index on
+    title/company/description.
+
+    Upserts are keyed on the job id: first_seen is kept, last_seen/posted_at/content are
+    updated, and the full-text index is only rewritten when the content hash changed.
+    One connection per thread (readers never block in WAL mode); writes are serialized.
+    """
+
+    def __init__(self, path: str = JOB_STORE_PATH, rank_window: int = JOB_STORE_RANK_WINDOW):
+        self.path = path
+        self.rank_window = max(1, int(rank_window))
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store-refresh")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store-write")
+        self._pending_writes = 0
+        self.counters: Dict[str, int] = {
+            "inserted": 0, "updated": 0, "unchanged": 0, "searches": 0, "refreshes": 0, "refresh_errors": 0,
+            "writes_dropped": 0, "write_errors": 0,
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += n
+
+    # ---- write ----
+
+    def upsert(self, jobs: Iterable[Dict[str, Any]], seen_at: Optional[float] = None) -> Dict[str, int]:
+        """
+        Insert or update jobs by id, in one transaction per chunk.
+
+        Returns inserted/updated/unchanged counts and `changed_ids` (inserted or updated),
+        i.e. the jobs whose derived data (skills...) has to be recomputed.
+        """
+        now = time.time() if seen_at is None else seen_at
+        rows = {}
+        for j in jobs:
+            if j.get("id"):
+                rows[str(j["id"])] = j  # last occurrence wins
+        out = {"inserted": 0, "updated": 0, "unchanged": 0}
+        changed: List[str] = []
+        items = list(rows.items())
+        conn = self._conn()
+        with self._write_lock:
+            for start in range(0, len(items), _UPSERT_CHUNK):
+                chunk = items[start:start + _UPSERT_CHUNK]
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    marks = ",".join("?" * len(chunk))
+                    known = dict(conn.execute(f"SELECT id, content_hash FROM jobs WHERE id IN ({marks})", [k for k, _ in chunk]))
+                    params = []
+                    seen = []
+                    for jid, j in chunk:
+                        h = _content_hash(j)
+                        if known.get(jid) == h:
+                            # Same content: only bump last_seen (no row rewrite, no re-index)
+                            out["unchanged"] += 1
+                            seen.append((now, jid))
+                            continue
+                        out["inserted" if jid not in known else "updated"] += 1
+                        changed.append(jid)
+                        params.append((
+                            jid, str(j.get("source") or ""), str(j.get("title") or ""), str(j.get("company") or ""),
+                            str(j.get("location") or ""), location_text(j), plain_text(j.get("description") or ""),
+                            j.get("posted_at"), now, now, h, json.dumps(j, ensure_ascii=False),
+                        ))
+                    conn.executemany(_UPSERT, params)
+                    conn.executemany("UPDATE jobs SET last_seen = ? WHERE id = ?", seen)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        for k, n in out.items():
+            self._count(k, n)
+        return dict(out, changed_ids=changed)
+
+    def upsert_in_background(self, jobs: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Queue an upsert on the writer thread, so a live listing never waits on disk.
+        False (batch dropped) when JOB_STORE_MAX_PENDING_WRITES batches are already queued.
+        """
+        with self._lock:
+            if self._pending_writes >= JOB_STORE_MAX_PENDING_WRITES:
+                self.counters["writes_dropped"] += 1
+                return False
+            self._pending_writes += 1
+        items = [dict(j) for j in jobs]  # callers keep working on their dicts
+
+        def run() -> None:
+            try:
+                self.upsert(items)
+            except Exception:
+                self._count("write_errors")
+            finally:
+                with self._lock:
+                    self._pending_writes -= 1
+
+        self._writer.submit(run)
+        return True
+
+    def mark_refreshed(self, source: str, query: str, location: str, count: int) -> None:
+        with self._write_lock:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO refreshes (key, refreshed_at, count) VALUES (?, ?, ?)",
+                (refresh_key(source, query, location), time.time(), int(count)),
+            )
+
+    def refresh_age(self, source: str, query: str, location: str) -> Optional[float]:
+        """Seconds since the upstream search was last stored, None if never."""
+        row = self._conn().execute(
+            "SELECT refreshed_at FROM refreshes WHERE key = ?", (refresh_key(source, query, location),)
+        ).fetchone()
+        return time.time() - row[0] if row else None
+
+    def refresh_in_background(self, key: str, fn: Callable[[], Any]) -> bool:
+        """Run `fn` (an upstream search that upserts) once at a time per key. False if already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def run() -> None:
+            try:
+                fn()
+                self._count("refreshes")
+            except Exception:
+                self._count("refresh_errors")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(run)
+        return True
+
+    # ---- read ----
+
+    def search(
+        self,
+        query: str,
+        source: str,
+        location: str = "",
+        limit: int = 10,
+        posted_since: Optional[str] = None,
+        order: str = "relevance",
+    ) -> List[Dict[str, Any]]:
+        """
+        Jobs of `source` matching every word of `query` (title/company/description).
+
+        order="relevance": BM25 with the title weighted first, among the JOB_STORE_RANK_WINDOW
+        most recently discovered matches; "recent": last discovered first (index order, stops
+        after `limit` matches). `location` filters only the sources whose
+        upstream search honours it; `posted_since` is an ISO date/datetime prefix.
+        """
+        where = ["j.source = ?"]
+        params: List[Any] = [source]
+        if location and source in LOCATION_SOURCES:
+            where.append("j.location_text LIKE ?")
+            params.append(f"%{location.strip()}%")
+        if posted_since:
+            where.append("j.posted_at >= ?")
+            params.append(posted_since)
+
+        match = fts_query(query)
+        if match and order == "relevance":
+            # BM25 (title first) over the `rank_window` most recently discovered matches: a
+            # common word matches a large part of the store, ranking them all would be O(matches).
+            sql = (
+                "SELECT j.data FROM ("
+                "SELECT f.rowid AS pk, bm25(jobs_fts, 10.0, 2.0, 1.0) AS score FROM jobs_fts f JOIN jobs j ON j.pk = f.rowid "
+                f"WHERE jobs_fts MATCH ? AND {' AND '.join(where)} ORDER BY f.rowid DESC LIMIT ?"
+                ") r JOIN jobs j ON j.pk = r.pk ORDER BY r.score LIMIT ?"
+            )
+            params = [match] + params + [max(int(limit), self.rank_window)]
+        elif match:
+            sql = (
+                "SELECT j.data FROM jobs_fts f JOIN jobs j ON j.pk = f.rowid "
+                f"WHERE jobs_fts MATCH ? AND {' AND '.join(where)} ORDER BY f.rowid DESC LIMIT ?"
+            )
+            params = [match] + params
+        else:
+            sql = f"SELECT j.data FROM jobs j WHERE {' AND '.join(where)} ORDER BY j.pk DESC LIMIT ?"
+        params.append(int(limit))
+
+        self._count("searches")
+        return [json.loads(row[0]) for row in self._conn().execute(sql, params)]
+
+    def count(self) -> int:
+        return int(self._conn().execute("SELECT COUNT(*) FROM jobs").fetchone()[0])
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        by_source = dict(conn.execute("SELECT source, COUNT(*) FROM jobs GROUP BY source"))
+        with self._lock:
+            out: Dict[str, Any] = dict(self.counters)
+            out["refreshing"] = len(self._refreshing)
+            out["pending_writes"] = self._pending_writes
+        out.update({
+            "path": self.path,
+            "jobs": sum(by_source.values()),
+            "jobs_by_source": by_source,
+            "searches_stored": int(conn.execute("SELECT COUNT(*) FROM refreshes").fetchone()[0]),
+            "size_bytes": sum(os.path.getsize(p) for p in (self.path, self.path + "-wal") if os.path.exists(p)),
+        })
+        return out
+
+
+_STORE: Optional[JobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    global _STORE
+    with _store_lock:
+        if _STORE is None:
+            _STORE = JobStore()
+        return _STORE
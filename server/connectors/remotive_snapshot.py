@@ -0,0 +1,188 @@
+import html
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from server.canonical.normalize import normalize_remotive
+from server.config import REMOTIVE_SNAPSHOT_PATH, REMOTIVE_SNAPSHOT_REFRESH_S
+from server.connectors.remotive import REMOTIVE_API
+from server.utils.http import get_json
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, HTML tags/entities stripped (Remotive descriptions are HTML)."""
+    text = html.unescape(_TAG_RE.sub(" ", text or ""))
+    return _TOKEN_RE.findall(text.lower())
+
+
+class RemotiveSnapshot:
+    """
+    Full Remotive feed kept in memory (and on disk), searched through an inverted index.
+
+    The feed is downloaded once per refresh interval instead of once per query; queries
+    are answered locally (AND over title/description/tags tokens), which turns a network
+    round-trip into a dictionary lookup.
+    """
+
+    def __init__(self, path: str = REMOTIVE_SNAPSHOT_PATH, refresh_s: float = REMOTIVE_SNAPSHOT_REFRESH_S):
+        self.path = path
+        self.refresh_s = refresh_s
+        self.fetched_at = 0.0
+        self._jobs: List[Dict[str, Any]] = []
+        self._raw: Dict[str, Any] = {}  # job id -> upstream payload (not part of search results)
+        self._title_tokens: List[Set[str]] = []
+        self._index: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="remotive-snapshot")
+
+    # ---- build / persist ----
+
+    def _install(self, jobs: List[Dict[str, Any]], fetched_at: float, raw: Optional[Dict[str, Any]] = None) -> None:
+        raw = dict(raw or {})
+        # Older snapshot files embed the payload in each job: move it aside
+        for j in jobs:
+            if "raw" in j:
+                raw.setdefault(j.get("id"), j.pop("raw"))
+        # Newest first, so posting lists are already in recency order
+        jobs = sorted(jobs, key=lambda j: j.get("posted_at") or "", reverse=True)
+        index: Dict[str, Set[int]] = {}
+        title_tokens: List[Set[str]] = []
+        for i, j in enumerate(jobs):
+            title = set(tokenize(j.get("title") or ""))
+            title_tokens.append(title)
+            tokens = title | set(tokenize(j.get("description") or ""))
+            for tag in j.get("tags") or []:
+                tokens.update(tokenize(str(tag)))
+            for tok in tokens:
+                index.setdefault(tok, set()).add(i)
+
+        with self._lock:
+            self._jobs = jobs
+            self._raw = raw
+            self._title_tokens = title_tokens
+            self._index = {tok: sorted(ids) for tok, ids in index.items()}
+            self.fetched_at = fetched_at
+
+    def load(self) -> bool:
+        if not self.path:
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self._install(data.get("jobs") or [], float(data.get("fetched_at") or 0), data.get("raw"))
+        return True
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": self.fetched_at, "jobs": self._jobs, "raw": self._raw}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def refresh(self, timeout: Optional[float] = None) -> int:
+        """Download the full feed, normalize it and rebuild the index. Returns job count."""
+        data = get_json(REMOTIVE_API, params={}, timeout=timeout)
+        normalized = [normalize_remotive(j) for j in data.get("jobs", [])]
+        self._install([n.to_dict() for n in normalized], time.time(), {n.id: n.raw for n in normalized})
+        self._save()
+        return len(normalized)
+
+    def _refresh_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self.refresh()
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        self._executor.submit(run)
+
+    def ensure_ready(self, timeout: Optional[float] = None) -> None:
+        """Load from disk / fetch on first use; refresh in the background once stale."""
+        if not self._jobs:
+            with self._load_lock:
+                if not self._jobs:
+                    self.load()
+                if not self._jobs:
+                    self.refresh(timeout=timeout)
+        elif time.time() - self.fetched_at > self.refresh_s:
+            self._refresh_background()
+
+    # ---- query ----
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """All query tokens must match; title matches rank first, then most recent."""
+        with self._lock:
+            jobs, index, title_tokens = self._jobs, self._index, self._title_tokens
+
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return [dict(j) for j in jobs[:limit]]
+
+        postings = sorted((index.get(t, []) for t in tokens), key=len)
+        if not postings[0]:
+            return []
+        hits = set(postings[0])
+        for p in postings[1:]:
+            hits.intersection_update(p)
+            if not hits:
+                return []
+
+        ranked = sorted(hits, key=lambda i: (-sum(1 for t in tokens if t in title_tokens[i]), i))
+        return [dict(jobs[i]) for i in ranked[:limit]]
+
+    def raw(self, ids: List[str]) -> Dict[str, Any]:
+        """Upstream payloads of the given job ids (those present in the snapshot)."""
+        with self._lock:
+            return {i: self._raw[i] for i in ids if i in self._raw}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "jobs": len(self._jobs),
+            "tokens": len(self._index),
+            "fetched_at": self.fetched_at or None,
+            "age_s": round(time.time() - self.fetched_at, 1) if self.fetched_at else None,
+            "refresh_s": self.refresh_s,
+        }
+
+
+_SNAPSHOT: Optional[RemotiveSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot() -> RemotiveSnapshot:
+    global _SNAPSHOT
+    with _snapshot_lock:
+        if _SNAPSHOT is None:
+            _SNAPSHOT = RemotiveSnapshot()
+        return _SNAPSHOT
+
+
+def search_remotive_snapshot(query: str, limit: int = 10, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Normalized Remotive jobs matching `query`, answered from the local snapshot."""
+    snap = get_snapshot()
+    snap.ensure_ready(timeout=timeout)
+    return snap.search(query, limit=limit)
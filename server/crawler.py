@@ -0,0 +1,270 @@
+import json
+import math
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from server.config import (
+    CRAWLER_GRID_PATH,
+    CRAWLER_INTERVAL_S,
+    CRAWLER_LIMIT,
+    CRAWLER_LOCATIONS,
+    CRAWLER_QUERIES,
+    CRAWLER_RATES_PER_MIN,
+    CRAWLER_SOURCES,
+    REMOTIVE_SNAPSHOT,
+)
+from server.canonical.normalize import normalize_jobs
+from server.connectors.adzuna import ADZUNA_PAGE_SIZE
+from server.connectors.cache import cache_put
+from server.connectors.job_store import get_job_store, refresh_key
+from server.connectors.remotive_snapshot import search_remotive_snapshot
+from server.cv.extract_skills import job_text
+from server.cv.skill_memo import extract_skills_memo_batch
+from server.mcp import tools
+
+# Background crawler: keeps a grid of (query, location, source) searches fresh, so that
+# interactive requests (jobs_list, match_pipeline) are answered from warm caches.
+#
+# Each cell is refreshed once per CRAWLER_INTERVAL_S, at a stable offset inside the interval
+# (load spread evenly, same slots across restarts), through a per-source token bucket.
+# A refresh upserts the jobs in the job store, extracts skills only for new/changed jobs and
+# stores the upstream response in the response cache.
+#
+# In the MCP server (CRAWLER_IN_SERVER=1) every cache tier is warmed. As a separate process
+# (python -m server.crawler [--once]) it warms the shared tiers: job store (jobs_list mode=store),
+# JOBS_CACHE_DIR and SKILL_MEMO_PATH.
+
+
+def _split(value: str) -> List[str]:
+    return [p.strip() for p in (value or "").split(",") if p.strip()]
+
+
+def load_grid(path: str = CRAWLER_GRID_PATH) -> List[Dict[str, str]]:
+    """
+    Grid cells [{"query", "location", "source"}].
+
+    From a JSON file ({"cells": [...]} and/or {"queries", "locations", "sources"} lists),
+    else from CRAWLER_QUERIES x CRAWLER_LOCATIONS x CRAWLER_SOURCES. Cells that are the same
+    upstream search (Remotive ignores the location) are kept once.
+    """
+    data: Dict[str, Any] = {}
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        data = {"queries": _split(CRAWLER_QUERIES), "locations": _split(CRAWLER_LOCATIONS), "sources": _split(CRAWLER_SOURCES)}
+
+    cells = [dict(c) for c in data.get("cells") or []]
+    for q in data.get("queries") or []:
+        for loc in data.get("locations") or []:
+            for s in data.get("sources") or []:
+                cells.append({"query": q, "location": loc, "source": s})
+
+    out: Dict[str, Dict[str, str]] = {}
+    for c in cells:
+        source = str(c.get("source") or "").strip().lower()
+        if source not in tools.SUPPORTED_SOURCES:
+            raise ValueError(f"Unsupported source in crawler grid: {source}")
+        cell = {"query": str(c.get("query") or "").strip(), "location": str(c.get("location") or "").strip(), "source": source}
+        out.setdefault(refresh_key(source, cell["query"], cell["location"]), cell)
+    return list(out.values())
+
+
+class TokenBucket:
+    """`rate_per_s` tokens per second, up to `burst` saved; a request costing more than the burst runs into debt."""
+
+    def __init__(self, rate_per_s: float, burst: float = 1.0):
+        self.rate_per_s = max(1e-6, float(rate_per_s))
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: float = 1.0, stop: Optional[threading.Event] = None) -> bool:
+        """Block until `cost` tokens are available; False if `stop` was set meanwhile."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_per_s)
+                self.updated = now
+                if self.tokens >= min(cost, self.burst):
+                    self.tokens -= cost
+                    return True
+                wait = (min(cost, self.burst) - self.tokens) / self.rate_per_s
+            if stop is not None:
+                if stop.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+def fetch_cell(source: str, query: str, location: str, limit: int) -> List[Dict[str, Any]]:
+    """Fresh normalized jobs of one search; the raw response replaces the cached one."""
+    if source == "remotive" and REMOTIVE_SNAPSHOT:
+        return search_remotive_snapshot(query, limit=limit)
+    raw = tools.fetch_upstream(source, query, location, limit)
+    cache_put(source, tools.fetch_key(source, query, location, limit), raw)
+    return normalize_jobs(source, raw)
+
+
+def request_cost(source: str, limit: int) -> int:
+    """Upstream requests made by one refresh (Adzuna pages; the Remotive feed is one call)."""
+    if source == "adzuna":
+        return max(1, math.ceil(limit / ADZUNA_PAGE_SIZE))
+    return 1
+
+
+class Crawler:
+    def __init__(
+        self,
+        cells: List[Dict[str, str]],
+        interval_s: float = CRAWLER_INTERVAL_S,
+        limit: int = CRAWLER_LIMIT,
+        rates_per_min: Optional[Dict[str, float]] = None,
+        fetch: Callable[[str, str, str, int], List[Dict[str, Any]]] = fetch_cell,
+    ):
+        self.cells = cells
+        self.interval_s = max(1.0, float(interval_s))
+        self.limit = int(limit)
+        self.fetch = fetch
+        rates = CRAWLER_RATES_PER_MIN if rates_per_min is None else rates_per_min
+        self.buckets = {s: TokenBucket(float(rates.get(s, 1.0)) / 60.0) for s in tools.SUPPORTED_SOURCES}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.state: Dict[str, Dict[str, Any]] = {
+            self.key(c): {"cell": c, "runs": 0, "errors": 0, "last_run": None, "last_error": None, "last": None}
+            for c in cells
+        }
+
+    @staticmethod
+    def key(cell: Dict[str, str]) -> str:
+        return refresh_key(cell["source"], cell["query"], cell["location"])
+
+    def phase_s(self, cell: Dict[str, str]) -> float:
+        """Stable offset of the cell inside the interval (hash of the cell)."""
+        return (zlib.crc32(self.key(cell).encode("utf-8")) % 10_000) / 10_000 * self.interval_s
+
+    # ---- one refresh ----
+
+    def crawl_cell(self, cell: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        source, query, location = cell["source"], cell["query"], cell["location"]
+        if not self.buckets[source].acquire(request_cost(source, self.limit), stop=self._stop):
+            return None
+        st = self.state[self.key(cell)]
+        t0 = time.perf_counter()
+        try:
+            jobs = self.fetch(source, query, location, self.limit)
+            store = get_job_store()
+            diff = store.upsert(jobs)
+            store.mark_refreshed(source, query, location, len(jobs))
+            changed = set(diff["changed_ids"])
+            todo = [j for j in jobs if j.get("id") in changed]
+            extract_skills_memo_batch([job_text(j) for j in todo], [j.get("id") for j in todo])
+        except Exception as e:
+            with self._lock:
+                st["runs"] += 1
+                st["errors"] += 1
+                st["last_run"] = time.time()
+                st["last_error"] = f"{type(e).__name__}: {e}"
+            return None
+
+        out = {
+            "fetched": len(jobs),
+            "inserted": diff["inserted"],
+            "updated": diff["updated"],
+            "unchanged": diff["unchanged"],
+            "extracted": len(todo),
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+        }
+        with self._lock:
+            st["runs"] += 1
+            st["last_run"] = time.time()
+            st["last_error"] = None
+            st["last"] = out
+        return out
+
+    # ---- scheduling ----
+
+    def run_once(self) -> Dict[str, Any]:
+        """Refresh every cell now (still rate limited), sources interleaved."""
+        by_source: Dict[str, List[Dict[str, str]]] = {}
+        for c in self.cells:
+            by_source.setdefault(c["source"], []).append(c)
+        threads = [
+            threading.Thread(target=lambda cs=cs: [self.crawl_cell(c) for c in cs if not self._stop.is_set()], daemon=True)
+            for cs in by_source.values()
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return self.stats()
+
+    def run_forever(self, warm_up: bool = True) -> None:
+        """Refresh each cell once per interval at its own offset (optionally a full round first)."""
+        if warm_up:
+            self.run_once()
+        now = time.time()
+        due = {self.key(c): now + (self.phase_s(c) - now) % self.interval_s for c in self.cells}
+        cells = {self.key(c): c for c in self.cells}
+        while not self._stop.is_set() and due:
+            key = min(due, key=due.get)
+            if self._stop.wait(max(0.0, due[key] - time.time())):
+                break
+            self.crawl_cell(cells[key])
+            due[key] = max(due[key] + self.interval_s, time.time())
+
+    def start(self, warm_up: bool = True) -> "Crawler":
+        self._thread = threading.Thread(target=self.run_forever, args=(warm_up,), name="crawler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cells = [dict(v, cell=dict(v["cell"])) for v in self.state.values()]
+        return {
+            "cells": len(cells),
+            "interval_s": self.interval_s,
+            "limit": self.limit,
+            "runs": sum(c["runs"] for c in cells),
+            "errors": sum(c["errors"] for c in cells),
+            "state": cells,
+        }
+
+
+_CRAWLER: Optional[Crawler] = None
+
+
+def start_crawler() -> Crawler:
+    """Crawler thread of the MCP server (CRAWLER_IN_SERVER=1)."""
+    global _CRAWLER
+    if _CRAWLER is None:
+        _CRAWLER = Crawler(load_grid()).start()
+    return _CRAWLER
+
+
+def crawler_stats() -> Optional[Dict[str, Any]]:
+    return _CRAWLER.stats() if _CRAWLER is not None else None
+
+
+def main(argv: List[str]) -> None:
+    crawler = Crawler(load_grid())
+    print(f"[crawler] {len(crawler.cells)} cells, every {crawler.interval_s:.0f}s, limit {crawler.limit}")
+    if "--once" in argv:
+        print(json.dumps(crawler.run_once(), ensure_ascii=False, indent=2))
+        return
+    try:
+        crawler.run_forever()
+    except KeyboardInterrupt:
+        crawler.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
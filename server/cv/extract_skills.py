@@ -1,5 +1,13 @@
+import hashlib
+import json
+import multiprocessing
 import re
-from typing import List, Dict, Any, Set, Tuple
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from server.config import EXTRACT_PROCESS_MIN_BATCH, EXTRACT_START_METHOD, EXTRACT_WORKERS
+from server.cv.matcher import SkillMatcher
 
 # Goal: extract ONLY technical skills (tools/tech), with lightweight alias normalization
 # so that CV skills overlap job skills.
@@ -105,44 +113,31 @@ def _normalize_skill(s: str) -> str:
 
 
 def _compile_patterns(keywords: List[str]) -> List[Tuple[str, re.Pattern]]:
-    """Compile robust regex patterns.
-
-    - Single token: \bpython\b
-    - Multi-word: "power bi" -> \bpower[\s\-_/]+bi\b
-    """
-    patterns: List[Tuple[str, re.Pattern]] = []
-    for kw in keywords:
-        k = (kw or "").strip().lower()
-        if not k:
-            continue
-
-        if " " in k:
-            parts = [re.escape(p) for p in k.split() if p]
-            expr = r"\b" + r"[\s\-_\/]+".join(parts) + r"\b"
-            pat = re.compile(expr, flags=re.IGNORECASE)
-        else:
-            pat = re.compile(r"\b" + re.escape(k) + r"\b", flags=re.IGNORECASE)
+    """One compiled pattern per keyword (see server.cv.matcher.keyword_pattern)."""
+    return SkillMatcher(keywords).patterns
 
-        patterns.append((k, pat))
-    return patterns
 
+# Single-pass matcher over the whole allowlist (one scan per text, whatever the dictionary size)
+_MATCHER = SkillMatcher(SKILL_KEYWORDS)
+_COMPILED_PATTERNS = _MATCHER.patterns
 
-_COMPILED_PATTERNS = _compile_patterns(SKILL_KEYWORDS)
+# Dictionary version: memoized results (server/cv/skill_memo.py) are only reused for the same one.
+EXTRACTOR_REVISION = 1  # bump when the extraction code changes (the lists are hashed below)
+SKILL_DICT_VERSION = hashlib.blake2b(
+    json.dumps([EXTRACTOR_REVISION, SKILL_KEYWORDS, NORMALIZE_MAP, sorted(STOP_TERMS)], ensure_ascii=False).encode("utf-8"),
+    digest_size=8,
+).hexdigest()
 
 
-def extract_skills(text: str) -> List[str]:
-    """MVP extraction: allowlist dictionary + regex + light alias normalization."""
-    if not text:
-        return []
-
+def _canonical_skills(keywords: Set[str], text: str) -> List[str]:
+    """Matched keywords -> sorted canonical skills (aliases, glued variants, stop terms)."""
     found: Set[str] = set()
 
     # 1) regex matches from allowlist
-    for kw, pat in _COMPILED_PATTERNS:
-        if pat.search(text):
-            canon = _normalize_skill(kw)
-            if canon and canon not in STOP_TERMS:
-                found.add(canon)
+    for kw in keywords:
+        canon = _normalize_skill(kw)
+        if canon and canon not in STOP_TERMS:
+            found.add(canon)
 
     # 2) handle common glued variants that word boundaries may miss
     t = text.lower()
@@ -165,10 +160,67 @@ def extract_skills(text: str) -> List[str]:
     return sorted(found)
 
 
-def extract_skills_with_meta(text: str) -> Dict[str, Any]:
-    skills = extract_skills(text)
+def extract_skills(text: str) -> List[str]:
+    """MVP extraction: allowlist dictionary + regex + light alias normalization."""
+    if not text:
+        return []
+    return _canonical_skills(_MATCHER.find(text), text)
+
+
+def extract_skills_scan(text: str) -> List[str]:
+    """Reference extractor (one regex search per keyword); kept for equivalence checks."""
+    if not text:
+        return []
+    return _canonical_skills(_MATCHER.find_scan(text), text)
+
+
+def extract_skills_with_meta(text: str, extractor: Callable[[str], List[str]] = extract_skills) -> Dict[str, Any]:
+    skills = extractor(text)
     return {
         "skills": skills,
         "method": "keyword_dictionary_mvp",
         "count": len(skills),
-    }
\ No newline at end of file
+    }
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    """Text used for job skill extraction (title + company + location + description)."""
+    return "\n".join([
+        str(job.get("title") or ""),
+        str(job.get("company") or ""),
+        str(job.get("location") or ""),
+        str(job.get("description") or ""),
+    ])
+
+
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    # Workers are started with EXTRACT_START_METHOD, not fork: forking the threaded server
+    # could copy locks held by other threads into the child and deadlock it.
+    global _PROCESS_POOL
+    with _process_pool_lock:
+        if _PROCESS_POOL is None:
+            ctx = multiprocessing.get_context(EXTRACT_START_METHOD)
+            _PROCESS_POOL = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, mp_context=ctx)
+        return _PROCESS_POOL
+
+
+def start_process_pool() -> None:
+    """Create the extraction pool up front (server startup) so no request pays for it."""
+    if EXTRACT_WORKERS > 1:
+        _process_pool().submit(extract_skills, "").result()
+
+
+def extract_skills_batch(texts: List[str]) -> List[List[str]]:
+    """Extract skills for many texts, in order.
+
+    Small batches run inline (regex matching holds the GIL, threads would not help);
+    large batches are spread over a process pool.
+    """
+    if len(texts) < EXTRACT_PROCESS_MIN_BATCH or EXTRACT_WORKERS <= 1:
+        return [extract_skills(t) for t in texts]
+    chunksize = max(1, len(texts) // (EXTRACT_WORKERS * 4))
+    return list(_process_pool().map(extract_skills, texts, chunksize=chunksize))
@@ -0,0 +1,110 @@
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Separators tolerated between the words of a multi-word keyword ("power bi", "power-bi", "power_bi")
+SEPARATORS = r"[\s\-_\/]+"
+
+# Characters that re.IGNORECASE folds onto ASCII letters although str.lower() does not
+# (or changes the string length). Texts containing them use the reference scan.
+_IRREGULAR_FOLD = re.compile("[İıſ]")
+
+
+def folds_cleanly(text: str) -> bool:
+    """True when `text.lower()` matches exactly like `text` under re.IGNORECASE."""
+    return len(text.lower()) == len(text) and not _IRREGULAR_FOLD.search(text)
+
+
+def keyword_pattern(keyword: str) -> re.Pattern:
+    """Compile robust regex patterns.
+
+    - Single token: \\bpython\\b
+    - Multi-word: "power bi" -> \\bpower[\\s\\-_/]+bi\\b
+    """
+    if " " in keyword:
+        parts = [re.escape(p) for p in keyword.split() if p]
+        return re.compile(r"\b" + SEPARATORS.join(parts) + r"\b", flags=re.IGNORECASE)
+    return re.compile(r"\b" + re.escape(keyword) + r"\b", flags=re.IGNORECASE)
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Alternation of literals factored as a trie, so the regex engine follows one path per position."""
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # End of a word here: the longer continuation is optional (greedy = longest first)
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """
+    Single-pass multi-keyword matcher, equivalent to running one `keyword_pattern` search per keyword.
+
+    One regex (a trie over the keywords' first words, anchored on a word boundary and followed by
+    a boundary or a separator) locates every position where some keyword can start. Only those
+    candidate positions are verified with the exact per-keyword patterns, so the cost is one scan
+    of the text plus a few anchored matches instead of one full scan per keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.patterns: List[Tuple[str, re.Pattern]] = []
+        self._groups: Dict[str, List[Tuple[str, re.Pattern]]] = {}
+        for kw in keywords:
+            k = (kw or "").strip().lower()
+            if not k:
+                continue
+            pat = keyword_pattern(k)
+            self.patterns.append((k, pat))
+            first = k.split()[0] if " " in k else k
+            self._groups.setdefault(first, []).append((k, pat))
+
+        firsts = sorted(self._groups)
+        # Longest first word found at a position -> every first word that is a prefix of it
+        self._prefixes: Dict[str, List[str]] = {
+            f: [f[:i] for i in range(1, len(f) + 1) if f[:i] in self._groups] for f in firsts
+        }
+        self._keyword_count = len({k for k, _ in self.patterns})
+        self._candidates = (
+            re.compile(r"\b(?:" + _trie_regex(firsts) + r")(?=\b|" + SEPARATORS + ")")
+            if firsts
+            else None
+        )
+
+    def find(self, text: str) -> Set[str]:
+        """Keywords (lowercased, as given) present in `text`."""
+        if not text or self._candidates is None:
+            return set()
+        low = text.lower()
+        if len(low) != len(text) or _IRREGULAR_FOLD.search(text):
+            return self.find_scan(text)
+
+        found: Set[str] = set()
+        search = self._candidates.search
+        pos = 0
+        while len(found) < self._keyword_count:
+            m = search(low, pos)
+            if m is None:
+                break
+            start = m.start()
+            for first in self._prefixes[m.group()]:
+                for kw, pat in self._groups[first]:
+                    if kw not in found and pat.match(text, start):
+                        found.add(kw)
+            pos = start + 1
+        return found
+
+    def find_scan(self, text: str) -> Set[str]:
+        """Reference implementation: one full regex search per keyword."""
+        if not text:
+            return set()
+        return {kw for kw, pat in self.patterns if pat.search(text)}
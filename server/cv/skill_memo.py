@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from server.config import (
+    SKILL_MEMO_JOB_MAX_ENTRIES,
+    SKILL_MEMO_JOB_TTL_S,
+    SKILL_MEMO_MAX_ENTRIES,
+    SKILL_MEMO_PATH,
+)
+from server.cv.extract_skills import SKILL_DICT_VERSION, extract_skills_batch
+from server.cv.matcher import folds_cleanly
+from server.utils.cache import TTLCache
+
+# Memoized skill extraction.
+# - by text: blake2b(dictionary version + normalized text) -> skills (LRU, no TTL: same text, same skills)
+# - by job id: (source) job id -> skills of its last seen text (LRU + TTL, ads get edited)
+# Optional persistence: the text memo is appended to SKILL_MEMO_PATH (JSONL) and reloaded at startup.
+_BY_TEXT = TTLCache(max_entries=SKILL_MEMO_MAX_ENTRIES)
+_BY_JOB = TTLCache(max_entries=SKILL_MEMO_JOB_MAX_ENTRIES, ttl_s=SKILL_MEMO_JOB_TTL_S)
+_lock = threading.Lock()
+_loaded = False
+_counters: Dict[str, int] = {"extracted": 0, "disk_loaded": 0, "disk_writes": 0, "disk_compactions": 0}
+
+
+def normalize_text(text: str) -> str:
+    """Text as seen by the extractor: surrounding blanks dropped, case folded when it is safe."""
+    t = (text or "").strip()
+    return t.lower() if folds_cleanly(t) else t
+
+
+def text_key(text: str) -> str:
+    h = hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16, person=b"skills")
+    h.update(SKILL_DICT_VERSION.encode("ascii"))
+    return f"{SKILL_DICT_VERSION}:{h.hexdigest()}"
+
+
+# ---- Disk persistence (optional) ----
+
+def _load() -> None:
+    """Reload the memo of a previous run once (entries of another dictionary version are dropped)."""
+    global _loaded
+    with _lock:
+        if _loaded:
+            return
+        _loaded = True
+        if not SKILL_MEMO_PATH:
+            return
+        lines = 0
+        try:
+            with open(SKILL_MEMO_PATH, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(row, dict) and str(row.get("k", "")).startswith(SKILL_DICT_VERSION + ":"):
+                        _BY_TEXT.set(row["k"], list(row.get("s") or []))
+        except OSError:
+            return
+        _counters["disk_loaded"] = len(_BY_TEXT)
+        # Old versions / evicted duplicates: rewrite the file with what is kept
+        if lines > len(_BY_TEXT):
+            _rewrite()
+
+
+def _rewrite() -> None:
+    try:
+        tmp = f"{SKILL_MEMO_PATH}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for k, skills in _BY_TEXT.items():
+                f.write(json.dumps({"k": k, "s": skills}, ensure_ascii=False) + "\n")
+        os.replace(tmp, SKILL_MEMO_PATH)
+        _counters["disk_compactions"] += 1
+    except OSError:
+        pass
+
+
+def _persist(entries: Dict[str, List[str]]) -> None:
+    if not SKILL_MEMO_PATH or not entries:
+        return
+    with _lock:
+        try:
+            os.makedirs(os.path.dirname(SKILL_MEMO_PATH) or ".", exist_ok=True)
+            with open(SKILL_MEMO_PATH, "a", encoding="utf-8") as f:
+                for k, skills in entries.items():
+                    f.write(json.dumps({"k": k, "s": skills}, ensure_ascii=False) + "\n")
+            _counters["disk_writes"] += len(entries)
+        except OSError:
+            return
+        # Bound the file: compact when it holds twice what the memory tier can keep
+        if _counters["disk_writes"] + _counters["disk_loaded"] > 2 * _BY_TEXT.max_entries:
+            _rewrite()
+            _counters["disk_loaded"] = len(_BY_TEXT)
+            _counters["disk_writes"] = 0
+
+
+# ---- Lookups ----
+
+def extract_skills_memo(text: str, job_id: Optional[str] = None) -> List[str]:
+    """extract_skills(text), memoized on the text hash (and recorded for `job_id` when given)."""
+    return extract_skills_memo_batch([text], [job_id])[0]
+
+
+def extract_skills_memo_batch(texts: Sequence[str], job_ids: Optional[Sequence[Optional[str]]] = None) -> List[List[str]]:
+    """
+    Skills of many texts, in order. Only texts never seen (by hash) are extracted, each once
+    per batch, through extract_skills_batch (process pool for large batches).
+    """
+    _load()
+    keys = [text_key(t) for t in texts]
+    out: List[Optional[List[str]]] = [_BY_TEXT.get(k) for k in keys]
+
+    todo: Dict[str, str] = {}
+    for k, t, skills in zip(keys, texts, out):
+        if skills is None and k not in todo:
+            todo[k] = t
+    if todo:
+        extracted = dict(zip(todo, extract_skills_batch(list(todo.values()))))
+        for k, skills in extracted.items():
+            _BY_TEXT.set(k, skills)
+        out = [extracted[k] if skills is None else skills for k, skills in zip(keys, out)]
+        with _lock:
+            _counters["extracted"] += len(extracted)
+        _persist(extracted)
+
+    for job_id, skills in zip(job_ids or [], out):
+        if job_id:
+            _BY_JOB.set(str(job_id), skills)
+    return [list(s) for s in out]
+
+
+def skills_for_job_ids(job_ids: Sequence[str]) -> List[Optional[List[str]]]:
+    """Skills recorded for these job ids (None for a job never extracted, or expired)."""
+    out = []
+    for job_id in job_ids:
+        skills = _BY_JOB.get(str(job_id)) if job_id else None
+        out.append(list(skills) if skills is not None else None)
+    return out
+
+
+def skill_memo_stats() -> Dict[str, Any]:
+    with _lock:
+        counters = dict(_counters)
+    return {
+        "dictionary_version": SKILL_DICT_VERSION,
+        "by_text": _BY_TEXT.stats(),
+        "by_job_id": _BY_JOB.stats(),
+        "disk_path": SKILL_MEMO_PATH or None,
+        **counters,
+    }
@@ -0,0 +1,116 @@
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from server.cv import extract_skills as _dictionary
+from server.cv.extract_skills import STOP_TERMS, _normalize_skill
+
+# Skill vocabulary of the dictionary: canonical skill (after NORMALIZE_MAP) -> dense int id.
+# A skill profile (CV or job) is a SkillProfile: its dictionary skills as a Python int used as
+# a bitset (bit i = skill id i), so matched / missing / overlap are `&`, `& ~` and
+# int.bit_count(); the other skills (client-provided lists) as a small frozenset.
+#
+# Only dictionary skills get ids, fixed at build time (sorted canonical allowlist): the
+# vocabulary never grows with client input, and bitsets stay as small as the dictionary.
+# The vocabulary carries the dictionary version (SKILL_DICT_VERSION): when it changes,
+# get_vocab() rebuilds it and the memoized profiles of the old version are dropped.
+
+
+@dataclass(frozen=True, slots=True)
+class SkillProfile:
+    bits: int = 0
+    extra: FrozenSet[str] = frozenset()
+
+    def __and__(self, other: "SkillProfile") -> "SkillProfile":
+        return SkillProfile(self.bits & other.bits, self.extra & other.extra)
+
+    def __sub__(self, other: "SkillProfile") -> "SkillProfile":
+        return SkillProfile(self.bits & ~other.bits, self.extra - other.extra)
+
+    def size(self) -> int:
+        return self.bits.bit_count() + len(self.extra)
+
+
+class SkillVocab:
+    def __init__(self, version: str, skills: Iterable[str]):
+        self.version = version
+        self._names: List[str] = sorted({canonical(s) for s in skills} - {""})
+        self._ids: Dict[str, int] = {s: i for i, s in enumerate(self._names)}
+
+    def id(self, skill: str) -> Optional[int]:
+        """Id of a canonical dictionary skill (None for any other skill)."""
+        return self._ids.get(skill)
+
+    def profile(self, skills: Iterable[Any]) -> SkillProfile:
+        bits = 0
+        extra = set()
+        for s in skills or []:
+            c = canonical(s)
+            i = self._ids.get(c)
+            if i is not None:
+                bits |= 1 << i
+            elif c:
+                extra.add(c)
+        return SkillProfile(bits, frozenset(extra))
+
+    def names(self, profile: SkillProfile) -> List[str]:
+        """Skills of a profile, sorted by name."""
+        out = list(profile.extra)
+        names = self._names
+        bits = profile.bits
+        while bits:
+            low = bits & -bits
+            out.append(names[low.bit_length() - 1])
+            bits ^= low
+        return sorted(out)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"version": self.version, "skills": len(self._names)}
+
+
+def canonical(skill: Any) -> str:
+    """Canonical form of a skill name, as produced by extract_skills (lowercase, aliases mapped)."""
+    return _normalize_skill(str(skill or ""))
+
+
+def _dictionary_skills() -> List[str]:
+    return [s for s in (canonical(k) for k in _dictionary.SKILL_KEYWORDS) if s and s not in STOP_TERMS]
+
+
+_VOCAB: Optional[SkillVocab] = None
+_vocab_lock = threading.Lock()
+
+
+def get_vocab() -> SkillVocab:
+    """The vocabulary of the current dictionary version (rebuilt if the dictionary changed)."""
+    global _VOCAB
+    vocab = _VOCAB
+    if vocab is None or vocab.version != _dictionary.SKILL_DICT_VERSION:
+        with _vocab_lock:
+            if _VOCAB is None or _VOCAB.version != _dictionary.SKILL_DICT_VERSION:
+                _VOCAB = SkillVocab(_dictionary.SKILL_DICT_VERSION, _dictionary_skills())
+                _profile.cache_clear()
+            vocab = _VOCAB
+    return vocab
+
+
+@lru_cache(maxsize=1 << 16)
+def _profile(version: str, skills: Tuple[str, ...]) -> SkillProfile:
+    return get_vocab().profile(skills)
+
+
+def profile(skills: Iterable[Any]) -> SkillProfile:
+    """SkillProfile of a skill list, memoized per (dictionary version, skills)."""
+    vocab = get_vocab()
+    return _profile(vocab.version, tuple(str(s) for s in skills or []))
+
+
+def vocab_stats() -> Dict[str, Any]:
+    out = get_vocab().stats()
+    info = _profile.cache_info()
+    out["profiles"] = {"size": info.currsize, "hits": info.hits, "misses": info.misses}
+    return out
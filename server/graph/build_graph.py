@@ -1,8 +1,8 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 import networkx as nx
 
-def build_skill_job_graph(cv_skills: List[str], jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+def build_graph(cv_skills: List[str], jobs: List[Dict[str, Any]]) -> Tuple[nx.Graph, Dict[str, Any]]:
     """
     Build a bipartite graph:
       - Skill nodes: "skill:<name>"
@@ -10,6 +10,7 @@ def build_skill_job_graph(cv_skills: List[str], jobs: List[Dict[str, Any]]) -> D
       - Edge between skill and job if job_skills contains skill
     Input jobs format expected (minimal):
       { "id": "...", "skills": ["python", "sql", ...] }
+    Returns (graph, summary).
     """
     G = nx.Graph()
 
@@ -38,12 +39,19 @@ def build_skill_job_graph(cv_skills: List[str], jobs: List[Dict[str, Any]]) -> D
             G.add_edge(job_node, s_node, weight=1.0)
             edge_count += 1
 
+    summary = {
+        "cv_skill_count": len(cv_skills or []),
+        "job_count": job_count,
+        "node_count": G.number_of_nodes(),
+        "edge_count": edge_count,
+    }
+    return G, summary
+
+
+def build_skill_job_graph(cv_skills: List[str], jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the graph and return it as node-link JSON (see build_graph)."""
+    G, summary = build_graph(cv_skills, jobs)
     return {
         "graph": nx.node_link_data(G),  # JSON-serializable
-        "summary": {
-            "cv_skill_count": len(cv_skills or []),
-            "job_count": job_count,
-            "node_count": G.number_of_nodes(),
-            "edge_count": edge_count,
-        },
-    }
\ No newline at end of file
+        "summary": summary,
+    }
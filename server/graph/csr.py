@@ -0,0 +1,139 @@
+from __future__ import annotations
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from server.graph.rank import _skill_key
+
+# Compact Skills<->Jobs graph: skills and jobs interned to dense int ids, edges appended to
+# int32 arrays, then frozen into a CSR incidence matrix (jobs x skills) that rank.py uses as is.
+# Node-link JSON / networkx export is built on demand only (graph_build return_graph=true).
+#
+# Skills are keyed like rank.py (stripped, lowercased); the first label seen is kept for export.
+
+
+class SkillJobGraph:
+    def __init__(self, cv_skills: Iterable[str] = ()):
+        self.skill_index: Dict[str, int] = {}
+        self.skill_labels: List[str] = []
+        self.job_row: Dict[str, int] = {}
+        self.job_ids: List[str] = []
+        self.job_titles: List[str] = []
+        self.job_sources: List[str] = []
+        self._rows = array("i")
+        self._cols = array("i")
+        self._B: Optional[sp.csr_matrix] = None
+        for s in cv_skills or []:
+            self.add_skill(s)
+
+    # ---- construction ----
+
+    def add_skill(self, label: Any) -> int:
+        key = _skill_key(label)
+        i = self.skill_index.get(key)
+        if i is None:
+            i = self.skill_index[key] = len(self.skill_labels)
+            self.skill_labels.append(str(label))
+        return i
+
+    def add_job(self, job_id: str, skills: Iterable[str], title: str = "", source: str = "") -> int:
+        """Job node + one edge per skill (an id seen twice gets the union of both skill lists)."""
+        row = self.job_row.get(job_id)
+        if row is None:
+            row = self.job_row[job_id] = len(self.job_ids)
+            self.job_ids.append(job_id)
+            self.job_titles.append(title or "")
+            self.job_sources.append(source or "")
+        index = self.skill_index
+        cols = [index[k] if k in index else self.add_skill(s) for s, k in ((s, _skill_key(s)) for s in skills or [])]
+        self._rows.extend([row] * len(cols))
+        self._cols.extend(cols)
+        self._B = None
+        return row
+
+    def freeze(self) -> "SkillJobGraph":
+        """Build the CSR incidence (binary, duplicate edges merged); done lazily by `B`."""
+        rows = np.array(self._rows, dtype=np.int32)
+        cols = np.array(self._cols, dtype=np.int32)
+        B = sp.csr_matrix(
+            (np.ones(rows.size, dtype=np.float64), (rows, cols)),
+            shape=(len(self.job_ids), len(self.skill_labels)),
+        )
+        B.sum_duplicates()
+        B.data[:] = 1.0
+        self._B = B
+        return self
+
+    @property
+    def B(self) -> sp.csr_matrix:
+        if self._B is None or self._B.shape != (len(self.job_ids), len(self.skill_labels)):
+            self.freeze()
+        return self._B
+
+    # ---- read ----
+
+    @property
+    def skills(self) -> List[str]:
+        return list(self.skill_index)
+
+    def incidence(self) -> Tuple[List[str], List[str], sp.csr_matrix]:
+        """(job_ids, skill keys, jobs x skills CSR): what rank.py builds from a networkx graph."""
+        return self.job_ids, self.skills, self.B
+
+    def number_of_nodes(self) -> int:
+        return len(self.job_ids) + len(self.skill_labels)
+
+    def number_of_edges(self) -> int:
+        return int(self.B.nnz)
+
+    def nbytes(self) -> int:
+        B = self.B
+        return int(B.data.nbytes + B.indices.nbytes + B.indptr.nbytes + self._rows.itemsize * (len(self._rows) + len(self._cols)))
+
+    # ---- export (on demand) ----
+
+    def to_networkx(self) -> Any:
+        """networkx.Graph with the node names / attributes of build_graph."""
+        import networkx as nx
+
+        G = nx.Graph()
+        for label in self.skill_labels:
+            G.add_node(f"skill:{label}", kind="skill", label=label)
+        for job_id, title, source in zip(self.job_ids, self.job_titles, self.job_sources):
+            G.add_node(f"job:{job_id}", kind="job", label=title, source=source)
+        B = self.B
+        for row, job_id in enumerate(self.job_ids):
+            for col in B.indices[B.indptr[row]:B.indptr[row + 1]]:
+                G.add_edge(f"job:{job_id}", f"skill:{self.skill_labels[col]}", weight=1.0)
+        return G
+
+    def node_link_data(self) -> Dict[str, Any]:
+        import networkx as nx
+
+        return nx.node_link_data(self.to_networkx())
+
+
+def build_csr_graph(cv_skills: List[str], jobs: List[Dict[str, Any]]) -> Tuple[SkillJobGraph, Dict[str, Any]]:
+    """build_graph with the compact representation: same input, same summary."""
+    G = SkillJobGraph(cv_skills)
+    edge_count = 0
+    job_count = 0
+    for j in jobs or []:
+        job_id = j.get("id")
+        if not job_id:
+            continue
+        jskills = j.get("skills") or []
+        G.add_job(str(job_id), jskills, title=j.get("title", ""), source=j.get("source", ""))
+        job_count += 1
+        edge_count += len(jskills)
+    G.freeze()
+
+    summary = {
+        "cv_skill_count": len(cv_skills or []),
+        "job_count": job_count,
+        "node_count": G.number_of_nodes(),
+        "edge_count": edge_count,
+    }
+    return G, summary
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import Any, Dict, List, Optional
 
+from server.cv.vocab import SkillProfile, get_vocab, profile
+
 def explain_match(
     cv_skills: List[str],
     job_skills: List[str],
@@ -18,16 +20,29 @@ def explain_match(
       - coverage (ratio)
       - why_short / why_long
     """
-    cv = [s.strip().lower() for s in (cv_skills or []) if str(s).strip()]
-    js = [s.strip().lower() for s in (job_skills or []) if str(s).strip()]
-
-    cv_set = set(cv)
-    js_set = set(js)
+    # Skill sets as vocabulary profiles (canonical skills, memoized per skill list)
+    cv_profile = profile(cv_skills)
+    vocab = get_vocab()
+    job_profile = profile(job_skills)
+    return _explanation(
+        vocab.names(cv_profile & job_profile),
+        vocab.names(job_profile - cv_profile),
+        cv_profile.size(),
+        job,
+        score,
+        top_n,
+    )
 
-    matched = sorted(cv_set.intersection(js_set))
-    missing = sorted(js_set.difference(cv_set))
 
-    coverage = (len(matched) / len(cv_set)) if cv_set else 0.0
+def _explanation(
+    matched: List[str],
+    missing: List[str],
+    cv_count: int,
+    job: Optional[Dict[str, Any]],
+    score: Optional[float],
+    top_n: int,
+) -> Dict[str, Any]:
+    coverage = (len(matched) / cv_count) if cv_count else 0.0
     if score is None:
         score = coverage
 
@@ -47,7 +62,7 @@ def explain_match(
 
     why_short = (
         f"{header}: couverture {round(score*100)}% "
-        f"({len(matched)}/{len(cv_set) if cv_set else 0} compétences du CV matchées)."
+        f"({len(matched)}/{cv_count} compétences du CV matchées)."
     )
 
     # Build a longer justification
@@ -76,4 +91,29 @@ def explain_match(
         "score": round(float(score), 6),
         "why_short": why_short,
         "why_long": why_long,
-    }
\ No newline at end of file
+    }
+
+
+def explain_matches(cv_skills: List[str], items: List[Dict[str, Any]], top_n: int = 6) -> List[Dict[str, Any]]:
+    """
+    explain_match for many jobs of one CV: items [{"job_skills", "job", "score"}], same order.
+
+    The CV profile is built once; each job costs two bitset operations, and the skill names
+    of a profile are resolved once per batch (top-k jobs often share matched/missing sets).
+    """
+    cv_profile = profile(cv_skills)
+    cv_count = cv_profile.size()
+    vocab = get_vocab()
+    job_profiles = [profile(it.get("job_skills") or []) for it in items]
+    matched = [p & cv_profile for p in job_profiles]
+    missing = [p - cv_profile for p in job_profiles]
+
+    names: Dict[SkillProfile, List[str]] = {}
+    for p in matched + missing:
+        if p not in names:
+            names[p] = vocab.names(p)
+
+    return [
+        _explanation(list(names[m]), list(names[x]), cv_count, it.get("job"), it.get("score"), top_n)
+        for it, m, x in zip(items, matched, missing)
+    ]
@@ -0,0 +1,234 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List
+
+import numpy as np
+import scipy.linalg as la
+import scipy.sparse as sp
+
+from server.config import PPR_BASIS_MAX_CELLS
+from server.graph.rank import (
+    DEFAULT_ALPHA,
+    DEFAULT_MAX_ITER,
+    DEFAULT_TOL,
+    _skill_key,
+    incidence_from_graph,
+    power_iteration,
+    ranking_from_scores,
+    transition,
+)
+
+DENSE_SOLVE_MAX_SKILLS = 2000
+
+# Cached Personalized PageRank basis of a pool graph.
+# PPR is linear in the personalization vector (dangling mass is dropped, see rank.py), so the
+# job scores of a CV seeded uniformly on skills S are mean(PPR(s) for s in S). One PPR vector
+# per skill is computed once (in batch, all columns in the same sparse products) and a CV
+# ranking is a sum of cached columns plus a top-k selection.
+#
+# Up to DENSE_SOLVE_MAX_SKILLS skills the fixed point is solved exactly instead: eliminating the
+# job side, x_skills = (1 - alpha) p + alpha^2 S x_skills with S = B^T D_jobs B D_skills, so one LU
+# factorization of (I - alpha^2 S) gives any new column in O(skills^2) (~1 ms), no walk.
+#
+# Columns are only worth it when they are cheap: a basis that fits whole with the LU solver, or
+# seeds whose columns are all cached. Otherwise (big graphs, power-iteration solver) one column
+# per seed costs as much as a walk each, so rank() runs a single walk on the combined seed
+# vector instead, which gives the same scores (linearity) at the cost of one walk.
+#
+# A basis belongs to one pool graph: graph_build entries are immutable (new pool = new graph_id)
+# and session pools key their basis by pool_fingerprint, so a changed pool gets a new basis.
+
+
+def pool_fingerprint(jobs: List[Dict[str, Any]]) -> str:
+    """Hash of (job id, skills) in pool order: equal fingerprints give the same incidence matrix."""
+    h = hashlib.blake2b(digest_size=16, person=b"ppr-pool")
+    for j in jobs:
+        h.update(str(j.get("id") or "").encode("utf-8"))
+        h.update(b"\x00")
+        h.update("\x1f".join(sorted({_skill_key(s) for s in j.get("skills") or []})).encode("utf-8"))
+        h.update(b"\x01")
+    return h.hexdigest()
+
+
+class PprBasis:
+    """
+    Per-skill PPR job vectors of one jobs x skills incidence, filled on demand.
+
+    Columns are kept in LRU order within `max_cells` (jobs x cached skills); `precompute`
+    fills every skill when it fits.
+    """
+
+    def __init__(
+        self,
+        job_ids: List[str],
+        skills: List[str],
+        B: sp.csr_matrix,
+        alpha: float = DEFAULT_ALPHA,
+        tol: float = DEFAULT_TOL,
+        max_iter: int = DEFAULT_MAX_ITER,
+        max_cells: int = PPR_BASIS_MAX_CELLS,
+    ):
+        self.job_ids = job_ids
+        self.skills = skills
+        self.index = {s: i for i, s in enumerate(skills)}
+        self.B = B
+        self.alpha, self.tol, self.max_iter = alpha, tol, max_iter
+        self.max_columns = max(1, int(max_cells) // max(1, len(job_ids)))
+        self._walk = transition(B)
+        self._lu: Any = None
+        self.solver = "lu" if B.shape[1] <= DENSE_SOLVE_MAX_SKILLS else "power_iteration"
+        self._cols: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.computed = 0
+        self.iterations = 0
+        self.residual = 0.0
+
+    @classmethod
+    def from_graph(cls, G: Any, **kwargs: Any) -> "PprBasis":
+        job_ids, skills, B = incidence_from_graph(G)
+        return cls(job_ids, skills, B, **kwargs)
+
+    def _solve(self, cols: List[int]) -> np.ndarray:
+        """Exact job vectors of single-skill seeds (jobs x len(cols)) from the LU factorization."""
+        BT, inv_jobs, inv_skills = self._walk
+        if self._lu is None:
+            S = (BT @ sp.diags(inv_jobs) @ self.B @ sp.diags(inv_skills)).toarray()
+            self._lu = la.lu_factor(np.eye(S.shape[0]) - self.alpha ** 2 * S)
+        E = np.zeros((self.B.shape[1], len(cols)), dtype=np.float64)
+        E[cols, np.arange(len(cols))] = 1.0 - self.alpha
+        x_skills = la.lu_solve(self._lu, E)
+        return self.alpha * (self.B @ (x_skills * inv_skills[:, None]))
+
+    def _compute(self, cols: List[int]) -> None:
+        if self.solver == "lu":
+            jobs = self._solve(cols)
+            with self._lock:
+                for c, col in zip(cols, jobs.T):
+                    self._cols[c] = np.ascontiguousarray(col)
+                self.computed += len(cols)
+            return
+        # Several single-seed walks at once; chunked so the dense (nodes x m) iterates stay small
+        chunk = max(1, min(len(cols), 4_000_000 // max(1, sum(self.B.shape))))
+        for start in range(0, len(cols), chunk):
+            part = cols[start:start + chunk]
+            P = np.zeros((self.B.shape[1], len(part)), dtype=np.float64)
+            P[part, np.arange(len(part))] = 1.0
+            ppr = power_iteration(self.B, P, alpha=self.alpha, tol=self.tol, max_iter=self.max_iter, walk=self._walk)
+            with self._lock:
+                for c, col in zip(part, ppr["jobs"].T):
+                    self._cols[c] = np.ascontiguousarray(col)
+                self.computed += len(part)
+                self.iterations = max(self.iterations, ppr["iterations"])
+                self.residual = max(self.residual, ppr["residual"])
+
+    def columns(self, cols: List[int]) -> List[np.ndarray]:
+        with self._lock:
+            missing = [c for c in dict.fromkeys(cols) if c not in self._cols]
+        if missing:
+            self._compute(missing)
+        with self._lock:
+            out = []
+            for c in cols:
+                self._cols.move_to_end(c)
+                out.append(self._cols[c])
+            while len(self._cols) > max(self.max_columns, len(set(cols))):
+                self._cols.popitem(last=False)
+            return out
+
+    @property
+    def fits(self) -> bool:
+        """Whole basis within max_cells and solved by LU: any column is cheap and stays cached."""
+        return self.solver == "lu" and len(self.skills) <= self.max_columns
+
+    def precompute(self) -> bool:
+        """Fill every skill column if the whole basis fits in max_cells."""
+        if len(self.skills) > self.max_columns:
+            return False
+        self.columns(list(range(len(self.skills))))
+        return True
+
+    def cached(self, cols: List[int]) -> bool:
+        with self._lock:
+            return all(c in self._cols for c in cols)
+
+    def _walk_scores(self, seeds: List[int]) -> np.ndarray:
+        """Job scores of a uniform seed on `seeds` by one power iteration (sum of their columns / len)."""
+        p = np.zeros(self.B.shape[1], dtype=np.float64)
+        p[seeds] = 1.0 / len(seeds)
+        ppr = power_iteration(self.B, p, alpha=self.alpha, tol=self.tol, max_iter=self.max_iter, walk=self._walk)
+        with self._lock:
+            self.iterations = max(self.iterations, ppr["iterations"])
+            self.residual = max(self.residual, ppr["residual"])
+        return ppr["jobs"]
+
+    def rank(self, seed_skills: Iterable[str], top_k: int = 10, count_unknown: bool = False) -> Dict[str, Any]:
+        """
+        graph_rank output for a CV seeded on `seed_skills`, from cached columns.
+
+        count_unknown: seeds absent from the basis still take their share of the restart mass
+        (they are isolated skill nodes of the full graph, as CV skills added by build_graph).
+        """
+        t0 = time.perf_counter()
+        keys = [s for s in dict.fromkeys(_skill_key(x) for x in seed_skills or []) if s]
+        seeds = [self.index[s] for s in keys if s in self.index]
+        unknown = [s for s in keys if s not in self.index]
+        computed_before = self.computed
+
+        total = len(seeds) + (len(unknown) if count_unknown else 0)
+        engine = "ppr_basis"
+        if not seeds:
+            scores = np.zeros(len(self.job_ids), dtype=np.float64)
+        elif self.fits or self.cached(seeds):
+            scores = np.zeros(len(self.job_ids), dtype=np.float64)
+            for col in self.columns(seeds):
+                scores += col
+            scores /= total
+        else:
+            engine = "ppr_walk"
+            scores = self._walk_scores(seeds) * (len(seeds) / total)
+
+        return {
+            "ranking": ranking_from_scores(self.job_ids, scores, top_k, self.B, seeds, len(keys)),
+            "meta": {
+                "method": "personalized_pagerank",
+                "engine": engine,
+                "solver": self.solver,
+                "alpha": self.alpha,
+                "tol": self.tol,
+                "iterations": self.iterations,
+                "residual": self.residual,
+                "converged": self.residual < self.tol,
+                "seed_count": len(seeds),
+                "unknown_seeds": [] if count_unknown else unknown,
+                "job_count": len(self.job_ids),
+                "skill_count": len(self.skills),
+                "edge_count": int(self.B.nnz),
+                "basis_columns": len(self._cols),
+                "basis_computed": self.computed - computed_before,
+                "elapsed_ms": round((time.perf_counter() - t0) * 1000, 3),
+            },
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "jobs": len(self.job_ids),
+            "skills": len(self.skills),
+            "columns": len(self._cols),
+            "solver": self.solver,
+            "max_columns": self.max_columns,
+            "computed": self.computed,
+        }
+
+
+def basis_for(holder: Dict[str, Any], key: str, build: Callable[[], PprBasis]) -> PprBasis:
+    """Basis cached in a store entry (`holder`) under `key`; rebuilt by `build()` when the key changed."""
+    lock = holder.setdefault("ppr_basis_lock", threading.Lock())
+    with lock:
+        cached = holder.get("ppr_basis")
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        basis = build()
+        holder["ppr_basis"] = (key, basis)
+        return basis
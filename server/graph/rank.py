@@ -1,173 +1,281 @@
-from typing import Any, Dict, List, Optional
+from __future__ import annotations
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-class McpClient:
-    def __init__(self, url: str, timeout_s: int = 90):
-        self.url = url
-        self.timeout_s = timeout_s
+import numpy as np
+import scipy.sparse as sp
 
+DEFAULT_ALPHA = 0.85  # probability of following an edge (1 - alpha = restart on the CV skills)
+DEFAULT_TOL = 1e-6  # L1 change between two iterations
+DEFAULT_MAX_ITER = 100
 
-# -----------------------------
-# Filtering & fallback
-# -----------------------------
 
-def job_text_blob(job: Dict[str, Any]) -> str:
-    parts = [
-        str(job.get("title") or ""),
-        str(job.get("company") or ""),
-        str(job.get("location") or ""),
-        str(job.get("description") or ""),
-    ]
-    return "\n".join(parts)
-
-
-def _contains_any(text: str, keywords: List[str]) -> bool:
-    t = normalize_spaces(text)
-    return any(k in t for k in (keywords or []))
-
-# Keywords used for *soft* compliance (we keep jobs even if they don't match)
-ROLE_KEYWORDS_FILTER = {
-    "data analyst": ["data analyst", "analyst", "reporting", "dashboard", "power bi", "sql"],
-    "data scientist": ["data scientist", "machine learning", "ml", "deep learning", "python"],
-    "data engineer": ["data engineer", "etl", "pipeline", "airflow", "spark", "python"],
-    "business analyst": ["business analyst", "analyste", "métier", "metier", "product", "reporting"],
-}
-
-def compute_role_hit(job: Dict[str, Any], role: str) -> bool:
-    txt = job_text_blob(job)
-    kws = ROLE_KEYWORDS_FILTER.get(role, [])
-    return _contains_any(txt, kws)
-
-def compute_contract_hit(job: Dict[str, Any], contract: Optional[str]) -> bool:
-    if not contract:
-        return True
-    txt = job_text_blob(job)
-    kw = CONTRACT_KEYWORDS_FILTER.get(contract, [])
-    return _contains_any(txt, kw)
-
-def apply_soft_bonus(base_score: float, role_hit: bool, contract: Optional[str], contract_hit: bool) -> float:
-    score = float(base_score or 0.0)
-    # Bonuses: push compliant jobs up, but don't delete others
-    if role_hit:
-        score += 0.15
-    if contract and contract_hit:
-        score += 0.10
-    # Small penalty if user asked a contract and job doesn't mention it
-    if contract and not contract_hit:
-        score -= 0.05
-    # clamp
-    if score < 0.0:
-        score = 0.0
-    if score > 1.0:
-        score = 1.0
-    return round(score, 6)
-
-
-def run_pipeline(
-    client: McpClient,
-    role: str,
-    location: str,
-    contract: Optional[str],
-    top_k: int = 10,
-    sources: Optional[List[str]] = None,
-    trace: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
-    # 1) fetch jobs
-    role_query = role or ""
-    limit = top_k
+def _skill_key(label: Any) -> str:
+    return str(label or "").strip().lower()
 
-    # Fetch a larger pool so we can still return up to `top_k` results after ranking.
-    fetch_limit = int(max(limit, top_k * 10, 30))
-    fetch_limit = min(fetch_limit, 50)
 
-    jobs_res = safe_call(
-        client,
-        "jobs_list",
-        {
-            "query": role_query,
-            "location": location,
-            "limit": fetch_limit,
-            "sources": sources,
-            # avoid crashing UI if one source is down
-            "skip_failed_sources": True,
-        },
-        trace,
+def _incidence(
+    job_ids: List[str],
+    skill_index: Dict[str, int],
+    rows: List[int],
+    cols: List[int],
+    weights: List[float],
+) -> sp.csr_matrix:
+    B = sp.csr_matrix(
+        (np.asarray(weights, dtype=np.float64), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(job_ids), len(skill_index)),
     )
+    B.sum_duplicates()
+    return B
+
 
-    jobs = (jobs_res.get("jobs") or [])
-
-    # Keep jobs even if description is empty; we will build a text blob from title/company/location/description.
-    # We apply role/contract as *soft* signals later (bonus/penalty), not as hard filters.
-
-    # 2) extract skills from jobs
-    jobs_with_skills = []
-    # Work on a pool (fetch_limit) but keep compute time bounded
-    for j in jobs[:fetch_limit]:
-        enriched = "\n".join([
-            str(j.get("title") or ""),
-            str(j.get("company") or ""),
-            str(j.get("location") or ""),
-            str(j.get("description") or ""),
-        ])
-
-        # Soft compliance flags (do not filter out)
-        role_hit = compute_role_hit(j, role)
-        contract_hit = compute_contract_hit(j, contract)
-
-        js = safe_call(client, "job_extract_skills", {"text": enriched}, trace)
-        j2 = dict(j)
-        j2["skills"] = js.get("skills") or []
-        j2["role_hit"] = bool(role_hit)
-        j2["contract_hit"] = bool(contract_hit)
-        jobs_with_skills.append(j2)
-
-    # ... other pipeline steps ...
-
-    # 6) explain
-    recos = []
-    for r in ranking:
-        job_id = r["job_id"]
-        score = r["score"]
-        j = job_id_to_job.get(job_id)
-        if not j:
+def incidence_from_node_link(data: Dict[str, Any]) -> Tuple[List[str], List[str], sp.csr_matrix]:
+    """node-link graph (graph_build) -> (job_ids, skills, jobs x skills sparse incidence)."""
+    job_row: Dict[str, int] = {}
+    skill_index: Dict[str, int] = {}
+    node_kind: Dict[str, Tuple[str, int]] = {}
+
+    for n in data.get("nodes") or []:
+        nid = str(n.get("id"))
+        if n.get("kind") == "job" or nid.startswith("job:"):
+            node_kind[nid] = ("job", job_row.setdefault(nid[4:] if nid.startswith("job:") else nid, len(job_row)))
+        else:
+            key = _skill_key(n.get("label") or (nid[6:] if nid.startswith("skill:") else nid))
+            node_kind[nid] = ("skill", skill_index.setdefault(key, len(skill_index)))
+
+    rows: List[int] = []
+    cols: List[int] = []
+    weights: List[float] = []
+    for e in data.get("links") or data.get("edges") or []:
+        a = node_kind.get(str(e.get("source")))
+        b = node_kind.get(str(e.get("target")))
+        if not a or not b or a[0] == b[0]:
             continue
-        expl = safe_call(client, "match_explain", {"job_id": job_id, "cv_skills": cv_skills}, trace)
-        final_score = apply_soft_bonus(score, j.get("role_hit", False), contract, j.get("contract_hit", False))
-        recos.append({"job": j, "score": score, "final_score": final_score, "explain": expl})
-
-    # Soft re-ranking: prefer jobs that match the requested role/contract, but keep others.
-    recos.sort(key=lambda x: float(x.get("final_score", x.get("score", 0.0))), reverse=True)
-    recos = recos[:top_k]
-
-    meta = {
-        "method": "pipeline",
-        "jobs_list_meta": {
-            "pool_size": len(jobs),
-            "used_for_scoring": len(jobs_with_skills),
-        },
-        # ... other meta fields ...
+        job, skill = (a, b) if a[0] == "job" else (b, a)
+        rows.append(job[1])
+        cols.append(skill[1])
+        weights.append(float(e.get("weight", 1.0) or 1.0))
+
+    job_ids = list(job_row)
+    skills = list(skill_index)
+    return job_ids, skills, _incidence(job_ids, skill_index, rows, cols, weights)
+
+
+def incidence_from_graph(G: Any) -> Tuple[List[str], List[str], sp.csr_matrix]:
+    """Skills<->Jobs graph (csr.SkillJobGraph or networkx) -> (job_ids, skills, jobs x skills sparse incidence)."""
+    if hasattr(G, "incidence"):
+        return G.incidence()
+    job_row: Dict[Any, int] = {}
+    skill_col: Dict[Any, int] = {}
+    skill_index: Dict[str, int] = {}
+    job_ids: List[str] = []
+
+    for nid, attrs in G.nodes(data=True):
+        sid = str(nid)
+        if attrs.get("kind") == "job" or sid.startswith("job:"):
+            job_row[nid] = len(job_ids)
+            job_ids.append(sid[4:] if sid.startswith("job:") else sid)
+        else:
+            key = _skill_key(attrs.get("label") or (sid[6:] if sid.startswith("skill:") else sid))
+            skill_col[nid] = skill_index.setdefault(key, len(skill_index))
+
+    rows: List[int] = []
+    cols: List[int] = []
+    weights: List[float] = []
+    for a, b, w in G.edges(data="weight", default=1.0):
+        if a in job_row and b in skill_col:
+            rows.append(job_row[a]); cols.append(skill_col[b])
+        elif b in job_row and a in skill_col:
+            rows.append(job_row[b]); cols.append(skill_col[a])
+        else:
+            continue
+        weights.append(float(w or 1.0))
+
+    return job_ids, list(skill_index), _incidence(job_ids, skill_index, rows, cols, weights)
+
+
+def transition(B: sp.csr_matrix) -> Tuple[sp.csr_matrix, np.ndarray, np.ndarray]:
+    """(B transposed, 1/degree of jobs, 1/degree of skills), 0 for nodes without edges."""
+    deg_jobs = np.asarray(B.sum(axis=1)).ravel()
+    deg_skills = np.asarray(B.sum(axis=0)).ravel()
+    inv_jobs = np.divide(1.0, deg_jobs, out=np.zeros_like(deg_jobs), where=deg_jobs > 0)
+    inv_skills = np.divide(1.0, deg_skills, out=np.zeros_like(deg_skills), where=deg_skills > 0)
+    return B.T.tocsr(), inv_jobs, inv_skills
+
+
+def power_iteration(
+    B: sp.csr_matrix,
+    p: np.ndarray,
+    alpha: float = DEFAULT_ALPHA,
+    tol: float = DEFAULT_TOL,
+    max_iter: int = DEFAULT_MAX_ITER,
+    walk: Optional[Tuple[sp.csr_matrix, np.ndarray, np.ndarray]] = None,
+) -> Dict[str, Any]:
+    """
+    PPR power iteration for a personalization vector p (n_skills,) or one per column (n_skills, m).
+
+    With several columns every walk runs in the same sparse products; the iteration stops when
+    the worst column moved less than `tol` (L1). `walk` is a precomputed transition(B).
+    """
+    BT, inv_jobs, inv_skills = walk if walk is not None else transition(B)
+    if p.ndim == 2:
+        inv_jobs, inv_skills = inv_jobs[:, None], inv_skills[:, None]
+
+    x_skills = p.copy()
+    x_jobs = np.zeros((B.shape[0],) + p.shape[1:], dtype=np.float64)
+    restart = (1.0 - alpha) * p
+    residual = 0.0
+    iterations = 0
+
+    for iterations in range(1, max(1, int(max_iter)) + 1):
+        new_jobs = alpha * (B @ (x_skills * inv_skills))
+        new_skills = restart + alpha * (BT @ (x_jobs * inv_jobs))
+        residual = float(np.max(np.abs(new_jobs - x_jobs).sum(axis=0) + np.abs(new_skills - x_skills).sum(axis=0), initial=0.0))
+        x_jobs, x_skills = new_jobs, new_skills
+        if residual < tol:
+            break
+
+    return {
+        "jobs": x_jobs,
+        "skills": x_skills,
+        "iterations": iterations,
+        "residual": residual,
+        "converged": residual < tol,
     }
 
+
+def personalized_pagerank(
+    B: sp.csr_matrix,
+    seeds: Sequence[int],
+    alpha: float = DEFAULT_ALPHA,
+    tol: float = DEFAULT_TOL,
+    max_iter: int = DEFAULT_MAX_ITER,
+    seed_weights: Optional[Sequence[float]] = None,
+) -> Dict[str, Any]:
+    """
+    Personalized PageRank on the bipartite graph given by B (jobs x skills), by power iteration.
+
+    The random walk restarts on the seed skills with probability 1 - alpha. Mass reaching a
+    dangling node (skill or job without edges) is dropped rather than redistributed, which keeps
+    the result linear in the personalization vector (scores are only compared relatively).
+    Returns job/skill score vectors plus iteration count and final L1 residual.
+    """
+    p = np.zeros(B.shape[1], dtype=np.float64)
+    if len(seeds):
+        w = np.ones(len(seeds)) if seed_weights is None else np.asarray(seed_weights, dtype=np.float64)
+        np.add.at(p, np.asarray(seeds, dtype=np.int64), w)
+        total = p.sum()
+        if total > 0:
+            p /= total
+    return power_iteration(B, p, alpha=alpha, tol=tol, max_iter=max_iter)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k best positive scores, best first (argpartition + sort of the k only)."""
+    candidates = np.flatnonzero(scores > 0)
+    if candidates.size == 0 or k <= 0:
+        return candidates[:0]
+    if candidates.size > k:
+        part = np.argpartition(-scores[candidates], k - 1)[:k]
+        candidates = candidates[part]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def ranking_from_scores(
+    job_ids: List[str],
+    scores: np.ndarray,
+    top_k: int,
+    B: sp.csr_matrix,
+    seeds: Sequence[int],
+    cv_count: int,
+) -> List[Dict[str, Any]]:
+    """
+    Top-k jobs by PPR mass, best first.
+
+    score: share of the CV skills (`cv_count`, unknown ones included) the job is linked to,
+    comparable across pools and CVs; relative_score: PPR mass / best job (1.0 = best of the
+    pool); ppr: raw PPR mass.
+    """
+    best = top_k_indices(scores, max(1, int(top_k or 10)))
+    top = float(scores[best[0]]) if best.size else 0.0
+    overlap = np.zeros(best.size)
+    if best.size and len(seeds):
+        overlap = np.asarray((B[best][:, np.asarray(seeds, dtype=np.int64)] > 0).sum(axis=1)).ravel()
+    return [
+        {
+            "job_id": job_ids[i],
+            "score": round(float(n) / cv_count, 6) if cv_count else 0.0,
+            "relative_score": round(float(scores[i]) / top, 6),
+            "ppr": float(scores[i]),
+        }
+        for i, n in zip(best, overlap)
+    ]
+
+
+def seed_indices(skills: List[str], seed_skills: Iterable[str]) -> Tuple[List[int], List[str]]:
+    index = {s: i for i, s in enumerate(skills)}
+    seeds: List[int] = []
+    unknown: List[str] = []
+    for s in dict.fromkeys(_skill_key(x) for x in seed_skills or []):
+        if not s:
+            continue
+        if s in index:
+            seeds.append(index[s])
+        else:
+            unknown.append(s)
+    return seeds, unknown
+
+
+def rank_incidence(
+    job_ids: List[str],
+    skills: List[str],
+    B: sp.csr_matrix,
+    seed_skills: Iterable[str],
+    top_k: int = 10,
+    alpha: float = DEFAULT_ALPHA,
+    tol: float = DEFAULT_TOL,
+    max_iter: int = DEFAULT_MAX_ITER,
+) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    seeds, unknown = seed_indices(skills, seed_skills)
+    ppr = personalized_pagerank(B, seeds, alpha=alpha, tol=tol, max_iter=max_iter)
+
     return {
-        "recommendations": recos,
-        "meta": meta,
+        "ranking": ranking_from_scores(job_ids, ppr["jobs"], top_k, B, seeds, len(seeds) + len(unknown)),
+        "meta": {
+            "method": "personalized_pagerank",
+            "alpha": alpha,
+            "tol": tol,
+            "iterations": ppr["iterations"],
+            "residual": ppr["residual"],
+            "converged": ppr["converged"],
+            "seed_count": len(seeds),
+            "unknown_seeds": unknown,
+            "job_count": len(job_ids),
+            "skill_count": len(skills),
+            "edge_count": int(B.nnz),
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 3),
+        },
     }
 
 
-# UI rendering snippet inside Streamlit app:
-
-st.markdown("### ⭐ Recommandations")
-for idx, r in enumerate(recos, start=1):
-    j = r["job"]
-    score = r.get("score", 0.0)
-    final_score = float(r.get("final_score", score))
-    role_badge = "✅ rôle" if j.get("role_hit") else "⚠️ rôle"
-    contract_badge = "✅ contrat" if (contract and j.get("contract_hit")) else ("" if not contract else "⚠️ contrat")
-    badges = " ".join([b for b in [role_badge, contract_badge] if b])
-
-    with st.expander(
-        f"#{idx} — {j.get('title')} | {j.get('company')} | score={score:.3f} | final={final_score:.3f} | {badges}",
-        expanded=(idx == 1),
-    ):
-        st.write(f"**Compétences extraites (job) :** {j.get('skills')}")
-        st.write(f"**Conformité :** role_hit={j.get('role_hit')} | contract_hit={j.get('contract_hit')}")
-        # ... other rendering ...
\ No newline at end of file
+def rank_jobs_from_graph(
+    graph_node_link: Optional[Dict[str, Any]] = None,
+    seed_skills: Iterable[str] = (),
+    top_k: int = 10,
+    graph: Any = None,
+    alpha: float = DEFAULT_ALPHA,
+    tol: float = DEFAULT_TOL,
+    max_iter: int = DEFAULT_MAX_ITER,
+) -> Dict[str, Any]:
+    """
+    Rank the jobs of a Skills<->Jobs graph for a CV with Personalized PageRank seeded on CV skills.
+
+    `graph` is a server-side graph (csr.SkillJobGraph or networkx); `graph_node_link` the legacy node-link JSON.
+    Only jobs reached by the walk (score > 0) are returned, best first.
+    """
+    if graph is not None:
+        job_ids, skills, B = incidence_from_graph(graph)
+    else:
+        job_ids, skills, B = incidence_from_node_link(graph_node_link or {})
+    return rank_incidence(job_ids, skills, B, seed_skills, top_k=top_k, alpha=alpha, tol=tol, max_iter=max_iter)
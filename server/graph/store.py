@@ -0,0 +1,42 @@
+import uuid
+from typing import Any, Dict, List
+
+from server.config import GRAPH_STORE_MAX_ENTRIES, GRAPH_STORE_TTL_S
+from server.utils.cache import TTLCache
+
+# graph_id -> {"graph": ..., "cv_skills": [...], "jobs": {job_id: {...}}, "summary": {...}}
+_GRAPHS = TTLCache(max_entries=GRAPH_STORE_MAX_ENTRIES, ttl_s=GRAPH_STORE_TTL_S)
+
+
+def put_graph(entry: Dict[str, Any]) -> str:
+    """Keep a built graph server-side and return its handle."""
+    graph_id = f"g_{uuid.uuid4().hex[:16]}"
+    _GRAPHS.set(graph_id, entry)
+    return graph_id
+
+
+def graph_entry(graph: Any, cv_skills: List[str], jobs: List[Dict[str, Any]], summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Store entry for a built graph (job fields kept for match_explain by job_id)."""
+    return {
+        "graph": graph,
+        "cv_skills": list(cv_skills),
+        "jobs": {
+            j["id"]: {k: j.get(k) for k in ("title", "company", "source", "skills")}
+            for j in jobs
+            if isinstance(j, dict) and j.get("id")
+        },
+        "summary": summary,
+    }
+
+
+def get_graph(graph_id: str) -> Dict[str, Any]:
+    entry = _GRAPHS.get(graph_id)
+    if entry is None:
+        raise ValueError(f"Unknown or expired graph_id: {graph_id}. Call graph_build again.")
+    return entry
+
+
+def graph_store_stats() -> Dict[str, Any]:
+    out = _GRAPHS.stats()
+    out["ttl_s"] = GRAPH_STORE_TTL_S
+    return out
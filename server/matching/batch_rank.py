@@ -0,0 +1,184 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from server.graph.rank import _skill_key, top_k_indices
+
+# Many CVs x one job pool in one vectorized pass.
+# CVs and jobs are encoded as binary skill-incidence matrices over the same skill index,
+# C (cvs x skills) and J (jobs x skills); O = C @ J.T holds every CV/job skill overlap.
+# Scores follow the overlap of fallback_rank_score: overlap / CV skills (share of the CV
+# used by the job), ties broken by overlap / job skills (share of the job covered by the CV).
+
+
+def skill_incidence(profiles: Sequence[Sequence[str]], skill_index: Dict[str, int], grow: bool) -> sp.csr_matrix:
+    """Binary (profiles x skills) matrix; unknown skills are added to `skill_index` when `grow`, else ignored."""
+    rows: List[int] = []
+    cols: List[int] = []
+    for r, skills in enumerate(profiles):
+        for s in dict.fromkeys(_skill_key(x) for x in skills or []):
+            if not s:
+                continue
+            c = skill_index.get(s)
+            if c is None:
+                if not grow:
+                    continue
+                c = skill_index[s] = len(skill_index)
+            rows.append(r)
+            cols.append(c)
+    return sp.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(profiles), len(skill_index)),
+    )
+
+
+def rank_cvs_against_pool(
+    cv_skills: Sequence[Sequence[str]],
+    job_ids: Sequence[str],
+    job_skills: Sequence[Sequence[str]],
+    top_k: int = 10,
+    min_overlap: int = 1,
+) -> Tuple[List[List[Dict[str, Any]]], Dict[str, Any]]:
+    """
+    Top-k jobs of the pool for every CV: (rankings in CV order, meta).
+
+    One sparse product for all pairs, then a top-k selection per CV row over its non-zero
+    overlaps only. Jobs sharing fewer than `min_overlap` skills with a CV are not ranked.
+    """
+    t0 = time.perf_counter()
+    skill_index: Dict[str, int] = {}
+    J = skill_incidence(job_skills, skill_index, grow=True)
+    C = skill_incidence(cv_skills, skill_index, grow=False)
+    J.resize((J.shape[0], len(skill_index)))
+
+    cv_sizes = np.array([len({_skill_key(s) for s in skills or [] if _skill_key(s)}) for skills in cv_skills], dtype=np.float64)
+    job_sizes = np.asarray(J.sum(axis=1)).ravel()
+    O = (C @ J.T).tocsr()
+    t_product = time.perf_counter()
+
+    k = max(1, int(top_k))
+    out: List[List[Dict[str, Any]]] = []
+    for i in range(O.shape[0]):
+        start, end = O.indptr[i], O.indptr[i + 1]
+        cols, overlap = O.indices[start:end], O.data[start:end].astype(np.float64)
+        keep = overlap >= max(1, int(min_overlap))
+        cols, overlap = cols[keep], overlap[keep]
+        if not cols.size:
+            out.append([])
+            continue
+        score = overlap / max(1.0, cv_sizes[i])
+        job_cov = overlap / np.maximum(1.0, job_sizes[cols])
+        # Lexicographic (overlap, job coverage): job coverage (<= 1) is scaled below one overlap step
+        best = top_k_indices(overlap + 0.5 * job_cov, k)
+        out.append([
+            {
+                "job_id": job_ids[cols[b]],
+                "score": round(float(score[b]), 6),
+                "overlap": int(overlap[b]),
+                "job_coverage": round(float(job_cov[b]), 6),
+            }
+            for b in best
+        ])
+
+    return out, {
+        "method": "sparse_skill_overlap",
+        "cv_count": len(cv_skills),
+        "job_count": len(job_ids),
+        "skill_count": len(skill_index),
+        "pair_count": int(O.nnz),
+        "product_ms": round((t_product - t0) * 1000, 3),
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 3),
+    }
+
+
+def _job_skills(items: List[Dict[str, Any]]) -> List[Optional[List[str]]]:
+    """Skills of pool items: given list, else recorded for the id (id only), else extracted from the text."""
+    from server.cv.extract_skills import job_text
+    from server.cv.skill_memo import extract_skills_memo_batch, skills_for_job_ids
+
+    out: List[Optional[List[str]]] = [j["skills"] if isinstance(j.get("skills"), list) else None for j in items]
+    id_only = [i for i, j in enumerate(items) if out[i] is None and not (set(j) - {"id", "skills"})]
+    for i, skills in zip(id_only, skills_for_job_ids([str(items[i]["id"]) for i in id_only])):
+        out[i] = skills
+    id_only_set = set(id_only)
+    todo = [i for i, j in enumerate(items) if out[i] is None and i not in id_only_set]
+    for i, skills in zip(todo, extract_skills_memo_batch([job_text(items[i]) for i in todo], [str(items[i]["id"]) for i in todo])):
+        out[i] = skills
+    return out
+
+
+def run_batch_rank(
+    cvs: List[Dict[str, Any]],
+    jobs: Optional[List[Dict[str, Any]]] = None,
+    graph_id: Optional[str] = None,
+    query: Optional[str] = None,
+    location: str = "Paris",
+    sources: Optional[List[str]] = None,
+    limit: int = 50,
+    france_only: bool = True,
+    top_k: int = 10,
+    min_overlap: int = 1,
+) -> Dict[str, Any]:
+    """
+    Rank one job pool for many CVs ({"id", "skills"} or {"id", "cv_text"}).
+
+    Pool, first given of: `graph_id` (jobs of a built graph), `jobs` (with skills, id only or
+    text), `query` (fetched like match_pipeline, skills memoized). Returns per-CV rankings
+    plus the ranked jobs once (title/company/source/url) under "jobs".
+    """
+    from server.cv.skill_memo import extract_skills_memo_batch
+
+    t0 = time.perf_counter()
+    if graph_id:
+        from server.graph.store import get_graph
+
+        pool = [dict(j, id=job_id) for job_id, j in get_graph(graph_id)["jobs"].items()]
+        pool_origin = "graph"
+    elif jobs:
+        pool = [dict(j, id=str(j["id"])) for j in jobs if isinstance(j, dict) and j.get("id")]
+        pool_origin = "jobs"
+    elif query:
+        from server.matching.pool_cache import pool_skills
+        from server.matching.rules import filter_jobs_france_only
+        from server.mcp.tools import list_jobs
+
+        pool = list_jobs(query, location, limit, sources or ["adzuna", "remotive"], skip_failed=True)["jobs"]
+        if france_only:
+            pool = filter_jobs_france_only(pool)
+        pool = [dict(j, skills=skills) for j, skills in zip(pool, pool_skills(None, pool))]
+        pool_origin = "query"
+    else:
+        raise ValueError("A pool is required: graph_id, jobs or query")
+
+    skills_by_job = _job_skills(pool)
+    missing = [j["id"] for j, skills in zip(pool, skills_by_job) if skills is None]
+    job_ids = [str(j["id"]) for j in pool]
+    job_skills = [skills or [] for skills in skills_by_job]
+
+    cv_ids = [str(c.get("id") if c.get("id") is not None else n) for n, c in enumerate(cvs)]
+    cv_skills: List[Optional[List[str]]] = [c["skills"] if isinstance(c.get("skills"), list) else None for c in cvs]
+    todo = [n for n, s in enumerate(cv_skills) if s is None]
+    for n, skills in zip(todo, extract_skills_memo_batch([str(cvs[n].get("cv_text") or "") for n in todo])):
+        cv_skills[n] = skills
+    t_skills = time.perf_counter()
+
+    rankings, meta = rank_cvs_against_pool(cv_skills, job_ids, job_skills, top_k=top_k, min_overlap=min_overlap)
+
+    by_id = {j["id"]: j for j in pool}
+    ranked_ids = dict.fromkeys(r["job_id"] for ranking in rankings for r in ranking)
+    return {
+        "results": [
+            {"cv_id": cv_id, "cv_skill_count": len(skills or []), "ranking": ranking}
+            for cv_id, skills, ranking in zip(cv_ids, cv_skills, rankings)
+        ],
+        "jobs": {i: {k: by_id[i].get(k) for k in ("title", "company", "source", "url")} for i in ranked_ids},
+        "meta": dict(
+            meta,
+            pool=pool_origin,
+            missing_job_ids=missing,
+            skills_ms=round((t_skills - t0) * 1000, 3),
+            total_ms=round((time.perf_counter() - t0) * 1000, 3),
+        ),
+    }
@@ -0,0 +1,262 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from server.config import JOBS_LIST_DEADLINE_S
+from server.cv.skill_memo import extract_skills_memo
+from server.graph.csr import build_csr_graph
+from server.graph.explain import explain_matches
+from server.graph.ppr_basis import PprBasis, basis_for, pool_fingerprint
+from server.graph.rank import rank_jobs_from_graph
+from server.graph.store import graph_entry, put_graph
+from server.matching.pool_cache import get_pool, pool_skills
+from server.matching.rules import (
+    annotate_job_flags,
+    apply_contract_title_filter,
+    compute_job_soft_bonus,
+    fallback_rank_score,
+    filter_jobs_france_only,
+)
+
+# Job fields returned to the client (no raw payload; description clipped)
+RESULT_JOB_FIELDS = ("id", "source", "sources", "title", "company", "location", "url", "posted_at", "skills", "role_hit", "contract_hit")
+DEFAULT_DESCRIPTION_CHARS = 600
+
+
+def pool_size(limit: int, top_k: int) -> int:
+    # Fetch a bigger pool than top_k so filters + ranking still leave top_k results
+    return max(int(limit), int(top_k) * 10, 30)
+
+
+def _result_job(job: Dict[str, Any], description_chars: int) -> Dict[str, Any]:
+    out = {k: job.get(k) for k in RESULT_JOB_FIELDS}
+    desc = job.get("description") or ""
+    out["description"] = desc[:description_chars] if description_chars >= 0 else desc
+    return out
+
+
+def _pool_basis(G: Any) -> PprBasis:
+    basis = PprBasis.from_graph(G)
+    basis.precompute()
+    return basis
+
+
+def rescore(
+    ranking: List[Dict[str, Any]],
+    jobs_with_skills: List[Dict[str, Any]],
+    cv_skills: List[str],
+    role: str,
+    contract: Optional[str],
+    strict_filters: bool,
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    """Graph score + soft role/contract bonus; completed with fallback_rank_score when the graph is sparse."""
+    jobs_by_id = {j.get("id"): j for j in jobs_with_skills if j.get("id")}
+
+    rescored = []
+    for r in ranking:
+        job_id = r.get("job_id")
+        j = jobs_by_id.get(job_id)
+        if not j:
+            continue
+        base_score = float(r.get("score", 0.0))
+        bonus = compute_job_soft_bonus(j, role, contract, strict_filters)
+        rescored.append({"job_id": job_id, "base_score": base_score, "bonus": bonus, "final_score": min(1.0, base_score + bonus)})
+
+    rescored.sort(key=lambda x: x["final_score"], reverse=True)
+
+    # If graph_rank is sparse (few edges / few ranked items), build a complete ranking from the pool.
+    if len(rescored) < top_k:
+        existing_ids = {x["job_id"] for x in rescored}
+        for j in jobs_with_skills:
+            job_id = j.get("id")
+            if not job_id or job_id in existing_ids:
+                continue
+            base_score = fallback_rank_score(j, cv_skills, role, contract, strict_filters)
+            bonus = compute_job_soft_bonus(j, role, contract, strict_filters)
+            rescored.append({
+                "job_id": job_id,
+                "base_score": float(base_score),
+                "bonus": float(bonus),
+                "final_score": float(max(0.0, min(1.0, base_score + bonus))),
+            })
+        rescored.sort(key=lambda x: x["final_score"], reverse=True)
+
+    return rescored
+
+
+def recommendations(
+    rescored: List[Dict[str, Any]],
+    jobs_by_id: Dict[str, Dict[str, Any]],
+    cv_skills: List[str],
+    top_k: int,
+    description_chars: int = DEFAULT_DESCRIPTION_CHARS,
+) -> List[Dict[str, Any]]:
+    """Top-k of a rescored list, with the job (slim) and its explanation (one batch for the top-k)."""
+    top = [(r, jobs_by_id[r["job_id"]]) for r in rescored[:top_k]]
+    explanations = explain_matches(cv_skills, [
+        {
+            "job_skills": j.get("skills") or [],
+            "job": {"title": j.get("title"), "company": j.get("company")},
+            "score": float(r["final_score"]),
+        }
+        for r, j in top
+    ])
+    return [
+        {
+            "job": _result_job(j, description_chars),
+            "score": float(r["final_score"]),
+            "score_base": float(r["base_score"]),
+            "score_bonus": float(r["bonus"]),
+            "explain": explain,
+        }
+        for (r, j), explain in zip(top, explanations)
+    ]
+
+
+def run_match_pipeline(
+    cv_text: str = "",
+    cv_skills: Optional[List[str]] = None,
+    role: str = "data analyst",
+    contract: Optional[str] = None,
+    location: str = "Paris",
+    sources: Optional[List[str]] = None,
+    limit: int = 10,
+    top_k: int = 3,
+    query: Optional[str] = None,
+    strict_filters: bool = True,
+    france_only: bool = True,
+    deadline_s: float = JOBS_LIST_DEADLINE_S,
+    description_chars: int = DEFAULT_DESCRIPTION_CHARS,
+    with_relaxed: bool = False,
+    session_id: Optional[str] = None,
+    refresh_pool: bool = False,
+) -> Dict[str, Any]:
+    """
+    fetch -> filter -> extract -> graph -> rank -> explain, in-process.
+
+    Stages exchange Python objects directly; only the top_k recommendations (with their
+    explanation) and per-stage timings are returned. The graph stays in the store (graph_id).
+
+    with_relaxed: also score the same pool with strict_filters=False ("relaxed" key), so a
+    strict/relaxed fallback costs one fetch + extraction instead of two.
+
+    session_id: fetched jobs and their skills are kept per (session, query, location, sources),
+    so re-running with other filters / top_k / pool size re-ranks in memory (see pool_cache).
+    """
+    from server.mcp.tools import list_jobs
+
+    timings: Dict[str, float] = {}
+    t_start = time.perf_counter()
+    t = t_start
+
+    def lap(stage: str) -> None:
+        nonlocal t
+        now = time.perf_counter()
+        timings[stage] = round((now - t) * 1000, 2)
+        t = now
+
+    sources = sources or ["adzuna", "remotive"]
+    query = (query or role or "data").strip()
+    size = pool_size(limit, top_k)
+
+    # 1) Fetch (all sources concurrently), or the session pool
+    listed, pool_entry, pool_state = get_pool(
+        session_id,
+        query,
+        location,
+        sources,
+        size,
+        lambda n: list_jobs(query, location, n, sources, skip_failed=True, deadline_s=deadline_s),
+        refresh=refresh_pool,
+    )
+    jobs = listed["jobs"]
+    lap("fetch")
+
+    # 2) Filters: France only (raw location area available here), contract by title, soft flags
+    before_country = len(jobs)
+    if france_only:
+        jobs = filter_jobs_france_only(jobs)
+    after_country = len(jobs)
+    jobs = apply_contract_title_filter(jobs, contract)
+    after_title_contract = len(jobs)
+    jobs = [annotate_job_flags(j, role, contract) for j in jobs]
+    lap("filter")
+
+    # 3) Skills (CV + pool)
+    if cv_skills is None:
+        cv_skills = extract_skills_memo(cv_text or "")
+    pool = jobs[:size]
+    for j, skills in zip(pool, pool_skills(pool_entry, pool)):
+        j["skills"] = skills
+    lap("extract")
+
+    # 4) Graph (kept server-side)
+    G, summary = build_csr_graph(cv_skills, pool)
+    graph_id = put_graph(graph_entry(G, cv_skills, pool, summary))
+    lap("graph")
+
+    # 5) Rank + soft bonus / fallback. With a session pool, the per-skill PPR basis of the pool
+    # is cached with it (rebuilt when the pool changes): a CV edit re-ranks without a walk when
+    # the basis fits, with one walk otherwise.
+    if pool_entry is not None:
+        basis = basis_for(pool_entry, pool_fingerprint(pool), lambda: _pool_basis(G))
+        ranked = basis.rank(cv_skills, top_k=top_k, count_unknown=True)
+    else:
+        ranked = rank_jobs_from_graph(graph=G, seed_skills=cv_skills, top_k=top_k)
+    rescored = rescore(ranked.get("ranking") or [], pool, cv_skills, role, contract, strict_filters, top_k)
+    relaxed = (
+        rescore(ranked.get("ranking") or [], pool, cv_skills, role, contract, False, top_k)
+        if with_relaxed and strict_filters
+        else None
+    )
+    lap("rank")
+
+    # 6) Explain top_k
+    jobs_by_id = {j["id"]: j for j in pool if j.get("id")}
+    recos = recommendations(rescored, jobs_by_id, cv_skills, top_k, description_chars)
+    out_relaxed = None
+    if relaxed is not None:
+        out_relaxed = {
+            "recommendations": recommendations(relaxed, jobs_by_id, cv_skills, top_k, description_chars),
+            "ranked_count": len(relaxed),
+        }
+    lap("explain")
+    timings["total"] = round((time.perf_counter() - t_start) * 1000, 2)
+
+    out = {
+        "recommendations": recos,
+        "meta": {
+            "query_used": query,
+            "role": role,
+            "contract": contract,
+            "location": location,
+            "sources": sources,
+            "strict_filters": strict_filters,
+            "france_only": france_only,
+            "cv_skills": cv_skills,
+            "graph_id": graph_id,
+            "pool_cache": pool_state,
+            "jobs_list_meta": {
+                "count_total": listed.get("count_total"),
+                "count_by_source": listed.get("count_by_source"),
+                "errors": listed.get("errors"),
+                "dedup": listed.get("dedup"),
+                "timed_out": listed.get("timed_out"),
+                "pool_size": after_country,
+                "before_country_filter": before_country,
+                "after_country_filter": after_country,
+                "after_title_contract_filter": after_title_contract,
+                "role_hit_count": sum(1 for j in jobs if j.get("role_hit")),
+                "contract_hit_count": sum(1 for j in jobs if j.get("contract_hit")),
+                "jobs_with_skills": len(pool),
+                "ranked_count": len(rescored),
+                "returned_top_k": len(recos),
+            },
+            "graph_summary": summary,
+            "rank_meta": ranked.get("meta"),
+            "timings_ms": timings,
+        },
+    }
+    if out_relaxed is not None:
+        out["relaxed"] = out_relaxed
+    return out
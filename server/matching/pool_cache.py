@@ -0,0 +1,87 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from server.config import POOL_CACHE_MAX_ENTRIES, POOL_CACHE_TTL_S, POOL_FETCH_MIN
+from server.cv.extract_skills import job_text
+from server.cv.skill_memo import extract_skills_memo_batch
+from server.utils.cache import TTLCache
+
+# (session_id, query, location, sources) -> {"limit", "exhausted", "listed", "jobs", "skills": {job_id: [...]}, "lock"}
+_POOLS = TTLCache(max_entries=POOL_CACHE_MAX_ENTRIES, ttl_s=POOL_CACHE_TTL_S)
+
+
+def pool_key(session_id: str, query: str, location: str, sources: List[str]) -> Tuple:
+    return (session_id, query.strip().lower(), location.strip().lower(), tuple(sources))
+
+
+def _take(jobs: List[Dict[str, Any]], sources: List[str], limit: int) -> List[Dict[str, Any]]:
+    """First `limit` jobs of each source, in source order (what list_jobs returns for `limit`)."""
+    out: List[Dict[str, Any]] = []
+    for s in sources:
+        out.extend([j for j in jobs if j.get("source") == s][:limit])
+    return out
+
+
+def get_pool(
+    session_id: Optional[str],
+    query: str,
+    location: str,
+    sources: List[str],
+    limit: int,
+    loader: Callable[[int], Dict[str, Any]],
+    refresh: bool = False,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], str]:
+    """
+    Jobs of a search for this session: (list_jobs result, pool entry, "hit"|"miss"|"off").
+
+    `loader(limit)` fetches `limit` jobs per source. A session pool is fetched with at least
+    POOL_FETCH_MIN jobs per source and reused for any smaller limit (trimmed per source), or
+    any limit at all when every source returned less than asked (exhausted). Changing the
+    pool/top_k sliders or strict filters then re-ranks in memory without any upstream call.
+    Partial fetches (source errors or timeouts) are not kept.
+    """
+    if not session_id:
+        return loader(limit), None, "off"
+
+    key = pool_key(session_id, query, location, sources)
+    entry = None if refresh else _POOLS.get(key)
+    if entry is not None and (entry["limit"] >= limit or entry["exhausted"]):
+        listed = dict(entry["listed"], jobs=_take(entry["jobs"], sources, limit))
+        listed["count_total"] = len(listed["jobs"])
+        return listed, entry, "hit"
+
+    fetch_limit = max(limit, POOL_FETCH_MIN)
+    listed = loader(fetch_limit)
+    if listed.get("errors") or listed.get("timed_out"):
+        return dict(listed, jobs=_take(listed["jobs"], sources, limit)), None, "miss"
+    entry = {
+        "limit": fetch_limit,
+        "exhausted": all(n < fetch_limit for n in (listed.get("count_by_source") or {}).values()),
+        "listed": {k: v for k, v in listed.items() if k != "jobs"},
+        "jobs": listed["jobs"],
+        "skills": {},
+        "lock": threading.Lock(),
+    }
+    _POOLS.set(key, entry)
+    listed = dict(entry["listed"], jobs=_take(entry["jobs"], sources, limit))
+    listed["count_total"] = len(listed["jobs"])
+    return listed, entry, "miss"
+
+
+def pool_skills(entry: Optional[Dict[str, Any]], jobs: List[Dict[str, Any]]) -> List[List[str]]:
+    """Extracted skills of `jobs` (memoized by text, see skill_memo); with a pool entry, the per-session copy skips even the hashing."""
+    if entry is None:
+        return extract_skills_memo_batch([job_text(j) for j in jobs], [j.get("id") for j in jobs])
+
+    with entry["lock"]:
+        memo = entry["skills"]
+        todo = [j for j in jobs if j.get("id") not in memo]
+        for j, skills in zip(todo, extract_skills_memo_batch([job_text(j) for j in todo], [j.get("id") for j in todo])):
+            memo[j.get("id")] = skills
+        return [list(memo[j.get("id")]) for j in jobs]
+
+
+def pool_cache_stats() -> Dict[str, Any]:
+    out = _POOLS.stats()
+    out["ttl_s"] = POOL_CACHE_TTL_S
+    return out
@@ -0,0 +1,264 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from server.cv.vocab import profile
+
+# Filtering / soft-scoring rules of the matching pipeline (moved from the Streamlit client).
+
+
+def normalize_spaces(s: str) -> str:
+    return re.sub(r"\s+", " ", (s or "").strip().lower())
+
+
+def job_text_blob(job: Dict[str, Any]) -> str:
+    parts = [
+        str(job.get("title") or ""),
+        str(job.get("company") or ""),
+        str(job.get("location") or ""),
+        str(job.get("description") or ""),
+    ]
+    return normalize_spaces(" ".join(parts))
+
+
+# --- Location utils for country filtering ---
+
+def job_location_blob(job: Dict[str, Any]) -> str:
+    """Best-effort location string for filtering."""
+    loc = str(job.get("location") or "")
+    area = job.get("location_area")
+    if isinstance(area, list) and area:
+        # prepend country / region (Adzuna area, kept on the compact job)
+        return normalize_spaces(" ".join(str(a) for a in area if a) + " " + loc)
+    raw = job.get("raw") or {}
+    # Adzuna often stores a richer location object
+    try:
+        if isinstance(raw, dict):
+            rloc = raw.get("location") or {}
+            if isinstance(rloc, dict):
+                loc = loc or str(rloc.get("display_name") or "")
+                area = rloc.get("area")
+                if isinstance(area, list) and area:
+                    # prepend country when available
+                    loc = " ".join([str(a) for a in area if a]) + (" " + loc if loc else "")
+    except Exception:
+        pass
+    return normalize_spaces(loc)
+
+
+FRANCE_LOCATION_HINTS = [
+    "france",
+    "ile-de-france",
+    "île-de-france",
+    "paris",
+    "lyon",
+    "marseille",
+    "toulouse",
+    "lille",
+    "bordeaux",
+    "nantes",
+    "rennes",
+    "nice",
+    "strasbourg",
+    "montpellier",
+    "grenoble",
+]
+
+
+def filter_jobs_france_only(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Hard filter to keep only France-based jobs.
+
+    Motivation: some sources (esp. remote/global boards) can return US/Worldwide results even when
+    the query is a French city. We keep only jobs whose location strongly indicates France.
+    """
+    out: List[Dict[str, Any]] = []
+    for j in jobs:
+        loc = job_location_blob(j)
+        # If location is missing, we cannot safely assume France.
+        if not loc:
+            continue
+        if any(h in loc for h in FRANCE_LOCATION_HINTS):
+            out.append(j)
+    return out
+
+
+# -----------------------------
+# Strict contract filtering based on TITLE
+# -----------------------------
+# - If user does NOT ask for stage/alternance: exclude stage/alternance offers
+# - If user asks for stage: keep ONLY stage/internship offers (title-based)
+# - If user asks for alternance: keep ONLY alternance/apprenticeship offers (title-based)
+def job_title_blob(job: Dict[str, Any]) -> str:
+    return normalize_spaces(str(job.get("title") or ""))
+
+INTERNSHIP_TITLE_KW = [
+    "stage",
+    "stagiaire",
+    "intern",
+    "internship",
+]
+
+APPRENTICESHIP_TITLE_KW = [
+    "alternance",
+    "apprentissage",
+    "apprenti",
+    "apprenticeship",
+    "apprentice",
+]
+
+
+def _title_contains_any(title: str, kws: List[str]) -> bool:
+    return any(k in title for k in kws)
+
+
+def is_stage_title(job: Dict[str, Any]) -> bool:
+    return _title_contains_any(job_title_blob(job), INTERNSHIP_TITLE_KW)
+
+
+def is_alternance_title(job: Dict[str, Any]) -> bool:
+    return _title_contains_any(job_title_blob(job), APPRENTICESHIP_TITLE_KW)
+
+
+def is_intern_or_apprentice_title(job: Dict[str, Any]) -> bool:
+    return is_stage_title(job) or is_alternance_title(job)
+
+
+def apply_contract_title_filter(jobs: List[Dict[str, Any]], contract: Optional[str]) -> List[Dict[str, Any]]:
+    """Apply the strict contract rule using ONLY the job title."""
+    if contract == "stage":
+        return [j for j in jobs if is_stage_title(j)]
+    if contract == "alternance":
+        return [j for j in jobs if is_alternance_title(j)]
+
+    # Default behavior (including CDI/CDD or unspecified): exclude internships/apprenticeships
+    return [j for j in jobs if not is_intern_or_apprentice_title(j)]
+
+
+CONTRACT_KEYWORDS_FILTER = {
+    # on garde large mais pas débile
+    "stage": ["stage", "intern", "internship", "stagiaire"],
+    "alternance": ["alternance", "apprenticeship", "apprenti", "apprentissage"],
+    "cdi": ["cdi", "permanent", "temps plein", "full time", "full-time"],
+    "cdd": ["cdd", "fixed term", "fixed-term", "contrat à durée déterminée"],
+}
+
+ROLE_KEYWORDS_FILTER = {
+    "data analyst": ["data analyst", "analyste", "reporting", "dashboard", "power bi", "tableau", "sql"],
+    "data scientist": ["data scientist", "machine learning", "ml", "deep learning", "model", "python"],
+    "data engineer": ["data engineer", "etl", "pipeline", "airflow", "spark", "dbt", "ingénieur data"],
+    "business analyst": ["business analyst", "analyste métier", "amoa", "moa", "fonctionnel", "product"],
+}
+
+
+# -----------------------------
+# Filters / soft scoring (do NOT drop jobs)
+# -----------------------------
+
+def _contains_any(txt: str, keywords: List[str]) -> bool:
+    return any(k in txt for k in keywords)
+
+
+def role_match_flag(job: Dict[str, Any], role: str) -> bool:
+    kw = ROLE_KEYWORDS_FILTER.get(role, [])
+    if not kw:
+        return True
+    return _contains_any(job_text_blob(job), kw)
+
+
+def contract_match_flag(job: Dict[str, Any], contract: Optional[str]) -> bool:
+    """Contract compliance flag.
+
+    IMPORTANT: For stage/alternance we rely strictly on TITLE to avoid false positives.
+    For other cases (None/CDI/CDD), we exclude stage/alternance titles by default.
+
+    Note: CDI/CDD are often unreliable in upstream APIs; we keep them as soft signals.
+    """
+    if contract == "stage":
+        return is_stage_title(job)
+    if contract == "alternance":
+        return is_alternance_title(job)
+
+    # Default: user did not ask for internship/apprenticeship => reject those titles
+    if is_intern_or_apprentice_title(job):
+        return False
+
+    # For CDI/CDD (or None), keep previous broad matching as a soft signal.
+    if not contract or contract not in CONTRACT_KEYWORDS_FILTER:
+        return True
+
+    kw = CONTRACT_KEYWORDS_FILTER.get(contract, [])
+    if not kw:
+        return True
+    return _contains_any(job_text_blob(job), kw)
+
+
+def compute_job_soft_bonus(job: Dict[str, Any], role: str, contract: Optional[str], strict_filters: bool) -> float:
+    """Score adjustment layered on top of the graph score.
+
+    - If strict_filters=True: penalize offers that don't match the requested role/contract.
+      (We still keep them as fallback if the pool is small.)
+    - If strict_filters=False: give small positive bumps to compliant offers.
+
+    Uses the role_hit/contract_hit flags set by annotate_job_flags when present.
+    """
+    role_ok = job["role_hit"] if "role_hit" in job else role_match_flag(job, role)
+    contract_ok = job["contract_hit"] if "contract_hit" in job else contract_match_flag(job, contract)
+
+    if strict_filters:
+        bonus = 0.0
+        if not role_ok:
+            bonus -= 0.30
+        if contract and not contract_ok:
+            bonus -= 0.30
+        return bonus
+
+    bonus = 0.0
+    if role_ok:
+        bonus += 0.10
+    if contract and contract_ok:
+        bonus += 0.10
+    return bonus
+
+
+def annotate_job_flags(job: Dict[str, Any], role: str, contract: Optional[str]) -> Dict[str, Any]:
+    j2 = dict(job)
+    j2["role_hit"] = bool(role_match_flag(job, role))
+    j2["contract_hit"] = bool(contract_match_flag(job, contract))
+    return j2
+
+
+# Deterministic fallback ranking function
+def fallback_rank_score(job: Dict[str, Any], cv_skills: List[str], role: str, contract: Optional[str], strict_filters: bool) -> float:
+    """Deterministic fallback score when graph_rank is sparse.
+
+    Priorities:
+    1) Role compliance
+    2) Contract compliance (if requested)
+    3) Skill overlap
+
+    Returns a score in [0, 1].
+    """
+    # Overlap of vocabulary profiles (bitset popcount, profiles memoized per skill list)
+    cv_profile = profile(cv_skills)
+    overlap = (cv_profile & profile(job.get("skills") or [])).size()
+    overlap_ratio = overlap / max(1, cv_profile.size())
+
+    role_ok = bool(job.get("role_hit"))
+    contract_ok = bool(job.get("contract_hit")) if contract else True
+
+    # Base: overlap (0..1)
+    score = overlap_ratio
+
+    # Compliance weights
+    if role_ok:
+        score += 0.35
+    elif strict_filters:
+        score -= 0.10
+
+    if contract:
+        if contract_ok:
+            score += 0.25
+        elif strict_filters:
+            score -= 0.10
+
+    # Clamp
+    return max(0.0, min(1.0, score))
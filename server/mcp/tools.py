@@ -1,8 +1,28 @@
+import time
 from typing import Any, Dict, List, Optional
 
+from server.config import (
+    BATCH_RANK_MAX_CVS,
+    JOB_STORE_ENABLED,
+    JOB_STORE_FRESH_S,
+    JOB_STORE_REFRESH_LIMIT,
+    JOBS_DEDUP,
+    JOBS_LIST_DESCRIPTION_CHARS,
+    JOBS_LIST_DEADLINE_S,
+    MAX_JOBS_LIMIT,
+    REMOTIVE_SNAPSHOT,
+    SOURCE_BUDGETS_S,
+)
 from server.connectors.remotive import fetch_remotive_jobs
 from server.connectors.adzuna import fetch_adzuna_jobs
-from server.canonical.normalize import normalize_remotive, normalize_adzuna
+from server.connectors.cache import cache_drop, cache_key, cached_fetch
+from server.connectors.fanout import fan_out
+from server.connectors.job_store import ORDERS, get_job_store, refresh_key
+from server.connectors.remotive_snapshot import search_remotive_snapshot
+from server.canonical.dedup import dedup_jobs
+from server.canonical.job_model import JOB_FIELD_NAMES
+from server.canonical.normalize import normalize_jobs
+from server.canonical.raw_store import get_raw, raw_store_stats
 
 SUPPORTED_SOURCES = ["remotive", "adzuna"]
 
@@ -19,14 +39,14 @@ def tools_list() -> Dict[str, Any]:
                         "source": {"type": "string", "enum": SUPPORTED_SOURCES},
                         "query": {"type": "string"},
                         "location": {"type": "string"},
-                        "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+                        "limit": {"type": "integer", "minimum": 1, "maximum": MAX_JOBS_LIMIT},
                     },
                     "required": ["source", "query"],
                 },
             },
             {
                 "name": "jobs_normalize",
-                "description": "Normalize raw jobs into JobCanonical format.",
+                "description": "Normalize raw jobs into JobCanonical format (compact: the raw payload is not echoed back).",
                 "input_schema": {
                     "type": "object",
                     "properties": {
@@ -36,6 +56,15 @@ def tools_list() -> Dict[str, Any]:
                     "required": ["source", "raw"],
                 },
             },
+            {
+                "name": "job_raw",
+                "description": "Upstream payloads of jobs listed recently (kept server-side, not in jobs_list responses).",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {"ids": {"type": "array", "items": {"type": "string"}}},
+                    "required": ["ids"],
+                },
+            },
             {
                 "name": "jobs_list",
                 "description": "Fetch + normalize jobs from one or many sources.",
@@ -44,12 +73,33 @@ def tools_list() -> Dict[str, Any]:
                     "properties": {
                         "query": {"type": "string"},
                         "location": {"type": "string"},
-                        "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+                        "limit": {"type": "integer", "minimum": 1, "maximum": MAX_JOBS_LIMIT},
                         "sources": {
                             "type": "array",
                             "items": {"type": "string", "enum": SUPPORTED_SOURCES},
                         },
                         "skip_failed_sources": {"type": "boolean"},
+                        "deadline_s": {
+                            "type": "number",
+                            "description": "Overall deadline; sources still pending are reported in errors (partial results).",
+                        },
+                        "mode": {
+                            "type": "string",
+                            "enum": ["live", "store"],
+                            "description": "live: upstream APIs; store: local full-text index, upstream only to refresh it.",
+                        },
+                        "posted_since": {"type": "string", "description": "store mode: ISO date, e.g. 2024-05-01"},
+                        "dedup": {"type": "boolean", "description": "Merge duplicate / near-duplicate jobs (default on)"},
+                        "fields": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Job fields to return (id always included); all compact fields by default",
+                        },
+                        "description_chars": {
+                            "type": "integer",
+                            "description": f"Clip descriptions (default {JOBS_LIST_DESCRIPTION_CHARS}); -1 = full, 0 = omit",
+                        },
+                        "order": {"type": "string", "enum": list(ORDERS), "description": "store mode ordering"},
                     },
                     "required": ["query"],
                 },
@@ -77,16 +127,22 @@ def tools_list() -> Dict[str, Any]:
                 },
             },
             {
-                "name": "graph_rank",
-                "description": "Rank jobs for a CV using a graph-based model.",
+                "name": "jobs_extract_skills",
+                "description": "Batch skill extraction for many jobs in one call (results in input order).",
                 "input_schema": {
                     "type": "object",
                     "properties": {
-                        "cv_skills": {"type": "array", "items": {"type": "string"}},
-                        "jobs": {"type": "array", "items": {"type": "object"}},
-                        "top_k": {"type": "integer"},
+                        "jobs": {
+                            "type": "array",
+                            "description": (
+                                "Items with id and either text, or title/company/location/description. "
+                                "An item with only an id reuses the skills of that job if already extracted "
+                                "(null skills + listed in missing_ids otherwise)."
+                            ),
+                            "items": {"type": "object"},
+                        }
                     },
-                    "required": ["cv_skills", "jobs"],
+                    "required": ["jobs"],
                 },
             },
             {
@@ -98,9 +154,36 @@ def tools_list() -> Dict[str, Any]:
                         "cv_skills": {"type": "array", "items": {"type": "string"}},
                         "job_skills": {"type": "array", "items": {"type": "string"}},
                         "job": {"type": "object", "description": "Optional job info (title/company)"},
-                        "score": {"type": "number"}
+                        "score": {"type": "number"},
+                        "graph_id": {"type": "string", "description": "Handle from graph_build (instead of job_skills)"},
+                        "job_id": {"type": "string", "description": "Job of the stored graph to explain"}
                     },
-                    "required": ["cv_skills", "job_skills"],
+                    "required": ["cv_skills"],
+                },
+            },
+            {
+                "name": "match_explain_batch",
+                "description": "match_explain for many jobs of one CV in one call (e.g. the whole top-k), results in input order.",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "cv_skills": {"type": "array", "items": {"type": "string"}},
+                        "items": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "job_id": {"type": "string", "description": "Job of the stored graph (with graph_id)"},
+                                    "job_skills": {"type": "array", "items": {"type": "string"}},
+                                    "job": {"type": "object", "description": "Optional job info (title/company)"},
+                                    "score": {"type": "number"},
+                                },
+                            },
+                        },
+                        "graph_id": {"type": "string", "description": "Handle from graph_build: job_id items + default cv_skills"},
+                        "top_n": {"type": "integer", "minimum": 1, "description": "Skills listed per explanation text (default 6)"},
+                    },
+                    "required": ["items"],
                 },
             },
             {
@@ -116,6 +199,10 @@ def tools_list() -> Dict[str, Any]:
                         "jobs": {
                             "type": "array",
                             "description": "List of normalized jobs with fields: id, title, source, skills[]"
+                        },
+                        "return_graph": {
+                            "type": "boolean",
+                            "description": "Also return the node-link graph (default: only the graph_id handle)"
                         }
                     },
                     "required": ["cv_skills", "jobs"]
@@ -127,9 +214,13 @@ def tools_list() -> Dict[str, Any]:
                 "input_schema": {
                     "type": "object",
                     "properties": {
+                        "graph_id": {
+                            "type": "string",
+                            "description": "Handle returned by graph_build (graph kept server-side)"
+                        },
                         "graph": {
                             "type": "object",
-                            "description": "node-link graph produced by graph_build (nx.node_link_data)"
+                            "description": "Legacy: node-link graph (nx.node_link_data) when no graph_id"
                         },
                         "cv_skills": {
                             "type": "array",
@@ -141,9 +232,90 @@ def tools_list() -> Dict[str, Any]:
                             "maximum": 50
                         }
                     },
-                    "required": ["graph", "cv_skills"]
+                    "required": ["cv_skills"]
+                },
+            },
+            {
+                "name": "match_pipeline",
+                "description": "Whole matching chain server-side (fetch -> filter -> extract -> graph -> rank -> explain); returns only the top_k recommendations and per-stage timings.",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "cv_text": {"type": "string"},
+                        "cv_skills": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Already extracted CV skills (skips CV extraction)"
+                        },
+                        "role": {"type": "string"},
+                        "contract": {"type": "string", "enum": ["stage", "alternance", "cdi", "cdd"]},
+                        "location": {"type": "string"},
+                        "sources": {
+                            "type": "array",
+                            "items": {"type": "string", "enum": SUPPORTED_SOURCES},
+                        },
+                        "limit": {"type": "integer", "minimum": 1, "maximum": MAX_JOBS_LIMIT, "description": "Pool size"},
+                        "top_k": {"type": "integer", "minimum": 1, "maximum": 50},
+                        "query": {"type": "string", "description": "Upstream query (default: role)"},
+                        "strict_filters": {"type": "boolean"},
+                        "france_only": {"type": "boolean", "description": "Keep only jobs located in France (default true)"},
+                        "deadline_s": {"type": "number"},
+                        "description_chars": {
+                            "type": "integer",
+                            "description": "Description length returned per job (-1 = full)"
+                        },
+                        "with_relaxed": {
+                            "type": "boolean",
+                            "description": "Also return the relaxed scoring of the same pool (key 'relaxed')"
+                        },
+                        "session_id": {
+                            "type": "string",
+                            "description": "Client session: fetched jobs + skills are reused across calls of the same search"
+                        },
+                        "refresh_pool": {"type": "boolean", "description": "Ignore the session pool and fetch again"}
+                    },
+                },
+            },
+            {
+                "name": "match_batch_rank",
+                "description": "Rank one job pool for many CVs at once (sparse CV x job skill overlap, top_k per CV).",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "cvs": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "id": {"type": "string"},
+                                    "skills": {"type": "array", "items": {"type": "string"}},
+                                    "cv_text": {"type": "string"},
+                                },
+                            },
+                            "description": f"Up to {BATCH_RANK_MAX_CVS} CVs, each with skills or cv_text",
+                        },
+                        "graph_id": {"type": "string", "description": "Pool = jobs of a built graph"},
+                        "jobs": {
+                            "type": "array",
+                            "items": {"type": "object"},
+                            "description": "Pool = these jobs ({id, skills}, {id} already extracted, or job text fields)",
+                        },
+                        "query": {"type": "string", "description": "Pool = jobs_list of this search (when no graph_id / jobs)"},
+                        "location": {"type": "string"},
+                        "sources": {"type": "array", "items": {"type": "string", "enum": SUPPORTED_SOURCES}},
+                        "limit": {"type": "integer", "minimum": 1, "maximum": MAX_JOBS_LIMIT, "description": "Jobs per source (query pool)"},
+                        "france_only": {"type": "boolean", "description": "Query pool: keep only jobs located in France (default true)"},
+                        "top_k": {"type": "integer", "minimum": 1, "maximum": 100},
+                        "min_overlap": {"type": "integer", "minimum": 1, "description": "Skills a job must share with a CV"},
+                    },
+                    "required": ["cvs"],
                 },
             },
+            {
+                "name": "server_stats",
+                "description": "Runtime counters of the server (HTTP transport, upstream response cache, graph store, session pools).",
+                "input_schema": {"type": "object", "properties": {}},
+            },
         ]
     }
 
@@ -157,7 +329,11 @@ def _clean_limit(v: Any, default: int = 10) -> int:
         n = int(v)
     except Exception:
         n = default
-    return max(1, min(50, n))
+    return max(1, min(MAX_JOBS_LIMIT, n))
+
+
+# Fields of a jobs_extract_skills item that carry text to extract from
+_JOB_TEXT_FIELDS = {"text", "title", "company", "location", "description"}
 
 
 def _normalize_sources(v: Any) -> List[str]:
@@ -182,22 +358,259 @@ def _normalize_sources(v: Any) -> List[str]:
     return out or ["adzuna", "remotive"]
 
 
-def _fetch(source: str, query: str, location: str, limit: int) -> List[dict]:
+def _clean_deadline(v: Any, default: float) -> float:
+    try:
+        d = float(v)
+    except Exception:
+        d = default
+    return d if d > 0 else default
+
+
+def fetch_key(source: str, query: str, location: str, limit: int) -> str:
+    """Response cache key of an upstream search (Remotive ignores the location)."""
     if source == "remotive":
-        return fetch_remotive_jobs(query=query, limit=limit)
+        return cache_key(source, query=query, limit=limit)
     if source == "adzuna":
-        return fetch_adzuna_jobs(query=query, location=location, limit=limit)
+        return cache_key(source, query=query, location=location, limit=limit)
     raise ValueError(f"Unknown source: {source}")
 
 
-def _normalize(source: str, raw: List[dict]) -> List[dict]:
+def fetch_upstream(
+    source: str, query: str, location: str, limit: int, timeout: Optional[float] = None, errors: Optional[List[str]] = None
+) -> List[dict]:
+    """Raw upstream search, no cache. Pages lost after the first one are reported in `errors` (Adzuna)."""
     if source == "remotive":
-        return [normalize_remotive(j).__dict__ for j in raw]
+        return fetch_remotive_jobs(query=query, limit=limit, timeout=timeout or SOURCE_BUDGETS_S["remotive"])
     if source == "adzuna":
-        return [normalize_adzuna(j).__dict__ for j in raw]
+        return fetch_adzuna_jobs(
+            query=query, location=location, limit=limit, timeout=timeout or SOURCE_BUDGETS_S["adzuna"], errors=errors
+        )
     raise ValueError(f"Unknown source: {source}")
 
 
+def _fetch(
+    source: str, query: str, location: str, limit: int, timeout: Optional[float] = None, errors: Optional[List[str]] = None
+) -> List[dict]:
+    # Cached on normalized request params. A miss is fetched within the caller's budget;
+    # stale-while-revalidate refreshes run detached, with the default per-source budget.
+    # A partial response (some pages failed) is returned but not kept in the cache.
+    partial: List[str] = []
+    key = fetch_key(source, query, location, limit)
+    raw = cached_fetch(
+        source,
+        key,
+        lambda: fetch_upstream(source, query, location, limit, timeout=timeout, errors=partial),
+        refresher=lambda: fetch_upstream(source, query, location, limit),
+    )
+    if partial:
+        cache_drop(key)
+        if errors is not None:
+            errors.extend(partial)
+    return raw
+
+
+# Fields of a jobs_list job: JobCanonical + what dedup adds
+LIST_FIELDS = JOB_FIELD_NAMES + ("sources", "duplicate_ids", "urls")
+
+
+def _clean_fields(v: Any) -> Optional[List[str]]:
+    if v is None:
+        return None
+    if isinstance(v, str):
+        v = [p.strip() for p in v.split(",")]
+    if not isinstance(v, list):
+        raise ValueError("fields must be a list of field names")
+    out = [str(f).strip() for f in v if str(f).strip()]
+    unknown = [f for f in out if f not in LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {unknown}. Allowed: {list(LIST_FIELDS)}")
+    return out
+
+
+def project_jobs(jobs: List[dict], fields: Optional[List[str]], description_chars: int) -> List[dict]:
+    """
+    Response shape of listed jobs: `fields` only (id always kept; all fields when None),
+    description clipped to `description_chars` (-1 = full, 0 = omitted).
+    """
+    keep = ["id"] + [f for f in (fields or LIST_FIELDS) if f != "id"]
+    if description_chars == 0 and "description" in keep:
+        keep.remove("description")
+    out = []
+    for j in jobs:
+        p = {k: j[k] for k in keep if k in j}
+        if "description" in p and description_chars > 0:
+            p["description"] = (p["description"] or "")[:description_chars]
+        out.append(p)
+    return out
+
+
+def _fetch_normalized(
+    source: str, query: str, location: str, limit: int, timeout: Optional[float] = None, errors: Optional[List[str]] = None
+) -> List[dict]:
+    if source == "remotive" and REMOTIVE_SNAPSHOT:
+        try:
+            return search_remotive_snapshot(query, limit=limit, timeout=timeout)
+        except Exception:
+            # Snapshot unavailable (first download failed): fall back to a live query
+            pass
+    return normalize_jobs(source, _fetch(source, query, location, limit, timeout=timeout, errors=errors))
+
+
+def list_jobs(
+    query: str,
+    location: str,
+    limit: int,
+    sources: List[str],
+    skip_failed: bool = True,
+    deadline_s: float = JOBS_LIST_DEADLINE_S,
+    dedup: bool = JOBS_DEDUP,
+    store_sync: bool = False,
+) -> Dict[str, Any]:
+    """
+    jobs_list body: normalized jobs of every source, merged in the requested source order.
+
+    With `dedup`, duplicates (same title/company/city, or near-identical descriptions) are
+    merged into the first occurrence; count_by_source keeps the per-source counts before that.
+    Listed jobs are written to the job store in the background, unless `store_sync` (a store
+    refresh searches the store right after).
+    """
+    # Fan-out: every source is queried concurrently, wall time ~ max(source) instead of sum.
+    # A source that answered only in part (pages lost) keeps its jobs and is listed in errors.
+    partial: Dict[str, List[str]] = {s: [] for s in sources}
+    tasks = {
+        s: (lambda budget, s=s: _fetch_normalized(s, query, location, limit, timeout=budget, errors=partial[s]))
+        for s in sources
+    }
+    fan = fan_out(tasks, deadline_s=deadline_s, budgets=SOURCE_BUDGETS_S)
+
+    all_jobs: List[dict] = []
+    counts: Dict[str, int] = {}
+    errors: Dict[str, str] = {}
+
+    # Merge in the requested source order (stable output)
+    for s in sources:
+        if s in fan.results:
+            jobs = fan.results[s]
+            counts[s] = len(jobs)
+            all_jobs.extend(jobs)
+            if partial[s]:
+                errors[s] = "partial: " + "; ".join(partial[s])
+        else:
+            err = fan.errors.get(s) or RuntimeError(f"{s}: no result")
+            errors[s] = str(err)
+            counts[s] = 0
+            if not skip_failed:
+                raise err
+
+    if JOB_STORE_ENABLED and all_jobs:
+        try:
+            store = get_job_store()
+            if store_sync:
+                store.upsert(all_jobs)
+            else:
+                store.upsert_in_background(all_jobs)
+        except Exception:
+            pass  # the local store is best effort, never fails a listing
+
+    dedup_meta = None
+    if dedup and all_jobs:
+        all_jobs, dedup_meta = dedup_jobs(all_jobs)
+
+    return {
+        "sources": sources,
+        "query": query,
+        "location": location,
+        "count_by_source": counts,
+        "count_total": len(all_jobs),
+        "errors": errors,
+        "timed_out": fan.timed_out,
+        "elapsed_ms_by_source": fan.elapsed_ms,
+        "dedup": dedup_meta,
+        "jobs": all_jobs,
+    }
+
+
+def _refresh_store(query: str, location: str, sources: List[str], deadline_s: float) -> Dict[str, Any]:
+    """Upstream search stored in the job store (list_jobs upserts); marks the sources that answered."""
+    listed = list_jobs(
+        query, location, JOB_STORE_REFRESH_LIMIT, sources, skip_failed=True, deadline_s=deadline_s, dedup=False, store_sync=True
+    )
+    store = get_job_store()
+    for s in sources:
+        if s not in listed["errors"]:
+            store.mark_refreshed(s, query, location, listed["count_by_source"].get(s, 0))
+    return listed
+
+
+def list_jobs_from_store(
+    query: str,
+    location: str,
+    limit: int,
+    sources: List[str],
+    skip_failed: bool = True,
+    deadline_s: float = JOBS_LIST_DEADLINE_S,
+    posted_since: Optional[str] = None,
+    order: str = "relevance",
+    dedup: bool = JOBS_DEDUP,
+) -> Dict[str, Any]:
+    """
+    jobs_list answered from the local job store (full-text index), same output as list_jobs.
+
+    Upstream APIs are only used for freshness: a search never stored is fetched first
+    (synchronously), one older than JOB_STORE_FRESH_S is refreshed in the background.
+    """
+    store = get_job_store()
+    ages = {s: store.refresh_age(s, query, location) for s in sources}
+    missing = [s for s in sources if ages[s] is None]
+    stale = [s for s in sources if ages[s] is not None and ages[s] > JOB_STORE_FRESH_S]
+
+    errors: Dict[str, str] = {}
+    timed_out: List[str] = []
+    if missing:
+        listed = _refresh_store(query, location, missing, deadline_s)
+        errors, timed_out = dict(listed["errors"]), list(listed["timed_out"])
+        if errors and not skip_failed:
+            raise RuntimeError(f"Upstream refresh failed: {errors}")
+    refreshing = [
+        s for s in stale
+        if store.refresh_in_background(
+            refresh_key(s, query, location), lambda s=s: _refresh_store(query, location, [s], JOBS_LIST_DEADLINE_S)
+        )
+    ]
+
+    all_jobs: List[dict] = []
+    counts: Dict[str, int] = {}
+    elapsed: Dict[str, float] = {}
+    for s in sources:
+        t0 = time.perf_counter()
+        jobs = store.search(query, s, location=location, limit=limit, posted_since=posted_since, order=order)
+        elapsed[s] = round((time.perf_counter() - t0) * 1000, 2)
+        counts[s] = len(jobs)
+        all_jobs.extend(jobs)
+
+    dedup_meta = None
+    if dedup and all_jobs:
+        all_jobs, dedup_meta = dedup_jobs(all_jobs)
+
+    return {
+        "sources": sources,
+        "query": query,
+        "location": location,
+        "count_by_source": counts,
+        "count_total": len(all_jobs),
+        "errors": errors,
+        "timed_out": timed_out,
+        "elapsed_ms_by_source": elapsed,
+        "dedup": dedup_meta,
+        "store": {
+            "fetched_upstream": missing,
+            "refreshing": refreshing,
+            "age_s": {s: round(a, 1) if a is not None else None for s, a in ages.items()},
+        },
+        "jobs": all_jobs,
+    }
+
+
 def tool_call(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
     # Defensive defaults
     arguments = arguments or {}
@@ -220,9 +633,19 @@ def tool_call(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
             raise ValueError(f"Unsupported source: {source}. Allowed: {SUPPORTED_SOURCES}")
 
         raw = arguments.get("raw", []) or []
-        jobs = _normalize(source, raw)
+        jobs = normalize_jobs(source, raw)
         return {"source": source, "count": len(jobs), "jobs": jobs}
 
+    if name == "job_raw":
+        ids = [str(i) for i in (arguments.get("ids") or []) if i]
+        found, missing = get_raw(ids)
+        if missing and REMOTIVE_SNAPSHOT:
+            from server.connectors.remotive_snapshot import get_snapshot
+
+            found.update(get_snapshot().raw(missing))
+            missing = [i for i in missing if i not in found]
+        return {"raw": found, "count": len(found), "missing_ids": missing}
+
     if name == "jobs_list":
         query = _clean_str(arguments.get("query"))
         # Remotive search can be strict; default to a broader query if empty.
@@ -233,60 +656,104 @@ def tool_call(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         limit = _clean_limit(arguments.get("limit"), default=10)
         sources = _normalize_sources(arguments.get("sources"))
         skip_failed = bool(arguments.get("skip_failed_sources", True))
-
-        all_jobs: List[dict] = []
-        counts: Dict[str, int] = {}
-        errors: Dict[str, str] = {}
-
-        for s in sources:
-            try:
-                raw = _fetch(s, query, location, limit)
-                jobs = _normalize(s, raw)
-                counts[s] = len(jobs)
-                all_jobs.extend(jobs)
-            except Exception as e:
-                errors[s] = str(e)
-                counts[s] = 0
-                if not skip_failed:
-                    raise
-
-        return {
-            "sources": sources,
-            "query": query,
-            "location": location,
-            "count_by_source": counts,
-            "count_total": len(all_jobs),
-            "errors": errors,
-            "jobs": all_jobs,
-        }
+        deadline_s = _clean_deadline(arguments.get("deadline_s"), JOBS_LIST_DEADLINE_S)
+
+        dedup = bool(arguments.get("dedup", JOBS_DEDUP))
+        fields = _clean_fields(arguments.get("fields"))
+        description_chars = int(arguments.get("description_chars", JOBS_LIST_DESCRIPTION_CHARS))
+        mode = _clean_str(arguments.get("mode")).lower() or "live"
+        if mode == "store":
+            if not JOB_STORE_ENABLED:
+                raise ValueError("Job store disabled (JOB_STORE=0)")
+            order = _clean_str(arguments.get("order")).lower() or "relevance"
+            if order not in ORDERS:
+                raise ValueError(f"Unsupported order: {order}. Allowed: {list(ORDERS)}")
+            listed = list_jobs_from_store(
+                query, location, limit, sources, skip_failed=skip_failed, deadline_s=deadline_s,
+                posted_since=_clean_str(arguments.get("posted_since")) or None, order=order, dedup=dedup,
+            )
+        elif mode == "live":
+            listed = list_jobs(query, location, limit, sources, skip_failed=skip_failed, deadline_s=deadline_s, dedup=dedup)
+        else:
+            raise ValueError(f"Unsupported mode: {mode}. Allowed: ['live', 'store']")
+        listed["jobs"] = project_jobs(listed["jobs"], fields, description_chars)
+        return listed
 
     if name == "cv_extract_skills":
         from server.cv.extract_skills import extract_skills_with_meta
+        from server.cv.skill_memo import extract_skills_memo
 
         text = arguments.get("text") or ""
-        return extract_skills_with_meta(text)
+        return extract_skills_with_meta(text, extractor=extract_skills_memo)
 
     if name == "job_extract_skills":
         from server.cv.extract_skills import extract_skills_with_meta
+        from server.cv.skill_memo import extract_skills_memo
 
         text = arguments.get("text") or ""
-        return extract_skills_with_meta(text)
+        return extract_skills_with_meta(text, extractor=extract_skills_memo)
+
+    if name == "jobs_extract_skills":
+        from server.cv.extract_skills import job_text
+        from server.cv.skill_memo import extract_skills_memo_batch, skills_for_job_ids
+
+        items = [j for j in (arguments.get("jobs") or []) if isinstance(j, dict)]
+        # Items with only an id: skills recorded for that job (no text sent, nothing extracted)
+        id_only = [i for i, j in enumerate(items) if j.get("id") and not (set(j) & _JOB_TEXT_FIELDS)]
+        id_only_set = set(id_only)
+        with_text = [i for i in range(len(items)) if i not in id_only_set]
+
+        skills: List[Any] = [None] * len(items)
+        for i, sk in zip(id_only, skills_for_job_ids([str(items[i]["id"]) for i in id_only])):
+            skills[i] = sk
+        texts = [items[i]["text"] if isinstance(items[i].get("text"), str) else job_text(items[i]) for i in with_text]
+        ids = [str(items[i]["id"]) if items[i].get("id") else None for i in with_text]
+        for i, sk in zip(with_text, extract_skills_memo_batch(texts, ids)):
+            skills[i] = sk
+
+        return {
+            "results": [
+                {"id": j.get("id"), "skills": sk, "count": len(sk) if sk is not None else 0}
+                for j, sk in zip(items, skills)
+            ],
+            "count": len(items),
+            "missing_ids": [items[i].get("id") for i in id_only if skills[i] is None],
+            "method": "keyword_dictionary_mvp",
+        }
 
     if name == "graph_build":
-        from server.graph.build_graph import build_skill_job_graph
+        from server.graph.csr import build_csr_graph
+        from server.graph.store import graph_entry, put_graph
 
         cv_skills = arguments.get("cv_skills") or []
         jobs = arguments.get("jobs") or []
 
-        return build_skill_job_graph(cv_skills=cv_skills, jobs=jobs)
+        G, summary = build_csr_graph(cv_skills=cv_skills, jobs=jobs)
+        graph_id = put_graph(graph_entry(G, cv_skills, jobs, summary))
+        out: Dict[str, Any] = {"graph_id": graph_id, "summary": summary}
+        if arguments.get("return_graph"):
+            # node-link JSON built on demand from the compact graph
+            out["graph"] = G.node_link_data()
+        return out
 
     if name == "graph_rank":
         from server.graph.rank import rank_jobs_from_graph
+        from server.graph.store import get_graph
 
-        graph_obj = arguments.get("graph") or {}
         cv_skills = arguments.get("cv_skills") or []
         top_k = arguments.get("top_k", 10)
 
+        graph_id = _clean_str(arguments.get("graph_id"))
+        if graph_id:
+            from server.graph.ppr_basis import PprBasis, basis_for
+
+            # Per-skill PPR vectors cached with the graph when cheap (re-ranking = sum + top-k);
+            # big graphs are ranked with one walk, as without a basis
+            entry = get_graph(graph_id)
+            basis = basis_for(entry, graph_id, lambda: PprBasis.from_graph(entry["graph"]))
+            return basis.rank(cv_skills, top_k=top_k)
+
+        graph_obj = arguments.get("graph") or {}
         return rank_jobs_from_graph(graph_node_link=graph_obj, seed_skills=cv_skills, top_k=top_k)
 
     if name == "match_explain":
@@ -297,6 +764,125 @@ def tool_call(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         job = arguments.get("job") or None
         score = arguments.get("score")
 
+        graph_id = _clean_str(arguments.get("graph_id"))
+        if graph_id and not job_skills:
+            from server.graph.store import get_graph
+
+            entry = get_graph(graph_id)
+            stored = entry["jobs"].get(_clean_str(arguments.get("job_id")))
+            if stored is None:
+                raise ValueError(f"Unknown job_id for graph {graph_id}: {arguments.get('job_id')}")
+            job_skills = stored.get("skills") or []
+            job = job or {"title": stored.get("title"), "company": stored.get("company")}
+            cv_skills = cv_skills or entry["cv_skills"]
+
         return explain_match(cv_skills=cv_skills, job_skills=job_skills, job=job, score=score)
 
+    if name == "match_explain_batch":
+        from server.graph.explain import explain_matches
+
+        cv_skills = arguments.get("cv_skills") or []
+        items = [it for it in (arguments.get("items") or []) if isinstance(it, dict)]
+        top_n = max(1, int(arguments.get("top_n") or 6))
+
+        graph_id = _clean_str(arguments.get("graph_id"))
+        stored_jobs: Dict[str, Any] = {}
+        if graph_id:
+            from server.graph.store import get_graph
+
+            entry = get_graph(graph_id)
+            stored_jobs = entry["jobs"]
+            cv_skills = cv_skills or entry["cv_skills"]
+
+        # Items: {job_skills, job?, score?} or {job_id, score?} resolved from the stored graph
+        batch: List[Dict[str, Any]] = []
+        missing_ids: List[str] = []
+        for it in items:
+            job_skills = it.get("job_skills")
+            job = it.get("job") or None
+            job_id = _clean_str(it.get("job_id"))
+            if job_skills is None and job_id:
+                stored = stored_jobs.get(job_id)
+                if stored is None:
+                    missing_ids.append(job_id)
+                else:
+                    job_skills = stored.get("skills") or []
+                    job = job or {"title": stored.get("title"), "company": stored.get("company")}
+            batch.append({"job_id": job_id or None, "job_skills": job_skills or [], "job": job, "score": it.get("score")})
+
+        explanations = explain_matches(cv_skills, batch, top_n=top_n)
+        return {
+            "explanations": [dict(e, job_id=b["job_id"]) for b, e in zip(batch, explanations)],
+            "count": len(explanations),
+            "missing_job_ids": missing_ids,
+        }
+
+    if name == "match_pipeline":
+        from server.matching.pipeline import DEFAULT_DESCRIPTION_CHARS, run_match_pipeline
+
+        cv_skills = arguments.get("cv_skills")
+        return run_match_pipeline(
+            cv_text=arguments.get("cv_text") or "",
+            cv_skills=[str(s) for s in cv_skills] if isinstance(cv_skills, list) else None,
+            role=_clean_str(arguments.get("role")) or "data analyst",
+            contract=_clean_str(arguments.get("contract")).lower() or None,
+            location=_clean_str(arguments.get("location")) or "Paris",
+            sources=_normalize_sources(arguments.get("sources")),
+            limit=_clean_limit(arguments.get("limit"), default=10),
+            top_k=max(1, min(50, int(arguments.get("top_k") or 3))),
+            query=_clean_str(arguments.get("query")) or None,
+            strict_filters=bool(arguments.get("strict_filters", True)),
+            france_only=bool(arguments.get("france_only", True)),
+            deadline_s=_clean_deadline(arguments.get("deadline_s"), JOBS_LIST_DEADLINE_S),
+            description_chars=int(arguments.get("description_chars", DEFAULT_DESCRIPTION_CHARS)),
+            with_relaxed=bool(arguments.get("with_relaxed", False)),
+            session_id=_clean_str(arguments.get("session_id")) or None,
+            refresh_pool=bool(arguments.get("refresh_pool", False)),
+        )
+
+    if name == "match_batch_rank":
+        from server.matching.batch_rank import run_batch_rank
+
+        cvs = arguments.get("cvs") or []
+        if not isinstance(cvs, list) or not cvs:
+            raise ValueError("cvs must be a non-empty list of {id, skills} or {id, cv_text}")
+        if len(cvs) > BATCH_RANK_MAX_CVS:
+            raise ValueError(f"Too many CVs: {len(cvs)} > {BATCH_RANK_MAX_CVS}")
+        cvs = [c if isinstance(c, dict) else {"skills": c} for c in cvs]
+        return run_batch_rank(
+            cvs,
+            jobs=arguments.get("jobs") or None,
+            graph_id=_clean_str(arguments.get("graph_id")) or None,
+            query=_clean_str(arguments.get("query")) or None,
+            location=_clean_str(arguments.get("location")) or "Paris",
+            sources=_normalize_sources(arguments.get("sources")),
+            limit=_clean_limit(arguments.get("limit"), default=50),
+            france_only=bool(arguments.get("france_only", True)),
+            top_k=max(1, min(100, int(arguments.get("top_k") or 10))),
+            min_overlap=max(1, int(arguments.get("min_overlap") or 1)),
+        )
+
+    if name == "server_stats":
+        from server.connectors.cache import cache_stats
+        from server.connectors.remotive_snapshot import get_snapshot
+        from server.crawler import crawler_stats
+        from server.cv.skill_memo import skill_memo_stats
+        from server.cv.vocab import vocab_stats
+        from server.graph.store import graph_store_stats
+        from server.matching.pool_cache import pool_cache_stats
+        from server.utils.http import transport_stats
+
+        return {
+            "http": transport_stats(),
+            "cache": cache_stats(),
+            "remotive_snapshot": get_snapshot().stats() if REMOTIVE_SNAPSHOT else None,
+            "graph_store": graph_store_stats(),
+            "pool_cache": pool_cache_stats(),
+            "skill_memo": skill_memo_stats(),
+            "skill_vocab": vocab_stats(),
+            "job_store": get_job_store().stats() if JOB_STORE_ENABLED else None,
+            "crawler": crawler_stats(),
+            "raw_store": raw_store_stats(),
+        }
+
     raise ValueError(f"Unknown tool: {name}")
\ No newline at end of file
@@ -1,52 +1,223 @@
-import json
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from typing import Any, Dict, Optional
 
+from server.config import (
+    CRAWLER_IN_SERVER,
+    MCP_BATCH_WORKERS,
+    MCP_KEEPALIVE_TIMEOUT_S,
+    MCP_MAX_CONCURRENCY,
+    MCP_QUEUE_WAIT_S,
+    MCP_RETRY_AFTER_S,
+    MCP_THREADED,
+)
+from server.cv.extract_skills import start_process_pool
 from server.mcp.tools import tools_list, tool_call
 from server.mcp.resources import resource_read
+from server.utils.codec import accepts_gzip, decode_body, encode_body
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+SERVER_BUSY = -32000
+
+_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, MCP_BATCH_WORKERS), thread_name_prefix="rpc-batch")
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _error(rid: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": rid, "error": {"code": code, "message": message}}
+
+
+def dispatch(method: Any, params: Dict[str, Any]) -> Any:
+    if method == "initialize":
+        return {"name": "mcp_job_matcher", "version": "0.1"}
+    if method == "tools/list":
+        return tools_list()
+    if method == "tools/call":
+        name = params.get("name")
+        arguments = params.get("arguments", {}) or {}
+        return tool_call(name, arguments)
+    if method == "resources/read":
+        uri = params.get("uri")
+        arguments = params.get("arguments", {}) or {}
+        return resource_read(uri, arguments)
+    raise RpcError(METHOD_NOT_FOUND, f"Unknown method: {method}")
+
+
+def handle_request(req: Any) -> Optional[Dict[str, Any]]:
+    """One JSON-RPC request object -> response object (None for a notification, i.e. no "id")."""
+    if not isinstance(req, dict) or not isinstance(req.get("method"), str):
+        return _error(req.get("id") if isinstance(req, dict) else None, INVALID_REQUEST, "Invalid Request")
+    rid = req.get("id")
+    try:
+        result = dispatch(req["method"], req.get("params", {}) or {})
+    except RpcError as e:
+        out = _error(rid, e.code, str(e))
+    except Exception as e:
+        out = _error(rid, INTERNAL_ERROR, str(e))
+    else:
+        out = {"jsonrpc": "2.0", "id": rid, "result": result}
+    return out if "id" in req else None
+
+
+def handle_payload(payload: Any) -> Any:
+    """
+    Single request -> response object; batch (JSON array) -> array of responses, same order.
+
+    Batch entries are independent and run concurrently; notifications get no entry, so an
+    all-notification batch returns None.
+    """
+    if not isinstance(payload, list):
+        return handle_request(payload)
+    if not payload:
+        return _error(None, INVALID_REQUEST, "Invalid Request: empty batch")
+    if len(payload) == 1:
+        responses = [handle_request(payload[0])]
+    else:
+        responses = list(_BATCH_EXECUTOR.map(handle_request, payload))
+    responses = [r for r in responses if r is not None]
+    return responses or None
+
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds the number of requests executed at the same time.
+
+    Connections are cheap (one idle thread each, closed after the keep-alive timeout);
+    what is bounded is the work. A request waits up to `wait_s` for a slot, then is
+    rejected so the client can retry instead of piling up behind slow upstream calls.
+    """
+
+    def __init__(self, max_concurrency: int = MCP_MAX_CONCURRENCY, wait_s: float = MCP_QUEUE_WAIT_S):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.wait_s = max(0.0, float(wait_s))
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.served = 0
+        self.rejected = 0
+
+    def acquire(self) -> bool:
+        if not self._slots.acquire(timeout=self.wait_s):
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.served += 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "served": self.served,
+            "rejected": self.rejected,
+        }
+
 
 class Handler(BaseHTTPRequestHandler):
-    def _send(self, code: int, payload: dict):
-        body = json.dumps(payload).encode("utf-8")
+    # HTTP/1.1: connections stay open between requests (keep-alive) unless the client closes them
+    protocol_version = "HTTP/1.1"
+    timeout = MCP_KEEPALIVE_TIMEOUT_S
+
+    def _send(self, code: int, payload: dict, headers: Optional[Dict[str, str]] = None):
+        body, encoding = encode_body(payload, gzip_ok=accepts_gzip(self.headers.get("Accept-Encoding")))
         self.send_response(code)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
         self.end_headers()
         self.wfile.write(body)
 
     def do_POST(self):
+        # Always consume the body, so the connection can be reused for the next request
+        length = int(self.headers.get("Content-Length", "0"))
+        raw = self.rfile.read(length)
         if self.path != "/rpc":
             return self._send(404, {"error": "not found"})
-        length = int(self.headers.get("Content-Length", "0"))
-        raw = self.rfile.read(length).decode("utf-8")
+
+        limiter: Optional[ConcurrencyLimiter] = getattr(self.server, "limiter", None)
+        if limiter is not None and not limiter.acquire():
+            return self._send(
+                503,
+                _error(None, SERVER_BUSY, "server busy, retry later"),
+                headers={"Retry-After": str(MCP_RETRY_AFTER_S)},
+            )
         try:
-            req = json.loads(raw)
-            method = req.get("method")
-            params = req.get("params", {}) or {}
-            rid = req.get("id")
-
-            if method == "initialize":
-                result = {"name": "mcp_job_matcher", "version": "0.1"}
-            elif method == "tools/list":
-                result = tools_list()
-            elif method == "tools/call":
-                name = params.get("name")
-                arguments = params.get("arguments", {}) or {}
-                result = tool_call(name, arguments)
-            elif method == "resources/read":
-                uri = params.get("uri")
-                arguments = params.get("arguments", {}) or {}
-                result = resource_read(uri, arguments)
-            else:
-                raise ValueError(f"Unknown method: {method}")
-
-            self._send(200, {"jsonrpc": "2.0", "id": rid, "result": result})
-
-        except Exception as e:
-            self._send(200, {"jsonrpc": "2.0", "id": None, "error": {"message": str(e)}})
+            try:
+                payload = decode_body(raw, self.headers.get("Content-Encoding"))
+            except ValueError as e:
+                return self._send(200, _error(None, PARSE_ERROR, f"Parse error: {e}"))
+            out = handle_payload(payload)
+            if out is None:
+                # Notifications only: nothing to answer
+                self.send_response(204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send(200, out)
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+
+class _SerialHandler(Handler):
+    # One request at a time: a kept-alive client would block everybody else
+    protocol_version = "HTTP/1.0"
+
+
+class MCPServer(ThreadingHTTPServer):
+    """Thread per connection, at most `max_concurrency` requests executing (see ConcurrencyLimiter)."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, handler=Handler, max_concurrency: int = MCP_MAX_CONCURRENCY, queue_wait_s: float = MCP_QUEUE_WAIT_S):
+        super().__init__(address, handler)
+        self.limiter = ConcurrencyLimiter(max_concurrency, queue_wait_s)
+
+
+class _SerialServer(HTTPServer):
+    request_queue_size = MCPServer.request_queue_size
+
+
+def make_server(host="127.0.0.1", port=8765, threaded: bool = MCP_THREADED, max_concurrency: int = MCP_MAX_CONCURRENCY) -> HTTPServer:
+    if threaded:
+        return MCPServer((host, port), Handler, max_concurrency=max_concurrency)
+    return _SerialServer((host, port), _SerialHandler)
+
 
 def main(host="127.0.0.1", port=8765):
-    print(f"[MCP] HTTP JSON-RPC listening on http://{host}:{port}/rpc")
-    HTTPServer((host, port), Handler).serve_forever()
+    start_process_pool()
+    server = make_server(host, port)
+    mode = f"threaded, max {server.limiter.max_concurrency} concurrent" if isinstance(server, MCPServer) else "serial"
+    print(f"[MCP] HTTP JSON-RPC listening on http://{host}:{port}/rpc ({mode})")
+    if CRAWLER_IN_SERVER:
+        from server.crawler import start_crawler
+
+        crawler = start_crawler()
+        print(f"[MCP] crawler: {len(crawler.cells)} cells every {crawler.interval_s:.0f}s")
+    server.serve_forever()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
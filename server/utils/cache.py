@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+FRESH = "fresh"
+STALE = "stale"
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+
+    - `max_entries` bounds the size (least recently used entries are evicted first).
+    - `ttl_s` is the default time-to-live; `set(..., ttl_s=...)` overrides it per entry.
+    - `stale_s` keeps expired entries around for that long so callers can serve them
+      as "stale" (stale-while-revalidate) via `lookup`; `get` only returns fresh values.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_s: Optional[float] = None, stale_s: float = 0.0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = ttl_s
+        self.stale_s = max(0.0, float(stale_s))
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def lookup(self, key: Hashable) -> Tuple[Any, Optional[str]]:
+        """Return (value, FRESH|STALE) or (None, None) on miss."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None, None
+            value, _, expires_at = item
+            if expires_at is not None and now >= expires_at:
+                if now >= expires_at + self.stale_s:
+                    del self._data[key]
+                    self.expirations += 1
+                    self.misses += 1
+                    return None, None
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                return value, STALE
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value, FRESH
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value, state = self.lookup(key)
+        return value if state == FRESH else default
+
+    def set(self, key: Hashable, value: Any, ttl_s: Optional[float] = None) -> None:
+        ttl = self.ttl_s if ttl_s is None else ttl_s
+        now = time.monotonic()
+        expires_at = (now + ttl) if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, now, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return item[0] if item is not None else default
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Snapshot of (key, value), least recently used first (expiry not checked)."""
+        with self._lock:
+            return [(k, item[0]) for k, item in self._data.items()]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,105 @@
+import gzip
+import json
+import logging
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from server.config import MCP_GZIP_LEVEL, MCP_GZIP_MIN_BYTES, MCP_JSON_CODEC
+
+# JSON codec of the RPC wire: orjson or msgspec when installed (several times faster than the
+# stdlib on big jobs_list / graph_build responses), stdlib json otherwise. Same JSON either way,
+# so clients and server can use different codecs.
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    return json.loads(data)
+
+
+def _codecs() -> Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    out: Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {}
+    if orjson is not None:
+        opts = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        out["orjson"] = (lambda obj: orjson.dumps(obj, option=opts), orjson.loads)
+    if msgspec is not None:
+        encoder, decoder = msgspec.json.Encoder(), msgspec.json.Decoder()
+        out["msgspec"] = (encoder.encode, decoder.decode)
+    out["json"] = (_json_dumps, _json_loads)
+    return out
+
+
+CODECS = _codecs()
+
+
+def _pick(name: str) -> str:
+    if name in CODECS:
+        return name
+    if name not in ("", "auto"):
+        logger.warning("JSON codec %s unavailable, using %s", name, next(iter(CODECS)))
+    return next(iter(CODECS))
+
+
+CODEC = _pick(MCP_JSON_CODEC)
+_dumps, _loads = CODECS[CODEC]
+
+
+def dumps(obj: Any) -> bytes:
+    """UTF-8 JSON bytes; falls back to the stdlib for what the fast codec refuses (e.g. ints > 64 bits)."""
+    try:
+        return _dumps(obj)
+    except TypeError:
+        return _json_dumps(obj)
+
+
+def loads(data: Any) -> Any:
+    """bytes or str -> object. Raises ValueError on invalid JSON, whatever the codec."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    try:
+        return _loads(data)
+    except ValueError:
+        raise
+    except Exception as e:  # msgspec.DecodeError is not a ValueError
+        raise ValueError(str(e)) from e
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """True if an Accept-Encoding header allows gzip (q=0 refuses it)."""
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def encode_body(obj: Any, gzip_ok: bool = False, min_bytes: int = MCP_GZIP_MIN_BYTES) -> Tuple[bytes, Optional[str]]:
+    """(body, content-encoding): gzip only when allowed and the body is at least `min_bytes`."""
+    body = dumps(obj)
+    if gzip_ok and min_bytes >= 0 and len(body) >= min_bytes:
+        return gzip.compress(body, compresslevel=MCP_GZIP_LEVEL), "gzip"
+    return body, None
+
+
+def decode_body(body: bytes, content_encoding: Optional[str] = None) -> Any:
+    """Body of a request/response -> object (gunzipped first if needed); ValueError if unreadable."""
+    if (content_encoding or "").strip().lower() == "gzip":
+        try:
+            body = gzip.decompress(body)
+        except (OSError, EOFError, zlib.error) as e:
+            raise ValueError(f"bad gzip body: {e}") from e
+    return loads(body)
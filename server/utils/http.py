@@ -1,6 +1,159 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from server.config import (
+    HTTP_BACKOFF_S,
+    HTTP_CONNECT_TIMEOUT_S,
+    HTTP_HOST_TIMEOUTS_S,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_MAXSIZE,
+    HTTP_POOL_SIZES,
+    HTTP_RETRY_AFTER_MAX_S,
+)
+
+# Transient upstream statuses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_TIMEOUT_S = 20.0
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_counters: Dict[str, int] = {
+    "requests": 0,
+    "retries": 0,
+    "errors": 0,
+    "bytes_wire": 0,
+    "bytes_decoded": 0,
+}
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _lock:
+        _counters[key] += n
+
+
+def get_session() -> requests.Session:
+    """Process-wide pooled session (keep-alive, one connection pool per host)."""
+    global _session
+    if _session is not None:
+        return _session
+    with _lock:
+        if _session is None:
+            s = requests.Session()
+            s.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+            default = HTTPAdapter(pool_connections=16, pool_maxsize=HTTP_POOL_MAXSIZE)
+            s.mount("https://", default)
+            s.mount("http://", default)
+            # Hosts with a dedicated pool size
+            for host, size in HTTP_POOL_SIZES.items():
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+                s.mount(f"https://{host}/", adapter)
+                s.mount(f"http://{host}/", adapter)
+            _session = s
+    return _session
+
+
+def _host_timeout(url: str, timeout: Optional[float]) -> float:
+    host = (urlsplit(url).hostname or "").lower()
+    candidates = [t for t in (timeout, HTTP_HOST_TIMEOUTS_S.get(host)) if t]
+    return float(min(candidates)) if candidates else DEFAULT_TIMEOUT_S
+
+
+def _retry_after_s(resp: requests.Response) -> Optional[float]:
+    value = (resp.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def _backoff_s(attempt: int) -> float:
+    # Full jitter: uniform in [0, base * 2^attempt]
+    return random.uniform(0, HTTP_BACKOFF_S * (2 ** attempt))
+
+
+def get_json(url: str, params: dict | None = None, timeout: float | None = None) -> dict:
+    """
+    GET + JSON decode through the shared pooled session.
+
+    `timeout` is the caller budget for the whole call (retries included); it is capped
+    by the per-host timeout. 429/5xx and connection errors are retried with jittered
+    backoff, honoring Retry-After, as long as the budget allows it.
+    """
+    budget = _host_timeout(url, timeout)
+    t0 = time.monotonic()
+    session = get_session()
+
+    attempt = 0
+    while True:
+        remaining = budget - (time.monotonic() - t0)
+        _count("requests")
+        try:
+            r = session.get(
+                url,
+                params=params,
+                timeout=(max(0.1, min(HTTP_CONNECT_TIMEOUT_S, remaining)), max(0.1, remaining)),
+            )
+        except requests.ConnectionError:
+            _count("errors")
+            wait_s = _backoff_s(attempt)
+            if attempt >= HTTP_MAX_RETRIES or (time.monotonic() - t0) + wait_s >= budget:
+                raise
+        else:
+            if r.status_code not in RETRY_STATUSES:
+                payload = r.content
+                _count("bytes_decoded", len(payload))
+                _count("bytes_wire", int(r.raw.tell() or len(payload)))
+                r.raise_for_status()
+                return r.json()
+
+            _count("errors")
+            wait_s = _retry_after_s(r)
+            wait_s = min(wait_s, HTTP_RETRY_AFTER_MAX_S) if wait_s is not None else _backoff_s(attempt)
+            if attempt >= HTTP_MAX_RETRIES or (time.monotonic() - t0) + wait_s >= budget:
+                r.raise_for_status()
+
+        _count("retries")
+        attempt += 1
+        time.sleep(wait_s)
+
+
+def transport_stats() -> Dict[str, Any]:
+    """Counters of the shared transport (connections opened vs reused, retries, bytes)."""
+    with _lock:
+        out: Dict[str, Any] = dict(_counters)
+
+    opened = 0
+    pooled_requests = 0
+    hosts: Dict[str, Dict[str, int]] = {}
+    if _session is not None:
+        adapters = {id(a): a for a in _session.adapters.values()}.values()
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened += pool.num_connections
+                pooled_requests += pool.num_requests
+                hosts[f"{pool.scheme}://{pool.host}"] = {
+                    "opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                }
 
-def get_json(url: str, params: dict | None = None, timeout: int = 20) -> dict:
-    r = requests.get(url, params=params, timeout=timeout)
-    r.raise_for_status()
-    return r.json()
\ No newline at end of file
+    out["connections_opened"] = opened
+    out["connections_reused"] = max(0, pooled_requests - opened)
+    out["hosts"] = hosts
+    return out
@@ -1,7 +1,12 @@
+import gzip
+import itertools
 import json
 import os
 import re
+import urllib.error
 import urllib.request
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -163,6 +168,7 @@ DEFAULT_LOCATION = os.getenv("LOCATION", "Paris")
 DEFAULT_SOURCES = os.getenv("SOURCES", "adzuna,remotive")
 DEFAULT_LIMIT = int(os.getenv("LIMIT", "20"))
 DEFAULT_TOP_K = int(os.getenv("TOP_K", "5"))
+FALLBACK_PARALLELISM = int(os.getenv("FALLBACK_PARALLELISM", "2"))  # fallback queries in flight, once the first is empty
 
 
 CV_TEXT_FALLBACK = os.getenv("CV_TEXT", "Python SQL Docker Airflow Power BI")
@@ -174,6 +180,28 @@ DEFAULT_COUNTRY = os.getenv("COUNTRY", "France")
 # -----------------------------
 # MCP Client
 # -----------------------------
+try:
+    import orjson  # optional: much faster on big responses (jobs_list, graph_build)
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(body: bytes) -> Any:
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _read_body(resp: Any) -> Any:
+    """Decoded JSON body of an RPC response (the server gzips large ones)."""
+    body = resp.read()
+    if (resp.headers.get("Content-Encoding") or "").lower() == "gzip":
+        body = gzip.decompress(body)
+    return _json_loads(body)
+
+
 class McpError(RuntimeError):
     pass
 
@@ -184,44 +212,86 @@ class McpClient:
         self.timeout_s = timeout_s
         self.retries = retries
         self.backoff_s = backoff_s
-        self._id = 0
+        self._ids = itertools.count(1)  # thread-safe ids (fallback queries run concurrently)
 
-    def _rpc(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _post(self, payload: Any) -> Any:
+        """POST one JSON-RPC payload (object or batch array), with retries; returns the decoded body."""
         import time
 
         last_exc: Exception | None = None
+        data = _json_dumps(payload)
 
         for attempt in range(self.retries + 1):
-            self._id += 1
-            payload = {"jsonrpc": "2.0", "id": self._id, "method": method, "params": params or {}}
-            data = json.dumps(payload).encode("utf-8")
-            req = urllib.request.Request(self.url, data=data, headers={"Content-Type": "application/json"})
+            req = urllib.request.Request(self.url, data=data, headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"})
 
+            retry_after = 0.0
             try:
                 with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
-                    out = json.loads(resp.read().decode("utf-8"))
+                    return _read_body(resp)
+            except urllib.error.HTTPError as e:
+                # 503 = server saturated: wait the hinted delay before retrying
+                last_exc = e
+                if e.code == 503:
+                    retry_after = float(e.headers.get("Retry-After") or 0)
             except TimeoutError as e:
                 last_exc = e
             except Exception as e:
                 last_exc = e
-            else:
-                if out.get("error"):
-                    raise McpError(out["error"].get("message", "Unknown MCP error"))
-                if "result" not in out:
-                    raise McpError("No 'result' field in MCP response")
-                return out["result"]
 
             if attempt < self.retries:
-                time.sleep(self.backoff_s * (attempt + 1))
+                time.sleep(max(retry_after, self.backoff_s * (attempt + 1)))
 
         raise McpError(f"HTTP/MCP error: timed out after {self.retries+1} attempts (timeout={self.timeout_s}s). Last: {last_exc!r}")
 
+    def _next_id(self) -> int:
+        return next(self._ids)
+
+    @staticmethod
+    def _result(out: Dict[str, Any]) -> Any:
+        if out.get("error"):
+            raise McpError(out["error"].get("message", "Unknown MCP error"))
+        if "result" not in out:
+            raise McpError("No 'result' field in MCP response")
+        return out["result"]
+
+    def _rpc(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {"jsonrpc": "2.0", "id": self._next_id(), "method": method, "params": params or {}}
+        return self._result(self._post(payload))
+
+    def batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Send several (method, params) calls in one JSON-RPC batch (one HTTP round-trip).
+        Returns results in the same order; a failed entry is returned as an McpError instance.
+        """
+        if not calls:
+            return []
+        ids = [self._next_id() for _ in calls]
+        out = self._post([
+            {"jsonrpc": "2.0", "id": rid, "method": method, "params": params or {}}
+            for rid, (method, params) in zip(ids, calls)
+        ])
+        if isinstance(out, dict):
+            # Whole batch rejected (e.g. invalid request)
+            err = McpError((out.get("error") or {}).get("message", "Invalid batch response"))
+            return [err for _ in calls]
+        by_id = {r.get("id"): r for r in out or [] if isinstance(r, dict)}
+        results: List[Any] = []
+        for rid in ids:
+            try:
+                results.append(self._result(by_id.get(rid) or {"error": {"message": "missing response"}}))
+            except McpError as e:
+                results.append(e)
+        return results
+
     def initialize(self) -> Dict[str, Any]:
         return self._rpc("initialize", {})
 
     def tool_call(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         return self._rpc("tools/call", {"name": name, "arguments": arguments or {}})
 
+    def tool_call_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Batch of (tool name, arguments) -> results (McpError instances for failed calls)."""
+        return self.batch([("tools/call", {"name": name, "arguments": args or {}}) for name, args in calls])
 
 
 # -----------------------------
@@ -231,126 +301,6 @@ def normalize_spaces(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "").strip().lower())
 
 
-def job_text_blob(job: Dict[str, Any]) -> str:
-    parts = [
-        str(job.get("title") or ""),
-        str(job.get("company") or ""),
-        str(job.get("location") or ""),
-        str(job.get("description") or ""),
-    ]
-    return normalize_spaces(" ".join(parts))
-
-
-# --- Location utils for country filtering ---
-
-def job_location_blob(job: Dict[str, Any]) -> str:
-    """Best-effort location string for filtering."""
-    loc = str(job.get("location") or "")
-    raw = job.get("raw") or {}
-    # Adzuna often stores a richer location object
-    try:
-        if isinstance(raw, dict):
-            rloc = raw.get("location") or {}
-            if isinstance(rloc, dict):
-                loc = loc or str(rloc.get("display_name") or "")
-                area = rloc.get("area")
-                if isinstance(area, list) and area:
-                    # prepend country when available
-                    loc = " ".join([str(a) for a in area if a]) + (" " + loc if loc else "")
-    except Exception:
-        pass
-    return normalize_spaces(loc)
-
-
-FRANCE_LOCATION_HINTS = [
-    "france",
-    "ile-de-france",
-    "île-de-france",
-    "paris",
-    "lyon",
-    "marseille",
-    "toulouse",
-    "lille",
-    "bordeaux",
-    "nantes",
-    "rennes",
-    "nice",
-    "strasbourg",
-    "montpellier",
-    "grenoble",
-]
-
-
-def filter_jobs_france_only(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Hard filter to keep only France-based jobs.
-
-    Motivation: some sources (esp. remote/global boards) can return US/Worldwide results even when
-    the query is a French city. We keep only jobs whose location strongly indicates France.
-    """
-    out: List[Dict[str, Any]] = []
-    for j in jobs:
-        loc = job_location_blob(j)
-        # If location is missing, we cannot safely assume France.
-        if not loc:
-            continue
-        if any(h in loc for h in FRANCE_LOCATION_HINTS):
-            out.append(j)
-    return out
-
-
-# -----------------------------
-# Strict contract filtering based on TITLE
-# -----------------------------
-# User requirement:
-# - If user does NOT ask for stage/alternance: exclude stage/alternance offers
-# - If user asks for stage: keep ONLY stage/internship offers (title-based)
-# - If user asks for alternance: keep ONLY alternance/apprenticeship offers (title-based)
-def job_title_blob(job: Dict[str, Any]) -> str:
-    return normalize_spaces(str(job.get("title") or ""))
-
-INTERNSHIP_TITLE_KW = [
-    "stage",
-    "stagiaire",
-    "intern",
-    "internship",
-]
-
-APPRENTICESHIP_TITLE_KW = [
-    "alternance",
-    "apprentissage",
-    "apprenti",
-    "apprenticeship",
-    "apprentice",
-]
-
-
-def _title_contains_any(title: str, kws: List[str]) -> bool:
-    return any(k in title for k in kws)
-
-
-def is_stage_title(job: Dict[str, Any]) -> bool:
-    return _title_contains_any(job_title_blob(job), INTERNSHIP_TITLE_KW)
-
-
-def is_alternance_title(job: Dict[str, Any]) -> bool:
-    return _title_contains_any(job_title_blob(job), APPRENTICESHIP_TITLE_KW)
-
-
-def is_intern_or_apprentice_title(job: Dict[str, Any]) -> bool:
-    return is_stage_title(job) or is_alternance_title(job)
-
-
-def apply_contract_title_filter(jobs: List[Dict[str, Any]], contract: Optional[str]) -> List[Dict[str, Any]]:
-    """Apply the strict contract rule using ONLY the job title."""
-    if contract == "stage":
-        return [j for j in jobs if is_stage_title(j)]
-    if contract == "alternance":
-        return [j for j in jobs if is_alternance_title(j)]
-
-    # Default behavior (including CDI/CDD or unspecified): exclude internships/apprenticeships
-    return [j for j in jobs if not is_intern_or_apprentice_title(j)]
-
-
 # -----------------------------
 # Intent parsing
 # -----------------------------
@@ -402,21 +352,6 @@ CONTRACT_ALIASES = {
     "alternance": ["alternance", "apprenticeship", "apprenti", "apprentissage"],
 }
 
-CONTRACT_KEYWORDS_FILTER = {
-    # on garde large mais pas débile
-    "stage": ["stage", "intern", "internship", "stagiaire"],
-    "alternance": ["alternance", "apprenticeship", "apprenti", "apprentissage"],
-    "cdi": ["cdi", "permanent", "temps plein", "full time", "full-time"],
-    "cdd": ["cdd", "fixed term", "fixed-term", "contrat à durée déterminée"],
-}
-
-ROLE_KEYWORDS_FILTER = {
-    "data analyst": ["data analyst", "analyste", "reporting", "dashboard", "power bi", "tableau", "sql"],
-    "data scientist": ["data scientist", "machine learning", "ml", "deep learning", "model", "python"],
-    "data engineer": ["data engineer", "etl", "pipeline", "airflow", "spark", "dbt", "ingénieur data"],
-    "business analyst": ["business analyst", "analyste métier", "amoa", "moa", "fonctionnel", "product"],
-}
-
 
 def detect_role(user_text: str) -> str:
     t = normalize_spaces(user_text)
@@ -490,121 +425,6 @@ ROLE_FALLBACK_QUERIES = {
 }
 
 
-# -----------------------------
-# Filters / soft scoring (do NOT drop jobs)
-# -----------------------------
-
-def _contains_any(txt: str, keywords: List[str]) -> bool:
-    return any(k in txt for k in keywords)
-
-
-def role_match_flag(job: Dict[str, Any], role: str) -> bool:
-    kw = ROLE_KEYWORDS_FILTER.get(role, [])
-    if not kw:
-        return True
-    return _contains_any(job_text_blob(job), kw)
-
-
-
-def contract_match_flag(job: Dict[str, Any], contract: Optional[str]) -> bool:
-    """Contract compliance flag.
-
-    IMPORTANT: For stage/alternance we rely strictly on TITLE to avoid false positives.
-    For other cases (None/CDI/CDD), we exclude stage/alternance titles by default.
-
-    Note: CDI/CDD are often unreliable in upstream APIs; we keep them as soft signals.
-    """
-    if contract == "stage":
-        return is_stage_title(job)
-    if contract == "alternance":
-        return is_alternance_title(job)
-
-    # Default: user did not ask for internship/apprenticeship => reject those titles
-    if is_intern_or_apprentice_title(job):
-        return False
-
-    # For CDI/CDD (or None), keep previous broad matching as a soft signal.
-    if not contract or contract not in CONTRACT_KEYWORDS_FILTER:
-        return True
-
-    kw = CONTRACT_KEYWORDS_FILTER.get(contract, [])
-    if not kw:
-        return True
-    return _contains_any(job_text_blob(job), kw)
-
-
-def compute_job_soft_bonus(job: Dict[str, Any], role: str, contract: Optional[str], strict_filters: bool) -> float:
-    """Score adjustment layered on top of the graph score.
-
-    - If strict_filters=True: penalize offers that don't match the requested role/contract.
-      (We still keep them as fallback if the pool is small.)
-    - If strict_filters=False: give small positive bumps to compliant offers.
-
-    This makes strict/relaxed modes actually affect ranking.
-    """
-    role_ok = role_match_flag(job, role)
-    contract_ok = contract_match_flag(job, contract)
-
-    if strict_filters:
-        bonus = 0.0
-        if not role_ok:
-            bonus -= 0.30
-        if contract and not contract_ok:
-            bonus -= 0.30
-        return bonus
-
-    bonus = 0.0
-    if role_ok:
-        bonus += 0.10
-    if contract and contract_ok:
-        bonus += 0.10
-    return bonus
-
-
-def annotate_job_flags(job: Dict[str, Any], role: str, contract: Optional[str]) -> Dict[str, Any]:
-    j2 = dict(job)
-    j2["role_hit"] = bool(role_match_flag(job, role))
-    j2["contract_hit"] = bool(contract_match_flag(job, contract))
-    return j2
-
-# Deterministic fallback ranking function
-def fallback_rank_score(job: Dict[str, Any], cv_skills: List[str], role: str, contract: Optional[str], strict_filters: bool) -> float:
-    """Deterministic fallback score when graph_rank is sparse.
-
-    Priorities:
-    1) Role compliance
-    2) Contract compliance (if requested)
-    3) Skill overlap
-
-    Returns a score in [0, 1].
-    """
-    cv_set = set(cv_skills or [])
-    job_set = set(job.get("skills") or [])
-    overlap = len(cv_set.intersection(job_set))
-    overlap_ratio = overlap / max(1, len(cv_set))
-
-    role_ok = bool(job.get("role_hit"))
-    contract_ok = bool(job.get("contract_hit")) if contract else True
-
-    # Base: overlap (0..1)
-    score = overlap_ratio
-
-    # Compliance weights
-    if role_ok:
-        score += 0.35
-    elif strict_filters:
-        score -= 0.10
-
-    if contract:
-        if contract_ok:
-            score += 0.25
-        elif strict_filters:
-            score -= 0.10
-
-    # Clamp
-    return max(0.0, min(1.0, score))
-
-
 # -----------------------------
 # CV extraction (PDF/TEX/TXT/DOCX + OCR optionnel)
 # -----------------------------
@@ -802,178 +622,62 @@ def run_pipeline(
     top_k: int,
     query: str,
     strict_filters: bool = True,
+    cv_skills: Optional[List[str]] = None,
+    with_relaxed: bool = False,
+    session_id: Optional[str] = None,
 ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """One match_pipeline call: fetch/filter/extract/graph/rank/explain all run server-side.
+
+    with_relaxed: the server also scores the same pool with strict_filters=False and the
+    result is kept in meta["relaxed"] ({"recommendations", "ranked_count"}).
+    session_id: the server keeps the fetched pool of this search for the session, so a re-run
+    with other sliders/filters is re-ranked without touching the job APIs.
+    """
     trace: List[Dict[str, Any]] = []
+    args: Dict[str, Any] = {
+        "role": role,
+        "contract": contract,
+        "location": location,
+        "sources": sources,
+        "limit": limit,
+        "top_k": top_k,
+        "query": query,
+        "strict_filters": strict_filters,
+        "with_relaxed": with_relaxed,
+    }
+    if session_id:
+        args["session_id"] = session_id
+    if cv_skills:
+        args["cv_skills"] = cv_skills
+    else:
+        args["cv_text"] = cv_text
 
-    # 1) Fetch jobs
-    jobs_res = safe_call(
-        client,
-        "jobs_list",
-        {
-            "query": query,
-            "location": location,
-            # fetch a bigger pool so we can still return top_k after ranking
-            "limit": max(limit, top_k * 10, 30),
-            "sources": sources,
-            "skip_failed_sources": True,
-        },
-        trace,
-    )
-    if jobs_res.get("_error"):
+    res = safe_call(client, "match_pipeline", args, trace)
+    if res.get("_error"):
         meta = {
             "query_used": query,
             "role": role,
             "contract": contract,
             "location": location,
             "strict_filters": strict_filters,
-            "jobs_list_meta": {
-                "error": jobs_res["_error"],
-                "tool": jobs_res.get("_tool"),
-                "args": jobs_res.get("_args"),
-            },
+            "jobs_list_meta": {"error": res["_error"], "tool": res.get("_tool")},
             "graph_summary": {},
             "trace": trace,
         }
         return meta, []
-    jobs = (jobs_res.get("jobs") or [])
-
-    # 🇫🇷 Hard country filter: keep only France jobs to avoid US/Worldwide noise
-    jobs_before_country = len(jobs)
-    jobs = filter_jobs_france_only(jobs)
-    jobs_after_country = len(jobs)
 
-    # Keep jobs even if description is missing; we can still extract from title/company/location.
-    jobs_before = len(jobs)
+    meta = res.get("meta") or {}
+    meta["trace"] = trace
+    if res.get("relaxed") is not None:
+        # The server returns the relaxed scoring next to meta; keep it with the pass it belongs to
+        meta["relaxed"] = res["relaxed"]
+    return meta, res.get("recommendations") or []
 
-    # ✅ Strict contract filtering based on TITLE (user requirement)
-    jobs = apply_contract_title_filter(jobs, contract)
-    jobs_after_title_contract_filter = len(jobs)
 
-    # Soft flags (do NOT drop)
-    jobs = [annotate_job_flags(j, role, contract) for j in jobs]
-
-    # counts for observability
-    jobs_after_role = sum(1 for j in jobs if j.get("role_hit"))
-    jobs_after_contract = sum(1 for j in jobs if j.get("contract_hit"))
-
-    # 2) CV skills
-    cv_sk = safe_call(client, "cv_extract_skills", {"text": cv_text}, trace)
-    cv_skills = cv_sk.get("skills") or []
-
-    # Process only the first N jobs for extraction (still uses pool fetched above)
-    jobs_with_skills = []
-    for j in jobs[: max(limit, top_k * 10, 30)]:
-        enriched = "\n".join(
-            [
-                str(j.get("title") or ""),
-                str(j.get("company") or ""),
-                str(j.get("location") or ""),
-                str(j.get("description") or ""),
-            ]
-        )
-        js = safe_call(client, "job_extract_skills", {"text": enriched}, trace)
-        j2 = dict(j)
-        j2["skills"] = js.get("skills") or []
-        jobs_with_skills.append(j2)
-
-    # 4) graph build
-    gb = safe_call(client, "graph_build", {"cv_skills": cv_skills, "jobs": jobs_with_skills}, trace)
-    graph = gb.get("graph")
-    summary = gb.get("summary") or {}
-
-    # 5) rank
-    gr = safe_call(client, "graph_rank", {"graph": graph, "cv_skills": cv_skills, "top_k": top_k}, trace)
-    ranking = gr.get("ranking") or []
-
-    # 6) explain
-    jobs_by_id = {j.get("id"): j for j in jobs_with_skills if j.get("id")}
-
-    # Re-rank with soft bonus (do not change MCP score, just prioritize compliant jobs)
-    rescored = []
-    for r in ranking:
-        job_id = r.get("job_id")
-        base_score = float(r.get("score", 0.0))
-        j = jobs_by_id.get(job_id)
-        if not j:
-            continue
-        bonus = compute_job_soft_bonus(j, role, contract, strict_filters)
-        final_score = min(1.0, base_score + bonus)
-        rescored.append({"job_id": job_id, "base_score": base_score, "bonus": bonus, "final_score": final_score})
-
-    rescored.sort(key=lambda x: x["final_score"], reverse=True)
-
-    # If graph_rank is sparse (few edges / few ranked items), build a complete ranking from the pool.
-    if len(rescored) < top_k:
-        existing_ids = {x["job_id"] for x in rescored}
-        for j in jobs_with_skills:
-            job_id = j.get("id")
-            if not job_id or job_id in existing_ids:
-                continue
-
-            base_score = fallback_rank_score(j, cv_skills, role, contract, strict_filters)
-            bonus = compute_job_soft_bonus(j, role, contract, strict_filters)
-            final_score = max(0.0, min(1.0, base_score + bonus))
-
-            rescored.append({
-                "job_id": job_id,
-                "base_score": float(base_score),
-                "bonus": float(bonus),
-                "final_score": float(final_score),
-            })
-
-        rescored.sort(key=lambda x: x["final_score"], reverse=True)
-
-    recos = []
-    for r in rescored[:top_k]:
-        job_id = r["job_id"]
-        j = jobs_by_id.get(job_id)
-        if not j:
-            continue
-        expl = safe_call(
-            client,
-            "match_explain",
-            {
-                "cv_skills": cv_skills,
-                "job_skills": j.get("skills") or [],
-                "job": {"title": j.get("title"), "company": j.get("company")},
-                "score": float(r["final_score"]),
-            },
-            trace,
-        )
-        recos.append(
-            {
-                "job": j,
-                "score": float(r["final_score"]),
-                "score_base": float(r["base_score"]),
-                "score_bonus": float(r["bonus"]),
-                "explain": expl,
-            }
-        )
-
-    meta = {
-        "query_used": query,
-        "role": role,
-        "contract": contract,
-        "location": location,
-        "strict_filters": strict_filters,
-        "jobs_list_meta": {
-            "count_total": jobs_res.get("count_total"),
-            "count_by_source": jobs_res.get("count_by_source"),
-            "errors": jobs_res.get("errors"),
-            "pool_size": jobs_before,
-            "before_country_filter": jobs_before_country,
-            "after_country_filter": jobs_after_country,
-            "after_title_contract_filter": jobs_after_title_contract_filter,
-            "role_hit_count": jobs_after_role,
-            "contract_hit_count": jobs_after_contract,
-            "jobs_with_skills": len(jobs_with_skills),
-            "ranked_count": len(rescored),
-            "returned_top_k": min(top_k, len(rescored)),
-        },
-        "graph_summary": summary,
-        "trace": trace,
-    }
-    return meta, recos
+def _quality(meta: Dict[str, Any], recos: List[Dict[str, Any]]) -> float:
+    top1 = recos[0]["score"] if recos else 0.0
+    edges = float((meta.get("graph_summary") or {}).get("edge_count", 0))
+    return float(top1) + (0.05 if edges > 0 else 0.0)
 
 
 def run_with_fallbacks(
@@ -985,74 +689,87 @@ def run_with_fallbacks(
     sources: List[str],
     limit: int,
     top_k: int,
+    cv_skills: Optional[List[str]] = None,
+    session_id: Optional[str] = None,
 ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
     """
     Stratégie :
     1) Query = role + contract + location (strict filters)
     2) Fallback queries (strict)
     3) Si toujours vide -> relâcher strict_filters (role/contract), mais garder query informative
+
+    La requête principale part seule (c'est elle qui répond dans la plupart des cas, chaque
+    candidate coûte des appels Adzuna/Remotive). Si elle ne donne rien, les candidates
+    suivantes partent en parallèle, au plus FALLBACK_PARALLELISM à la fois ; la première
+    (dans l'ordre) qui donne des recos gagne et celles encore en attente sont annulées.
+    Chaque appel renvoie aussi le scoring relâché du même pool : la passe 3 ne refait ni
+    fetch ni extraction.
     """
     tried: List[Dict[str, Any]] = []
 
     base_query = build_mcp_query(role, contract, location)
-    candidates = [base_query] + ROLE_FALLBACK_QUERIES.get(role, []) + [role, "data"]
+    candidates = list(dict.fromkeys([base_query] + ROLE_FALLBACK_QUERIES.get(role, []) + [role, "data"]))
 
     best_meta: Optional[Dict[str, Any]] = None
     best_recos: List[Dict[str, Any]] = []
     best_quality = -1.0
+    done: List[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]] = []
 
-    # Pass 1: strict
-    for q in candidates:
-        meta, recos = run_pipeline(
-            client=client,
-            cv_text=cv_text,
-            role=role,
-            contract=contract,
-            location=location,
-            sources=sources,
-            limit=limit,
-            top_k=top_k,
-            query=q,
-            strict_filters=True,
-        )
-        tried.append({"query": q, "strict": True, "top1": (recos[0]["score"] if recos else 0.0)})
-
-        top1 = recos[0]["score"] if recos else 0.0
-        edges = float((meta.get("graph_summary") or {}).get("edge_count", 0))
-        quality = float(top1) + (0.05 if edges > 0 else 0.0)
-
-        if quality > best_quality:
-            best_quality = quality
-            best_meta, best_recos = meta, recos
+    executor = ThreadPoolExecutor(max_workers=max(1, FALLBACK_PARALLELISM), thread_name_prefix="fallback")
+    futures: List[Future] = []
 
-        # stop if we have decent results
-        if recos:
-            best_meta["fallback_tried"] = tried
-            return best_meta, best_recos
+    def launch(upto: int) -> None:
+        """Submit candidates until `upto` of them were started."""
+        for q in candidates[len(futures):min(upto, len(candidates))]:
+            futures.append(executor.submit(
+                run_pipeline,
+                client=client,
+                cv_text=cv_text,
+                role=role,
+                contract=contract,
+                location=location,
+                sources=sources,
+                limit=limit,
+                top_k=top_k,
+                query=q,
+                strict_filters=True,
+                cv_skills=cv_skills,
+                with_relaxed=True,
+                session_id=session_id,
+            ))
 
-    # Pass 2: relaxed filters (avoid "Aucune reco exploitable" too often)
-    for q in candidates:
-        meta, recos = run_pipeline(
-            client=client,
-            cv_text=cv_text,
-            role=role,
-            contract=contract,
-            location=location,
-            sources=sources,
-            limit=limit,
-            top_k=top_k,
-            query=q,
-            strict_filters=False,
-        )
+    try:
+        # Pass 1: strict, in candidate order (a later candidate never wins over an earlier one).
+        # The base query runs alone; the fallbacks are speculated only once it came back empty.
+        for i, q in enumerate(candidates):
+            launch(i + (1 if i == 0 else max(1, FALLBACK_PARALLELISM)))
+            meta, recos = futures[i].result()
+            done.append((q, meta, recos))
+            tried.append({"query": q, "strict": True, "top1": (recos[0]["score"] if recos else 0.0)})
+
+            quality = _quality(meta, recos)
+            if quality > best_quality:
+                best_quality = quality
+                best_meta, best_recos = meta, recos
+
+            # stop if we have decent results
+            if recos:
+                best_meta["fallback_tried"] = tried
+                return best_meta, best_recos
+    finally:
+        # Cancel candidates not started yet; running ones finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # Pass 2: relaxed filters, scored server-side on the pools fetched above (no new call)
+    for q, meta, _ in done:
+        relaxed = meta.get("relaxed") or {}
+        recos = relaxed.get("recommendations") or []
         tried.append({"query": q, "strict": False, "top1": (recos[0]["score"] if recos else 0.0)})
 
-        top1 = recos[0]["score"] if recos else 0.0
-        edges = float((meta.get("graph_summary") or {}).get("edge_count", 0))
-        quality = float(top1) + (0.05 if edges > 0 else 0.0)
-
+        quality = _quality(meta, recos)
         if quality > best_quality:
             best_quality = quality
-            best_meta, best_recos = meta, recos
+            best_meta, best_recos = dict(meta, strict_filters=False), recos
 
         if recos:
             best_meta["fallback_tried"] = tried
@@ -1084,6 +801,9 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+# Server-side job pools are kept per browser session (re-runs re-rank without refetching)
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+
 # MCP client must be initialized before sidebar so sidebar can call cv_extract_skills
 client = McpClient(MCP_URL)
 try:
@@ -1237,6 +957,8 @@ if prompt:
                 sources=sources,
                 limit=limit,
                 top_k=top_k,
+                cv_skills=cv_skills_ui,
+                session_id=session_id,
             )
         except Exception as e:
             st.error(